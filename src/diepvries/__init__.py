@@ -14,6 +14,7 @@ class FieldDataType(Enum):
     """
 
     ARRAY = "ARRAY"
+    BINARY = "BINARY"
     BOOLEAN = "BOOLEAN"
     DATE = "DATE"
     GEOGRAPHY = "GEOGRAPHY"
@@ -41,6 +42,120 @@ class FieldRole(Enum):
     METADATA = "metadata"
 
 
+class HashdiffFormula(Enum):
+    """Possible ways of removing trailing empty fields from hashdiffs.
+
+    Trailing empty fields are removed so that hashdiffs do not change when a new
+    (empty) field is appended to a satellite.
+    """
+
+    # Remove trailing delimiters from the concatenation, with a regular expression.
+    REGEX = "regex"
+    # Only add a delimiter (and the following fields) when a non empty field follows,
+    # without regular expressions. Hashdiffs are the same as with REGEX, except when
+    # the last non empty field ends with the delimiter.
+    STRUCTURAL = "structural"
+    # STRUCTURAL, falling back to the regular expression when the last non empty
+    # field ends with the delimiter: hashdiffs are always the same as with REGEX (used
+    # to migrate satellites loaded with REGEX).
+    STRUCTURAL_COMPATIBLE = "structural_compatible"
+
+
+class InsertStrategy(Enum):
+    """Possible statements that insert new hashkeys in hubs and links."""
+
+    # MERGE statement, inserting the (distinct) staged hashkeys WHEN NOT MATCHED.
+    MERGE = "merge"
+    # INSERT statement, selecting the staged hashkeys (aggregated with GROUP BY) that
+    # do not exist in the target table (anti-join, with NOT EXISTS).
+    ANTI_JOIN = "anti_join"
+
+
+class SatelliteLoadMode(Enum):
+    """Possible ways of loading new versions in a satellite."""
+
+    # Insert new versions and end date the previous ones (r_timestamp_end), with a
+    # single MERGE statement.
+    MERGE = "merge"
+    # Only insert new versions, never updating existing records: r_timestamp_end is
+    # calculated when the satellite is read, in a view (see
+    # `Satellite.view_sql_statement`).
+    INSERT_ONLY = "insert_only"
+    # Effectivity satellites only: same as MERGE, but the open versions of the
+    # driving keys are looked up once, in the MERGE statement (see
+    # `EffectivitySatellite`).
+    SINGLE_PASS = "single_pass"
+
+
+class HashFunction(Enum):
+    """Possible hash functions for hashkeys and hashdiffs.
+
+    Values are Snowflake function names. Each function requires its own data type in
+    the target tables: TEXT (32) for MD5, BINARY (16) for MD5_BINARY, TEXT (40) for
+    SHA1, BINARY (20) for SHA1_BINARY, TEXT (64) for SHA2 (256 bits), BINARY (32) for
+    SHA2_BINARY and NUMBER (19, 0) for HASH.
+    """
+
+    MD5 = "MD5"
+    MD5_BINARY = "MD5_BINARY"
+    SHA1 = "SHA1"
+    SHA1_BINARY = "SHA1_BINARY"
+    SHA2 = "SHA2"
+    SHA2_BINARY = "SHA2_BINARY"
+    # 64-bit (non-cryptographic) hash: only allowed for hashdiffs, as collisions
+    # between keys would merge different business keys.
+    HASH = "HASH"
+
+
+class StagingMode(Enum):
+    """Possible ways of staging the extraction in a Data Vault load."""
+
+    # Create a staging table, read by all load statements.
+    TABLE = "table"
+    # Inline the staging query in each load statement (no staging table).
+    INLINE = "inline"
+    # Inline the staging query for small extractions only.
+    AUTO = "auto"
+    # Create the staging table from local files, written from extracted records (see
+    # `DataVaultLoad.stage_records`): no extraction table is read.
+    FILES = "files"
+
+
+class InitialLoadMode(Enum):
+    """Possible ways of detecting initial loads, when target tables are empty."""
+
+    # Target tables are loaded as usual.
+    DISABLED = "disabled"
+    # Target tables are known to be empty: all staged records are loaded with plain
+    # INSERT statements, without pruning or merging the target tables. Hubs and links
+    # still skip hashkeys that are already loaded, but satellites do not: no other
+    # load may write to the same satellites concurrently.
+    ENABLED = "enabled"
+    # Target tables are probed before each execution of the load (see
+    # `DataVaultLoad.initial_load_probes`): only empty ones are loaded as in ENABLED,
+    # so the same exclusive access to the satellites is needed.
+    AUTO = "auto"
+
+
+class StagingTableType(Enum):
+    """Possible types of a staging table (values are Snowflake table type keywords)."""
+
+    PERMANENT = ""
+    TRANSIENT = "TRANSIENT"
+    # Only visible in the session that creates it: all load statements must run in
+    # that session (`DataVaultLoad.sql_load_script`), so it is rejected by the parallel
+    # executors, the scheduler and DataVaultLoadBatch.
+    TEMPORARY = "TEMPORARY"
+
+
+class StatementStatus(Enum):
+    """Possible outcomes of the execution of a load statement."""
+
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+
+
 class TableType(Enum):
     """Possible types of a table in a Data Vault model."""
 
@@ -72,6 +187,9 @@ class FixedPrefixLoggerAdapter(logging.LoggerAdapter):
 
 # Framework constants.
 
+# Timestamp before any record timestamp (used when target records are not pruned).
+BEGINNING_OF_TIME = datetime(1900, 1, 1, tzinfo=timezone.utc)
+
 # Timestamp used to populate r_timestamp_end in new satellite records.
 END_OF_TIME = datetime(9999, 12, 31, tzinfo=timezone.utc)
 
@@ -100,6 +218,10 @@ METADATA_FIELDS = {
     "record_end_timestamp": "r_timestamp_end",
 }
 
+# Maximum number of extracted rows for which the staging query is inlined, when the
+# staging mode is StagingMode.AUTO.
+INLINE_STAGING_MAX_ROWS = 1000
+
 # Path object that stores the path of this file's parent folder.
 PROJECT_DIR = Path(__file__).resolve().parent
 
@@ -2,26 +2,67 @@
 
 import itertools
 import logging
-from datetime import datetime
+from datetime import datetime, tzinfo
 from functools import lru_cache
-from typing import List, Optional
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Mapping, Optional, Union
 
 from pytz import timezone
 
-from . import METADATA_FIELDS, TEMPLATES_DIR, FieldRole, FixedPrefixLoggerAdapter
+from . import (
+    INLINE_STAGING_MAX_ROWS,
+    METADATA_FIELDS,
+    FieldDataType,
+    FieldRole,
+    FixedPrefixLoggerAdapter,
+    HashdiffFormula,
+    InitialLoadMode,
+    StagingMode,
+    StagingTableType,
+)
+from .deserializers.model_cache import ColumnMetadata
+from .effectivity_satellite import EffectivitySatellite
 from .field import Field
 from .hub import Hub
 from .link import Link
+from .role_playing_hub import RolePlayingHub
 from .satellite import Satellite
-from .table import DataVaultTable, StagingTable
+from .staging_files import (
+    DEFAULT_BATCH_SIZE,
+    DEFAULT_MAX_FILE_SIZE,
+    DEFAULT_SESSION_TIMEZONE,
+    StagingFileWriter,
+)
+from .table import DataVaultTable, StagingTable, StagingTableOptions
+from .template_sql import get_template
 from .template_sql.sql_formulas import (
     ALIASED_BUSINESS_KEY_SQL_TEMPLATE,
+    HASH_INPUT_NAME_TEMPLATE,
+    HASH_INPUT_SQL_TEMPLATE,
+    HASH_INPUTS_RELATION_SQL_TEMPLATE,
+    HASHDIFF_INPUT_NAME_TEMPLATE,
+    RECORD_START_TIMESTAMP_COLUMN_SQL_TEMPLATE,
     RECORD_START_TIMESTAMP_SQL_TEMPLATE,
     SOURCE_SQL_TEMPLATE,
+    STAGING_INLINE_SQL_TEMPLATE,
+)
+
+if TYPE_CHECKING:
+    from .data_vault_load_executor import (
+        AsyncConnectionPool,
+        ConnectionFactory,
+        DataVaultLoadReport,
+    )
+
+# Roles of the fields copied from the extraction table to the staging table.
+_EXTRACTED_FIELD_ROLES = (
+    FieldRole.BUSINESS_KEY,
+    FieldRole.CHILD_KEY,
+    FieldRole.DESCRIPTIVE,
 )
 
 
-class DataVaultLoad:
+class DataVaultLoad:  # pylint: disable=too-many-instance-attributes
     """Load data in a Data Vault."""
 
     _target_tables = None
@@ -35,9 +76,35 @@ class DataVaultLoad:
         extract_start_timestamp: datetime,
         target_tables: List[DataVaultTable],
         source: Optional[str] = None,
-    ):
+        staging_mode: StagingMode = StagingMode.TABLE,
+        extract_row_count: Optional[int] = None,
+        inline_staging_max_rows: int = INLINE_STAGING_MAX_ROWS,
+        staging_table_options: Optional[StagingTableOptions] = None,
+        extract_columns: Optional[Iterable[ColumnMetadata]] = None,
+        record_timestamp_column: Optional[str] = None,
+        initial_load_mode: InitialLoadMode = InitialLoadMode.DISABLED,
+    ):  # pylint: disable=too-many-arguments
         """Instantiate a DataVaultLoad object and calculate additional fields.
 
+        With StagingMode.AUTO, the staging query is inlined when the extraction has
+        at most `inline_staging_max_rows` rows (see `uses_inline_staging`): the mode is
+        resolved to StagingMode.INLINE or StagingMode.TABLE on instantiation. With
+        StagingMode.FILES, the staging table is loaded from the files written by
+        `stage_records` instead of the extraction table.
+
+        With a `record_timestamp_column`, the load is a backfill: the extraction holds
+        multiple snapshots (e.g. one per day), and each record is loaded with its own
+        timestamp instead of `extract_start_timestamp`. All snapshots are staged
+        in a single staging table, and each target table is still loaded by a single
+        statement: hubs and links insert each hashkey with its earliest timestamp,
+        and satellites insert whole version chains (consecutive snapshots with the
+        same hashdiff are collapsed in a single version).
+
+        In initial loads (see `initial_load_mode`), empty target tables are loaded
+        with plain INSERT statements, that neither merge nor prune the target tables
+        (check `initial_load_tables`). Hubs and links skip the hashkeys inserted by
+        concurrent loads, but satellites must not be loaded concurrently.
+
         Args:
             extract_schema: Schema where the extraction table is stored.
             extract_table: Name of the extraction table.
@@ -49,16 +116,39 @@ class DataVaultLoad:
             source: Source system/API/database. If source is not passed as argument, the
                 process will assume that a source (field named according to
                 METADATA_FIELDS naming conventions) will exist in target table.
+            staging_mode: Whether the staging table is created (from the extraction
+                table or from staging files), or its query is inlined in each load
+                statement.
+            extract_row_count: Number of rows in the extraction table, if known (used
+                when staging_mode is StagingMode.AUTO).
+            inline_staging_max_rows: Maximum number of extracted rows for which the
+                staging query is inlined (when staging_mode is StagingMode.AUTO).
+            staging_table_options: Physical design of the staging table (type, Time
+                Travel retention, ordering and cleanup).
+            extract_columns: Columns of the extraction table (e.g. fetched with
+                `SnowflakeDeserializer.fetch_table_columns`). When known, casts and
+                COALESCEs that do not change the staged values are skipped.
+            record_timestamp_column: Column of the extraction table that holds the
+                timestamp of each record (in UTC), when backfilling.
+            initial_load_mode: Whether target tables are known to be empty, or probed
+                before each execution.
 
         Raises:
             ValueError: When the extract_start_timestamp is not linked to a timezone.
         """
         self.extract_schema = extract_schema
         self.extract_table = extract_table
+        self.extract_columns = (
+            {column.name.lower(): column for column in extract_columns}
+            if extract_columns is not None
+            else None
+        )
         self.staging_table = StagingTable(
             schema=staging_schema,
             name=staging_table,
             extract_start_timestamp=extract_start_timestamp,
+            options=staging_table_options,
+            record_timestamp_column=record_timestamp_column,
         )
 
         # Check if extract_start_timestamp is timezone-aware.
@@ -71,9 +161,19 @@ class DataVaultLoad:
         self.extract_start_timestamp = extract_start_timestamp.astimezone(
             timezone("UTC")
         )
-        self.target_tables = target_tables
         self.source = source
+        self.initial_load_mode = initial_load_mode
+        if staging_mode == StagingMode.AUTO:
+            staging_mode = (
+                StagingMode.INLINE
+                if extract_row_count is not None
+                and extract_row_count <= inline_staging_max_rows
+                else StagingMode.TABLE
+            )
+        self.staging_mode = staging_mode
+        self._staging_file_sql_statements: Optional[List[str]] = None
         self._logger = FixedPrefixLoggerAdapter(logging.getLogger(__name__), str(self))
+        self.target_tables = target_tables
 
         self._logger.info("Created DataVaultLoad instance (%s).", str(self))
 
@@ -107,6 +207,8 @@ class DataVaultLoad:
             3. Build relationship between each Satellite and its parent table.
             4. Check if all parent hub names exist in target_tables - applicable for
                 links only.
+            5. Define the staging query, when it is inlined in load statements.
+            6. Flag the tables loaded as empty tables (with InitialLoadMode.ENABLED).
 
         Args:
             target_tables: List of tables to be populated.
@@ -114,11 +216,18 @@ class DataVaultLoad:
         Raises:
             StopIteration: If a parent table (both from Link and Satellite) is missing
                 in self.target_tables.
+            ValueError: If an effectivity satellite is backfilled.
         """
         self._target_tables = sorted(
             target_tables, key=lambda x: (x.loading_order, x.name)
         )
         for target_table in self._target_tables:
+            if self.staging_table.backfill and isinstance(
+                target_table, EffectivitySatellite
+            ):
+                raise ValueError(
+                    f"{target_table}: Effectivity satellites can not be backfilled"
+                )
             target_table.staging_table = self.staging_table
             if isinstance(target_table, Satellite):
                 try:
@@ -141,21 +250,109 @@ class DataVaultLoad:
                             f"target_tables configuration."
                         ) from e
 
+        self.staging_table.inline_sql = (
+            self._staging_inline_sql if self.uses_inline_staging else None
+        )
+        if self.initial_load_mode == InitialLoadMode.ENABLED:
+            self.set_initial_load_tables(
+                table.name for table in self.initial_load_tables
+            )
+
     @property
-    def staging_create_sql_statement(self) -> str:
-        """Generate the SQL query to create the staging table.
+    def initial_load_tables(self) -> List[DataVaultTable]:
+        """Get the target tables that can be loaded as empty tables.
 
-        All needed placeholders are calculated, in order to match template SQL (check
-        template_sql/staging_table_ddl.sql).
+        Role playing hubs, and the hubs they load, are always loaded as usual: the
+        same hub is populated by multiple statements of the load.
 
         Returns:
-            SQL query to create staging table.
+            Target tables that support initial loads.
+        """
+        shared_hub_names = {
+            table.parent_table.name
+            for table in self.target_tables
+            if isinstance(table, RolePlayingHub) and table.parent_table is not None
+        }
+        return [
+            table
+            for table in self.target_tables
+            if not isinstance(table, RolePlayingHub)
+            and table.name not in shared_hub_names
+        ]
+
+    @property
+    def initial_load_probes(self) -> Dict[str, str]:
+        """Get the queries that check which target tables are empty.
+
+        With InitialLoadMode.AUTO, the executors run each query before the load (see
+        `DataVaultLoadExecutor`), and pass the empty tables to
+        `set_initial_load_tables`.
+
+        Returns:
+            Query that returns a row if the table is not empty, indexed by table
+            name (empty if target tables are not probed).
         """
-        fields_dml = []
-        fields_ddl = []
+        if self.initial_load_mode != InitialLoadMode.AUTO:
+            return {}
+        return {
+            table.name: table.initial_load_probe_sql_statement
+            for table in self.initial_load_tables
+        }
+
+    def set_initial_load_tables(self, table_names: Iterable[str]):
+        """Load the given target tables as empty tables, and all others as usual.
+
+        Args:
+            table_names: Names of the empty target tables (ignored if they do not
+                support initial loads, see `initial_load_tables`).
+        """
+        table_names = set(table_names)
+        for table in self.initial_load_tables:
+            table.initial_load = table.name in table_names
+        self._logger.info(
+            "Initial load of (%s).",
+            ", ".join(table.name for table in self.target_tables if table.initial_load),
+        )
+
+    @property
+    def uses_inline_staging(self) -> bool:
+        """Check if the staging query is inlined in each load statement.
+
+        When inlined, no staging table is created: each hub, link and satellite load
+        statement reads from the staging query (as a subquery) instead. This avoids
+        writing (and committing) a staging table, which usually costs more than the
+        load statements themselves for small extractions.
+
+        Returns:
+            True if the staging query is inlined.
+        """
+        return self.staging_mode == StagingMode.INLINE
+
+    @property
+    def uses_temporary_staging_table(self) -> bool:
+        """Check if the load creates a temporary staging table.
+
+        Temporary tables are only visible in the session that creates them: all load
+        statements must then run on the same connection, in order (as in
+        `sql_load_script`), which rules out the parallel executors.
+
+        Returns:
+            True if a temporary staging table is created.
+        """
+        return (
+            not self.uses_inline_staging
+            and self.staging_table.options.table_type == StagingTableType.TEMPORARY
+        )
+
+    @property
+    def staging_fields(self) -> List[Field]:
+        """Get the fields of the staging table, in the order they are created.
 
-        # Produce the list of fields that should exist in the staging table. As
-        # common field names can appear in multiple target tables and it is not
+        Returns:
+            Fields of all target tables, without duplicates and without the record
+            end timestamp.
+        """
+        # As common field names can appear in multiple target tables and it is not
         # possible to have duplicated field names in the staging table, seen fields
         # are kept in a set to avoid duplicates; while the list is built iteratively
         # to maintain ordering.
@@ -173,27 +370,47 @@ class DataVaultLoad:
                 seen_fields.add(field)
                 staging_fields.append(field)
 
-        # Iterate over all staging fields and produce the DML and DDL expressions
-        # that should be used to create the staging table.
-        for field in staging_fields:
-            fields_dml.append(
-                self._get_staging_dml_expression(
-                    field, self._get_target_table(field.parent_table_name)
+        return staging_fields
+
+    @property
+    def staging_create_sql_statement(self) -> str:
+        """Generate the SQL query to create the staging table.
+
+        All needed placeholders are calculated, in order to match template SQL (check
+        template_sql/staging_table_ddl.sql). With StagingMode.FILES, the staging
+        table is instead created empty and loaded from the staging files written by
+        `stage_records` (CREATE TABLE, PUT and COPY INTO statements, in order).
+
+        Returns:
+            SQL query to create staging table.
+
+        Raises:
+            ValueError: If records were not staged yet, with StagingMode.FILES.
+        """
+        if self.staging_mode == StagingMode.FILES:
+            if self._staging_file_sql_statements is None:
+                raise ValueError(
+                    "Records should be staged (stage_records) before loading the "
+                    "staging table from files"
                 )
-            )
-            fields_ddl.append(field.ddl_in_staging)
+            return "\n".join(self._staging_file_sql_statements)
+
+        order_by = ""
+        if self.staging_table.options.order_by_hashkey:
+            order_by = f"\n  ORDER BY {self._staging_order_by_field.name_in_staging}"
 
         query_args = {
-            "staging_schema": self.staging_table.schema,
-            "staging_table": self.staging_table.name,
-            "fields_dml": ", ".join(fields_dml),
-            "fields_ddl": ", ".join(fields_ddl),
-            "extract_schema_name": self.extract_schema,
-            "extract_table_name": self.extract_table,
+            **self.staging_table.sql_placeholders,
+            "order_by": order_by,
+            "fields_dml": ", ".join(self._staging_fields_dml),
+            "fields_ddl": ", ".join(
+                field.ddl_in_staging for field in self.staging_fields
+            ),
+            "extract_relation": self._extract_relation,
         }
 
-        staging_table_create_sql = (
-            (TEMPLATES_DIR / "staging_table_ddl.sql").read_text().format(**query_args)
+        staging_table_create_sql = get_template("staging_table_ddl.sql").render(
+            **query_args
         )
 
         self._logger.info(
@@ -204,6 +421,68 @@ class DataVaultLoad:
 
         return staging_table_create_sql
 
+    def stage_records(
+        self,
+        records: Iterable[Mapping[str, Any]],
+        directory: Union[str, Path],
+        max_file_size: int = DEFAULT_MAX_FILE_SIZE,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        session_timezone: tzinfo = DEFAULT_SESSION_TIMEZONE,
+    ) -> List[str]:
+        """Write extracted records to staging files, instead of an extraction table.
+
+        See `StagingFileWriter` for details. Only available with StagingMode.FILES:
+        the returned statements become `staging_create_sql_statement` (first group of
+        `sql_load_scripts_by_group`), so that the executors upload and load the files
+        before loading the target tables. Staging records again replaces them.
+
+        Args:
+            records: Extracted records (mappings between column names and values).
+            directory: Directory where staging files are written.
+            max_file_size: Size (in bytes, compressed) of each staging file.
+            batch_size: Number of records converted (and hashed) at once.
+            session_timezone: Time zone of the Snowflake session that loads the files
+                (TIMEZONE parameter).
+
+        Returns:
+            SQL statements to create the staging table and load the staging files.
+
+        Raises:
+            ValueError: If the staging mode is not StagingMode.FILES.
+        """
+        if self.staging_mode != StagingMode.FILES:
+            raise ValueError(
+                f"Records can only be staged with {StagingMode.FILES}, "
+                f"not {self.staging_mode}"
+            )
+
+        staging_file_writer = StagingFileWriter(
+            self,
+            directory=directory,
+            max_file_size=max_file_size,
+            batch_size=batch_size,
+            session_timezone=session_timezone,
+        )
+        self._staging_file_sql_statements = staging_file_writer.get_sql_statements(
+            staging_file_writer.write(records)
+        )
+        return list(self._staging_file_sql_statements)
+
+    @property
+    def staging_drop_sql_statement(self) -> Optional[str]:
+        """Generate the SQL query to drop the staging table, once the load finished.
+
+        Returns:
+            SQL query to drop the staging table, or None if it should be kept (see
+            `StagingTableOptions.drop_after_load`) or it is not created (see
+            `uses_inline_staging`).
+        """
+        if self.uses_inline_staging or not self.staging_table.options.drop_after_load:
+            return None
+        return get_template("staging_table_drop.sql").render(
+            **self.staging_table.sql_placeholders
+        )
+
     @property
     def sql_load_script(self) -> List[str]:
         """Generate the SQL script to load current Data Vault model.
@@ -221,29 +500,335 @@ class DataVaultLoad:
         """Generate the SQL scripts to load current Data Vault model.
 
         Scripts are grouped by their loading order. Within a group, queries can be run
-        in parallel.
+        in parallel. The first group creates the staging table (unless the staging
+        query is inlined, see `uses_inline_staging`), from the extraction table or
+        from staging files (see `stage_records`), and the last one drops it (if
+        `StagingTableOptions.drop_after_load` is set).
         """
-        result = [[self.staging_create_sql_statement]]
-        for _, group in itertools.groupby(
-            self.target_tables, key=lambda x: x.loading_order
-        ):
+        result = (
+            [] if self.uses_inline_staging else [[self.staging_create_sql_statement]]
+        )
+        for group in self.target_tables_by_group:
             result.append([table.sql_load_statement for table in group])
+        staging_drop_sql_statement = self.staging_drop_sql_statement
+        if staging_drop_sql_statement is not None:
+            result.append([staging_drop_sql_statement])
         return result
 
-    def _get_staging_dml_expression(self, field: Field, table: DataVaultTable) -> str:
+    @property
+    def target_tables_by_group(self) -> List[List[DataVaultTable]]:
+        """Get the target tables, grouped by their loading order.
+
+        Within a group, tables can be loaded in parallel.
+        """
+        return [
+            list(group)
+            for _, group in itertools.groupby(
+                self.target_tables, key=lambda x: x.loading_order
+            )
+        ]
+
+    def execute(
+        self, connection_factory: "ConnectionFactory", max_workers: int = 4
+    ) -> "DataVaultLoadReport":
+        """Execute current Data Vault load, running each group of tables in parallel.
+
+        See `DataVaultLoadExecutor` for details.
+
+        Args:
+            connection_factory: Function that creates a DB-API 2.0 database
+                connection. It is called once per worker thread.
+            max_workers: Maximum number of tables loaded in parallel.
+
+        Returns:
+            Report with one result per load statement.
+        """
+        # pylint: disable=import-outside-toplevel
+        from .data_vault_load_executor import DataVaultLoadExecutor
+
+        return DataVaultLoadExecutor(
+            self, connection_factory=connection_factory, max_workers=max_workers
+        ).execute()
+
+    async def aexecute(
+        self,
+        connection_pool: Union["AsyncConnectionPool", "ConnectionFactory"],
+        max_concurrency: int = 4,
+    ) -> "DataVaultLoadReport":
+        """Execute current Data Vault load on an asyncio event loop.
+
+        See `AsyncDataVaultLoadExecutor` for details.
+
+        Args:
+            connection_pool: Connection pool of an asynchronous driver, or function
+                that creates a DB-API 2.0 connection (executed in a thread pool).
+            max_concurrency: Maximum number of tables loaded concurrently.
+
+        Returns:
+            Report with one result per load statement.
+        """
+        # pylint: disable=import-outside-toplevel
+        from .data_vault_load_executor import AsyncDataVaultLoadExecutor
+
+        return await AsyncDataVaultLoadExecutor(
+            self, connection_pool=connection_pool, max_concurrency=max_concurrency
+        ).execute()
+
+    @property
+    def _staging_fields_dml(self) -> List[str]:
+        """Get the SQL expressions that calculate each field of the staging table.
+
+        Returns:
+            SQL expression of each staging field, in order.
+        """
+        hash_inputs = self._hash_inputs
+        hashdiff_inputs = self._hashdiff_inputs
+        return [
+            self._get_staging_dml_expression(
+                field,
+                self._get_target_table(field.parent_table_name),
+                hash_inputs,
+                hashdiff_inputs,
+            )
+            for field in self.staging_fields
+        ]
+
+    @property
+    def _hash_input_expressions(self) -> Dict[str, str]:
+        """Get the SQL expressions of the fields concatenated in hashes.
+
+        Each distinct `Field.hash_concatenation_sql` of the hashkeys (of hubs and
+        links) and hashdiffs (of satellites) calculated in the staging query is
+        mapped to its cheapest equivalent, given the extraction table columns (see
+        `_get_hash_input_sql`).
+
+        Returns:
+            Cheapest SQL expression of each field expression.
+        """
+        hash_input_expressions = {}
+        for table in self.target_tables:
+            if isinstance(table, (Hub, Link)):
+                fields = table.hashkey_fields
+            elif isinstance(table, Satellite):
+                fields = table.hashdiff_fields
+            else:
+                continue
+            for field in fields:
+                if field.hash_concatenation_sql not in hash_input_expressions:
+                    hash_input_expressions[field.hash_concatenation_sql] = (
+                        self._get_hash_input_sql(field)
+                    )
+        return hash_input_expressions
+
+    @property
+    def _hash_inputs(self) -> Dict[str, str]:
+        """Get the SQL that replaces field expressions concatenated in hashes.
+
+        When hash inputs are shared (see `StagingTableOptions.share_hash_inputs`),
+        each field expression is assigned a column of the extraction relation (see
+        `_extract_relation`): a business key shared by a hub, its links and its
+        satellites is then only cast and converted to a string once per row.
+        Otherwise, field expressions are replaced by their cheapest equivalent.
+
+        Returns:
+            Column name (or cheapest SQL expression) of each field expression, or an
+            empty dictionary if field expressions are not replaced.
+        """
+        hash_input_expressions = self._hash_input_expressions
+        if self.staging_table.options.share_hash_inputs:
+            return {
+                hash_concatenation_sql: HASH_INPUT_NAME_TEMPLATE.format(index=index)
+                for index, hash_concatenation_sql in enumerate(
+                    hash_input_expressions, start=1
+                )
+            }
+        return {
+            hash_concatenation_sql: hash_input_expression
+            for hash_concatenation_sql, hash_input_expression in (
+                hash_input_expressions.items()
+            )
+            if hash_input_expression != hash_concatenation_sql
+        }
+
+    @property
+    def _hashdiff_inputs(self) -> Dict[str, str]:
+        """Get the columns that hold the concatenation of the hashdiff fields.
+
+        With HashdiffFormula.STRUCTURAL_COMPATIBLE, the concatenation is used up to
+        three times in the hashdiff expression: it is calculated once per row, as an
+        extra column of the extraction relation (see `_extract_relation`).
+
+        Returns:
+            Column name, indexed by satellite name.
+        """
+        return {
+            table.name: HASHDIFF_INPUT_NAME_TEMPLATE.format(satellite=table.name)
+            for table in self.target_tables
+            if isinstance(table, Satellite)
+            and table.hashdiff_formula == HashdiffFormula.STRUCTURAL_COMPATIBLE
+        }
+
+    @property
+    def _extract_relation(self) -> str:
+        """Get the relation that staging fields are calculated from.
+
+        Returns:
+            Extraction table, or a subquery that adds the hash inputs (see
+            `_hash_inputs`) and hashdiff inputs (see `_hashdiff_inputs`) to it.
+        """
+        extract_relation = f"{self.extract_schema}.{self.extract_table}"
+        hash_inputs = self._hash_inputs
+        if self.staging_table.options.share_hash_inputs:
+            hash_input_expressions = self._hash_input_expressions
+            extract_relation = HASH_INPUTS_RELATION_SQL_TEMPLATE.format(
+                hash_inputs=", ".join(
+                    HASH_INPUT_SQL_TEMPLATE.format(
+                        hash_input_expression=hash_input_expressions[
+                            hash_concatenation_sql
+                        ],
+                        hash_input=hash_input,
+                    )
+                    for hash_concatenation_sql, hash_input in hash_inputs.items()
+                ),
+                relation=extract_relation,
+            )
+
+        hashdiff_inputs = self._hashdiff_inputs
+        if hashdiff_inputs:
+            # Hashdiff inputs are calculated from the shared hash inputs (if any), so
+            # they are added in an outer projection.
+            extract_relation = HASH_INPUTS_RELATION_SQL_TEMPLATE.format(
+                hash_inputs=", ".join(
+                    HASH_INPUT_SQL_TEMPLATE.format(
+                        hash_input_expression=self._get_target_table(
+                            satellite_name
+                        ).get_hashdiff_concatenation_sql(hash_inputs),
+                        hash_input=hashdiff_input,
+                    )
+                    for satellite_name, hashdiff_input in hashdiff_inputs.items()
+                ),
+                relation=extract_relation,
+            )
+        return extract_relation
+
+    def _get_hash_input_sql(self, field: Field) -> str:
+        """Get the cheapest SQL expression to represent a field as a string in hashes.
+
+        When the field is stored with its data type in the extraction table (see
+        `extract_columns`), the cast is skipped; when it is declared NOT NULL, the
+        COALESCE is skipped. Both produce the same string as
+        `Field.hash_concatenation_sql`.
+
+        Args:
+            field: Field concatenated in a hash.
+
+        Returns:
+            SQL expression to represent the field as a string.
+        """
+        column = self._get_extract_column(field)
+        if column is None:
+            return field.hash_concatenation_sql
+        return field.get_hash_concatenation_sql(
+            cast=not _is_cast_redundant(field, column),
+            coalesce=not column.is_mandatory,
+        )
+
+    def _is_staged_as_extracted(self, field: Field) -> bool:
+        """Check if a field is staged as it is stored in the extraction table.
+
+        Args:
+            field: Staging field.
+
+        Returns:
+            True if the field is copied from an extraction table column with its data
+            type, and never replaced by a default value.
+        """
+        column = self._get_extract_column(field)
+        return (
+            column is not None
+            and _is_cast_redundant(field, column)
+            and (field.role != FieldRole.BUSINESS_KEY or column.is_mandatory)
+        )
+
+    def _get_extract_column(self, field: Field) -> Optional[ColumnMetadata]:
+        """Get the extraction table column of a field.
+
+        Args:
+            field: Field calculated from the extraction table.
+
+        Returns:
+            Column metadata, or None if it is unknown (or the field is calculated
+            in the staging query, as hashkeys, hashdiffs and metadata fields).
+        """
+        if self.extract_columns is None or field.role not in _EXTRACTED_FIELD_ROLES:
+            return None
+        return self.extract_columns.get(field.name)
+
+    @property
+    def _staging_order_by_field(self) -> Field:
+        """Get the field that staged records are sorted by.
+
+        Returns:
+            Hashkey of the first hub (or of the first table, if there is no hub).
+        """
+        table = next(
+            (table for table in self.target_tables if isinstance(table, Hub)),
+            self.target_tables[0],
+        )
+        return table.fields_by_role[FieldRole.HASHKEY][0]
+
+    @property
+    def _staging_inline_sql(self) -> str:
+        """Get the staging query, as a subquery that replaces the staging table.
+
+        Returns:
+            Staging subquery.
+        """
+        return STAGING_INLINE_SQL_TEMPLATE.format(
+            fields=", ".join(
+                (
+                    field.name_in_staging
+                    if self._is_staged_as_extracted(field)
+                    else f"CAST({field.name_in_staging} AS {field.data_type_sql}) "
+                    f"AS {field.name_in_staging}"
+                )
+                for field in self.staging_fields
+            ),
+            fields_dml=", ".join(self._staging_fields_dml),
+            extract_relation=self._extract_relation,
+        )
+
+    def _get_staging_dml_expression(
+        self,
+        field: Field,
+        table: DataVaultTable,
+        hash_inputs: Optional[Mapping[str, str]] = None,
+        hashdiff_inputs: Optional[Mapping[str, str]] = None,
+    ) -> str:
         """Get the SQL expression to represent a field in the staging table.
 
         Args:
             field: Field to calculate SQL expression.
             table: Field parent table.
+            hash_inputs: Columns that hold the field expressions concatenated in
+                hashes (see `_hash_inputs`).
+            hashdiff_inputs: Columns that hold the concatenation of the hashdiff
+                fields, indexed by satellite name (see `_hashdiff_inputs`).
 
         Returns:
             SQL expression that should be used in staging creation.
         """
         if field.name_in_staging == METADATA_FIELDS["record_start_timestamp"]:
-            return RECORD_START_TIMESTAMP_SQL_TEMPLATE.format(
-                extract_start_timestamp=self.extract_start_timestamp.strftime(
-                    "%Y-%m-%dT%H:%M:%S.%fZ"
+            record_timestamp_column = self.staging_table.record_timestamp_column
+            return (
+                RECORD_START_TIMESTAMP_SQL_TEMPLATE.format(
+                    extract_start_timestamp=self.extract_start_timestamp.strftime(
+                        "%Y-%m-%dT%H:%M:%S.%fZ"
+                    )
+                )
+                if record_timestamp_column is None
+                else RECORD_START_TIMESTAMP_COLUMN_SQL_TEMPLATE.format(
+                    column=record_timestamp_column
                 )
             )
         if (
@@ -252,11 +837,25 @@ class DataVaultLoad:
         ):
             return SOURCE_SQL_TEMPLATE.format(source=self.source)
         if field.role == FieldRole.BUSINESS_KEY:
-            return ALIASED_BUSINESS_KEY_SQL_TEMPLATE.format(business_key=field.name)
+            # Business keys declared NOT NULL in the extraction table are not
+            # replaced by a default value.
+            column = self._get_extract_column(field)
+            return (
+                field.name
+                if column is not None and column.is_mandatory
+                else ALIASED_BUSINESS_KEY_SQL_TEMPLATE.format(business_key=field.name)
+            )
         if field.role == FieldRole.HASHKEY and isinstance(table, (Hub, Link)):
-            return table.hashkey_sql
+            return (
+                table.get_hashkey_sql(hash_inputs) if hash_inputs else table.hashkey_sql
+            )
         if field.role == FieldRole.HASHDIFF and isinstance(table, Satellite):
-            return table.hashdiff_sql
+            hashdiff_input = (hashdiff_inputs or {}).get(table.name)
+            return (
+                table.get_hashdiff_sql(hash_inputs, hashdiff_input)
+                if hash_inputs or hashdiff_input
+                else table.hashdiff_sql
+            )
         return field.name_in_staging
 
     @lru_cache
@@ -283,3 +882,31 @@ class DataVaultLoad:
             ) from e
 
         return target_table
+
+
+def _is_cast_redundant(field: Field, column: ColumnMetadata) -> bool:
+    """Check if casting an extraction table column to a field data type is redundant.
+
+    Args:
+        field: Field calculated from the column.
+        column: Extraction table column.
+
+    Returns:
+        True if all values of the column are unchanged by the cast.
+    """
+    if column.data_type != field.data_type.value:
+        return False
+    if field.data_type == FieldDataType.NUMBER:
+        return (
+            column.scale == field.scale
+            and column.precision is not None
+            and field.precision is not None
+            and column.precision <= field.precision
+        )
+    if field.data_type in (FieldDataType.TEXT, FieldDataType.BINARY):
+        return field.length is None or (
+            column.length is not None and column.length <= field.length
+        )
+    # Other data types have no parameters in the DV model (timestamps and times are
+    # cast to their maximum precision).
+    return True
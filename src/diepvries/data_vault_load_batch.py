@@ -0,0 +1,201 @@
+"""Load multiple staging tables at once."""
+
+import itertools
+import logging
+from typing import Dict, List, Optional, Tuple
+
+from . import METADATA_FIELDS, FieldRole, FixedPrefixLoggerAdapter
+from .data_vault_load import DataVaultLoad
+from .data_vault_load_executor import _check_staging_table_visibility
+from .hub import Hub
+from .link import Link
+from .table import HUB_LINK_DML_TEMPLATES, HUB_LINK_INITIAL_DML_TEMPLATE, DataVaultTable
+from .template_sql import get_template
+from .template_sql.sql_formulas import (
+    STAGING_UNION_SQL_TEMPLATE,
+    format_fields_for_select,
+)
+
+
+class DataVaultLoadBatch:
+    """Load multiple staging tables in a Data Vault, sharing hub and link statements.
+
+    When several Data Vault loads (usually, one per extraction) populate the same hub
+    or link, each of them issues its own MERGE statement, scanning the target table
+    once per load. In a batch, each hub and link is loaded by a single MERGE statement,
+    whose source is the `UNION ALL` of the staging tables of all loads. Record sources
+    are still aggregated per hashkey, across all staging tables.
+
+    Satellites are not combined: each satellite is loaded from its own staging
+    table, in the same way as in `DataVaultLoad`.
+    """
+
+    def __init__(self, data_vault_loads: List[DataVaultLoad]):
+        """Instantiate a DataVaultLoadBatch.
+
+        Args:
+            data_vault_loads: Data Vault loads to combine. Each load must hold its own
+                table instances.
+
+        Raises:
+            ValueError: If no Data Vault load is passed, or if a load creates a
+                temporary staging table (hubs and links read all staging tables, see
+                `DataVaultLoad.uses_temporary_staging_table`).
+        """
+        if not data_vault_loads:
+            raise ValueError("At least one Data Vault load is needed")
+        for data_vault_load in data_vault_loads:
+            _check_staging_table_visibility(data_vault_load, type(self).__name__)
+
+        self.data_vault_loads = data_vault_loads
+        self._logger = FixedPrefixLoggerAdapter(logging.getLogger(__name__), str(self))
+
+    def __str__(self) -> str:
+        """Representation of a DataVaultLoadBatch object as a string.
+
+        This helps with the tracking of logging events per entity.
+
+        Returns:
+            String representation of this DataVaultLoadBatch instance.
+        """
+        staging_tables = ", ".join(
+            data_vault_load.staging_table.name
+            for data_vault_load in self.data_vault_loads
+        )
+        return f"{type(self).__name__}: staging_tables={staging_tables}"
+
+    @property
+    def sql_load_script(self) -> List[str]:
+        """Generate the SQL script to load all staging tables.
+
+        Returns:
+            Ordered list of SQL statements to load the Data Vault.
+        """
+        return list(itertools.chain.from_iterable(self.sql_load_scripts_by_group))
+
+    @property
+    def sql_load_scripts_by_group(self) -> List[List[str]]:
+        """Generate the SQL scripts to load all staging tables.
+
+        Scripts are grouped by their loading order. Within a group, queries can be run
+        in parallel. The first group creates all staging tables (except the ones whose
+        staging query is inlined), and the last one drops the staging tables that
+        should not be kept.
+
+        Returns:
+            Groups of SQL statements, in loading order.
+        """
+        staging_statements = [
+            data_vault_load.staging_create_sql_statement
+            for data_vault_load in self.data_vault_loads
+            if not data_vault_load.uses_inline_staging
+        ]
+        result = [staging_statements] if staging_statements else []
+        for group in self.target_tables_by_group:
+            statements = []
+            for tables in group:
+                if len(tables) > 1:
+                    statements.append(self._get_batch_load_statement(tables))
+                else:
+                    statements.append(tables[0].sql_load_statement)
+            result.append(statements)
+
+        staging_drop_statements = [
+            data_vault_load.staging_drop_sql_statement
+            for data_vault_load in self.data_vault_loads
+            if data_vault_load.staging_drop_sql_statement is not None
+        ]
+        if staging_drop_statements:
+            result.append(staging_drop_statements)
+
+        return result
+
+    @property
+    def target_tables_by_group(self) -> List[List[List[DataVaultTable]]]:
+        """Get the target tables of all loads, grouped by their loading order.
+
+        Within a group, hubs and links with the same name are combined, as they are
+        loaded by a single statement.
+
+        Returns:
+            Groups (in loading order) of target tables loaded together.
+        """
+        tables_by_loading_order: Dict[
+            int, Dict[Tuple[str, Optional[str]], List[DataVaultTable]]
+        ] = {}
+        for data_vault_load in self.data_vault_loads:
+            for table in data_vault_load.target_tables:
+                group = tables_by_loading_order.setdefault(table.loading_order, {})
+                if isinstance(table, (Hub, Link)):
+                    key = (table.name, None)
+                else:
+                    key = (table.name, data_vault_load.staging_table.name)
+                group.setdefault(key, []).append(table)
+
+        return [
+            list(tables_by_loading_order[loading_order].values())
+            for loading_order in sorted(tables_by_loading_order)
+        ]
+
+    def _get_batch_load_statement(self, tables: List[DataVaultTable]) -> str:
+        """Get the SQL query to populate a hub or link from multiple staging tables.
+
+        Args:
+            tables: Instances of the same hub/link, one per Data Vault load.
+
+        Returns:
+            SQL query to load target table.
+
+        Raises:
+            ValueError: If the tables do not share the same fields, or the same
+                insert strategy, initial load and pruning strategy.
+        """
+        table = tables[0]
+        fields = format_fields_for_select(fields=table.fields)
+        if any(format_fields_for_select(fields=x.fields) != fields for x in tables):
+            raise ValueError(
+                f"'{table.name}': All loads should have the same fields to be combined"
+            )
+        for setting in ("insert_strategy", "initial_load", "pruning_strategy"):
+            if any(getattr(x, setting) != getattr(table, setting) for x in tables):
+                raise ValueError(
+                    f"'{table.name}': All loads should have the same {setting} to be "
+                    f"combined"
+                )
+
+        hashkey = next(hashkey for hashkey in table.fields_by_role[FieldRole.HASHKEY])
+        staging_relations = [x.sql_placeholders["staging_relation"] for x in tables]
+        staging_relation = STAGING_UNION_SQL_TEMPLATE.format(
+            fields=", ".join(
+                field
+                for field in fields
+                if field != METADATA_FIELDS["record_start_timestamp"]
+            ),
+            hashkey=hashkey.name,
+            staging_selects=" UNION ALL ".join(
+                f"SELECT {', '.join(fields)} FROM {relation}"
+                for relation in staging_relations
+            ),
+        )
+
+        sql_placeholders = {
+            **table.sql_placeholders,
+            "staging_relation": staging_relation,
+        }
+        template = get_template(
+            HUB_LINK_INITIAL_DML_TEMPLATE
+            if table.initial_load
+            else HUB_LINK_DML_TEMPLATES[table.insert_strategy]
+        )
+        sql_load_statement = template.render(
+            **sql_placeholders, **table.get_pruning_placeholders(sql_placeholders)
+        )
+
+        self._logger.info(
+            "Loading SQL for (%s) from (%d) staging tables generated.",
+            table.name,
+            len(tables),
+        )
+        self._logger.debug("\n(%s)", sql_load_statement)
+
+        return sql_load_statement
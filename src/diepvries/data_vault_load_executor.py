@@ -0,0 +1,856 @@
+"""Execution of Data Vault loads."""
+
+import asyncio
+import itertools
+import logging
+import threading
+from abc import ABC, abstractmethod
+from concurrent.futures import CancelledError, ThreadPoolExecutor, as_completed
+from contextlib import asynccontextmanager, closing
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    AsyncContextManager,
+    Callable,
+    List,
+    Optional,
+    Protocol,
+    Sequence,
+    Union,
+)
+
+from . import FixedPrefixLoggerAdapter, StatementStatus
+
+if TYPE_CHECKING:
+    from .data_vault_load import DataVaultLoad
+
+# A function that creates a DB-API 2.0 (PEP 249) database connection.
+ConnectionFactory = Callable[[], Any]
+
+
+class AsyncConnection(Protocol):  # pylint: disable=too-few-public-methods
+    """Connection of an asynchronous database driver."""
+
+    async def execute(self, statement: str) -> Optional[int]:
+        """Execute a SQL statement, returning the number of affected rows (if known).
+
+        Args:
+            statement: SQL statement.
+        """
+
+    async def fetchone(self, statement: str) -> Optional[Sequence[Any]]:
+        """Execute a SQL query, returning its first row (None if it returns no rows).
+
+        Args:
+            statement: SQL query.
+        """
+
+
+class AsyncConnectionPool(Protocol):  # pylint: disable=too-few-public-methods
+    """Pool of connections of an asynchronous database driver."""
+
+    def acquire(self) -> AsyncContextManager[AsyncConnection]:
+        """Acquire a connection, that is released when the returned context exits.
+
+        All statements executed while the connection is acquired run in the same
+        database session.
+        """
+
+
+@dataclass
+class StatementResult:
+    """Result of the execution of a load statement.
+
+    A load statement is the SQL script that creates the staging table or loads one
+    target table. It can be composed of multiple SQL statements (e.g. `SET` and
+    `MERGE`), always executed in the same database session.
+    """
+
+    #: Name of the table created/loaded by the statement.
+    table_name: str
+    #: Position of the statement group, in `DataVaultLoad.sql_load_scripts_by_group`.
+    group: int
+    #: SQL script executed.
+    statement: str
+    #: Outcome of the execution.
+    status: StatementStatus = StatementStatus.CANCELLED
+    #: Moment when the execution started (None if the statement was not started).
+    started_at: Optional[datetime] = None
+    #: Moment when the execution finished (None if the statement was not started).
+    finished_at: Optional[datetime] = None
+    #: Number of rows affected by the last SQL statement, as reported by the cursor.
+    rowcount: Optional[int] = None
+    #: Error raised by the database (only when status is FAILED).
+    error: Optional[BaseException] = None
+
+    @property
+    def duration(self) -> Optional[timedelta]:
+        """Get the execution duration.
+
+        Returns:
+            Execution duration (None if the statement was not executed).
+        """
+        if self.started_at is None or self.finished_at is None:
+            return None
+        return self.finished_at - self.started_at
+
+
+@dataclass
+class DataVaultLoadReport:
+    """Report of the execution of one or more Data Vault loads."""
+
+    #: Results, one per load statement, in loading order.
+    results: List[StatementResult] = field(default_factory=list)
+
+    @classmethod
+    def from_data_vault_load(
+        cls, data_vault_load: "DataVaultLoad"
+    ) -> "DataVaultLoadReport":
+        """Create the report of a Data Vault load that did not start yet.
+
+        The first group holds the creation of the staging table (unless the staging
+        query is inlined), followed by one group per loading order and, if the staging
+        table is dropped after the load, a last group with its drop (see
+        `DataVaultLoad.sql_load_scripts_by_group`).
+
+        Args:
+            data_vault_load: Data Vault load to report on.
+
+        Returns:
+            Report with one (cancelled) result per load statement.
+        """
+        staging_groups = []
+        if not data_vault_load.uses_inline_staging:
+            staging_groups.append(
+                [
+                    (
+                        data_vault_load.staging_table.name,
+                        data_vault_load.staging_create_sql_statement,
+                    )
+                ]
+            )
+        statement_groups = staging_groups + [
+            [(table.name, table.sql_load_statement) for table in group]
+            for group in data_vault_load.target_tables_by_group
+        ]
+        staging_drop_sql_statement = data_vault_load.staging_drop_sql_statement
+        if staging_drop_sql_statement is not None:
+            statement_groups.append(
+                [(data_vault_load.staging_table.name, staging_drop_sql_statement)]
+            )
+        return cls(
+            results=[
+                StatementResult(table_name=table_name, group=group, statement=statement)
+                for group, statements in enumerate(statement_groups)
+                for table_name, statement in statements
+            ]
+        )
+
+    @property
+    def groups(self) -> List[List[StatementResult]]:
+        """Get the results grouped by loading order.
+
+        Returns:
+            Groups of results, in loading order.
+        """
+        return [
+            list(group)
+            for _, group in itertools.groupby(self.results, key=lambda x: x.group)
+        ]
+
+    @property
+    def succeeded(self) -> bool:
+        """Check if all statements were successfully executed.
+
+        Returns:
+            True if all statements succeeded.
+        """
+        return all(
+            result.status == StatementStatus.SUCCEEDED for result in self.results
+        )
+
+    @property
+    def failed(self) -> List[StatementResult]:
+        """Get the results of the statements that failed.
+
+        Returns:
+            Failed statements.
+        """
+        return [
+            result for result in self.results if result.status == StatementStatus.FAILED
+        ]
+
+
+class DataVaultLoadExecutionError(RuntimeError):
+    """Error raised when a Data Vault load does not succeed."""
+
+    def __init__(self, report: DataVaultLoadReport):
+        """Instantiate a DataVaultLoadExecutionError.
+
+        Args:
+            report: Report of the execution that failed.
+        """
+        failed_tables = ", ".join(result.table_name for result in report.failed)
+        super().__init__(f"Data Vault load failed for table(s): {failed_tables}")
+        self.report = report
+
+
+def split_sql_statements(script: str) -> List[str]:
+    """Split a SQL script into its statements.
+
+    Statements are delimited by semicolons, ignoring semicolons in string literals,
+    quoted identifiers and comments. Comments preceding a statement are kept with it.
+
+    Args:
+        script: SQL script.
+
+    Returns:
+        SQL statements, without the trailing semicolon.
+    """
+    statements = []
+    statement_start = 0
+    position = 0
+    quote = None
+
+    while position < len(script):
+        character = script[position]
+        if quote is not None:
+            if character == quote:
+                quote = None
+        elif character in ("'", '"'):
+            quote = character
+        elif script.startswith("--", position):
+            position = script.find("\n", position)
+            if position == -1:
+                break
+        elif script.startswith("/*", position):
+            position = script.find("*/", position)
+            if position == -1:
+                break
+            position += 1
+        elif character == ";":
+            statements.append(script[statement_start:position].strip())
+            statement_start = position + 1
+        position += 1
+
+    statements.append(script[statement_start:].strip())
+
+    return [statement for statement in statements if statement]
+
+
+def _check_staging_table_visibility(data_vault_load: "DataVaultLoad", consumer: str):
+    """Check that the staging table of a load can be read from any session.
+
+    Args:
+        data_vault_load: Data Vault load to execute.
+        consumer: Name of the class that executes (or combines) the load.
+
+    Raises:
+        ValueError: If the load creates a temporary staging table.
+    """
+    if data_vault_load.uses_temporary_staging_table:
+        raise ValueError(
+            f"{data_vault_load.staging_table.name}: Temporary staging tables are only "
+            f"visible in the session that creates them, and are not supported by "
+            f"{consumer}"
+        )
+
+
+def _log_result(result: StatementResult, logger: logging.LoggerAdapter):
+    """Log the outcome of a load statement.
+
+    Args:
+        result: Result of the statement.
+        logger: Logger of the executor.
+    """
+    logger.info(
+        "Load of (%s) finished with status (%s) in (%s).",
+        result.table_name,
+        result.status.value,
+        result.duration,
+    )
+
+
+def _log_report(report: DataVaultLoadReport, logger: logging.LoggerAdapter):
+    """Log the outcome of a Data Vault load.
+
+    Args:
+        report: Report of the execution.
+        logger: Logger of the executor.
+    """
+    if report.succeeded:
+        logger.info("Data Vault load executed successfully.")
+    else:
+        logger.error(
+            "Data Vault load failed: (%d) statement(s) failed.", len(report.failed)
+        )
+
+
+class _ThreadedExecutor(ABC):  # pylint: disable=too-few-public-methods
+    """Base class of executors that run load statements on a thread pool.
+
+    Each worker thread holds its own database connection, created on demand and
+    closed at the end of the execution.
+    """
+
+    def __init__(self, connection_factory: ConnectionFactory, max_workers: int):
+        """Instantiate a _ThreadedExecutor.
+
+        Args:
+            connection_factory: Function that creates a DB-API 2.0 database
+                connection. It is called once per worker thread.
+            max_workers: Maximum number of statements executed in parallel.
+
+        Raises:
+            ValueError: If max_workers is lower than 1.
+        """
+        if max_workers < 1:
+            raise ValueError("max_workers should be greater than 0")
+
+        self.connection_factory = connection_factory
+        self.max_workers = max_workers
+
+        self._connections: List[Any] = []
+        self._connections_lock = threading.Lock()
+        self._local = threading.local()
+        self._logger = FixedPrefixLoggerAdapter(logging.getLogger(__name__), str(self))
+
+    @abstractmethod
+    def _is_cancelled(self, result: StatementResult) -> bool:
+        """Check if a statement should not be (further) executed.
+
+        Args:
+            result: Result of the statement.
+        """
+
+    def _execute_statement(self, result: StatementResult):
+        """Execute a load statement, on the connection of the current worker.
+
+        Each SQL statement of the script is executed in order, in the same session.
+
+        Args:
+            result: Result of the statement, updated in place.
+        """
+        if self._is_cancelled(result):
+            return
+
+        result.started_at = datetime.now(timezone.utc)
+        try:
+            connection = self._get_connection()
+            with closing(connection.cursor()) as cursor:
+                for sql_statement in split_sql_statements(result.statement):
+                    if self._is_cancelled(result):
+                        result.status = StatementStatus.CANCELLED
+                        break
+                    cursor.execute(sql_statement)
+                    result.rowcount = cursor.rowcount
+                else:
+                    result.status = StatementStatus.SUCCEEDED
+        except Exception as e:  # pylint: disable=broad-except
+            result.status = StatementStatus.FAILED
+            result.error = e
+            self._logger.exception("Load of (%s) failed.", result.table_name)
+        finally:
+            result.finished_at = datetime.now(timezone.utc)
+
+        _log_result(result, self._logger)
+
+    def _probe_initial_load(self, data_vault_load: "DataVaultLoad"):
+        """Check which target tables are empty, to load them as empty tables.
+
+        Only applies to loads with InitialLoadMode.AUTO (see
+        `DataVaultLoad.initial_load_probes`).
+
+        Args:
+            data_vault_load: Data Vault load about to be executed.
+        """
+        initial_load_probes = data_vault_load.initial_load_probes
+        if not initial_load_probes:
+            return
+
+        empty_table_names = []
+        with closing(self._get_connection().cursor()) as cursor:
+            for table_name, probe in initial_load_probes.items():
+                cursor.execute(probe)
+                if cursor.fetchone() is None:
+                    empty_table_names.append(table_name)
+        data_vault_load.set_initial_load_tables(empty_table_names)
+
+    def _get_connection(self) -> Any:
+        """Get the database connection of the current worker, creating it if needed.
+
+        Returns:
+            Database connection.
+        """
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = self._local.connection = self.connection_factory()
+            with self._connections_lock:
+                self._connections.append(connection)
+        return connection
+
+    def _close_connections(self):
+        """Close all database connections created by the workers."""
+        with self._connections_lock:
+            for connection in self._connections:
+                try:
+                    connection.close()
+                except Exception:  # pylint: disable=broad-except
+                    self._logger.exception("Failed to close database connection.")
+            self._connections.clear()
+        self._local = threading.local()
+
+
+class DataVaultLoadExecutor(_ThreadedExecutor):
+    """Execute a Data Vault load on a bounded pool of database connections.
+
+    The staging table is created first. Then, each group of statements (hubs, links
+    and satellites - see `DataVaultLoad.sql_load_scripts_by_group`) is executed in
+    parallel, on a thread pool with one database connection per worker. A group only
+    starts when all statements of the previous group succeeded.
+
+    When a statement fails, all statements that did not start yet are cancelled and
+    the load stops (fail fast).
+
+    With InitialLoadMode.AUTO, target tables are probed before the load, and empty
+    ones are loaded with plain INSERT statements.
+
+    Loads that create a temporary staging table are rejected with a ValueError, as
+    statements run on multiple sessions (see
+    `DataVaultLoad.uses_temporary_staging_table`).
+    """
+
+    def __init__(
+        self,
+        data_vault_load: "DataVaultLoad",
+        connection_factory: ConnectionFactory,
+        max_workers: int = 4,
+    ):
+        """Instantiate a DataVaultLoadExecutor.
+
+        Args:
+            data_vault_load: Data Vault load to execute.
+            connection_factory: Function that creates a DB-API 2.0 database
+                connection. It is called once per worker thread.
+            max_workers: Maximum number of statements executed in parallel.
+        """
+        _check_staging_table_visibility(data_vault_load, type(self).__name__)
+        self.data_vault_load = data_vault_load
+        self._cancelled = threading.Event()
+        super().__init__(connection_factory, max_workers)
+
+    def __str__(self) -> str:
+        """Representation of a DataVaultLoadExecutor object as a string.
+
+        This helps with the tracking of logging events per entity.
+
+        Returns:
+            String representation of this DataVaultLoadExecutor instance.
+        """
+        return f"{type(self).__name__}: {self.data_vault_load}"
+
+    def execute(self, raise_on_failure: bool = True) -> DataVaultLoadReport:
+        """Execute the Data Vault load.
+
+        Args:
+            raise_on_failure: Raise an error if any statement does not succeed.
+
+        Returns:
+            Report with one result per load statement.
+
+        Raises:
+            DataVaultLoadExecutionError: If any statement does not succeed (only when
+                raise_on_failure is True).
+        """
+        self._cancelled.clear()
+
+        try:
+            self._probe_initial_load(self.data_vault_load)
+            report = DataVaultLoadReport.from_data_vault_load(self.data_vault_load)
+            with ThreadPoolExecutor(
+                max_workers=self.max_workers, thread_name_prefix="diepvries"
+            ) as pool:
+                for group in report.groups:
+                    if self._cancelled.is_set():
+                        break
+                    self._execute_group(pool, group)
+        finally:
+            self._close_connections()
+
+        _log_report(report, self._logger)
+        if raise_on_failure and not report.succeeded:
+            raise DataVaultLoadExecutionError(report)
+        return report
+
+    def _execute_group(self, pool: ThreadPoolExecutor, results: List[StatementResult]):
+        """Execute a group of statements in parallel, waiting for all of them.
+
+        Args:
+            pool: Thread pool where statements are executed.
+            results: Results of the statements of the group, updated in place.
+        """
+        futures = {
+            pool.submit(self._execute_statement, result): result for result in results
+        }
+        for future in as_completed(futures):
+            try:
+                future.result()
+            except CancelledError:
+                continue
+            if futures[future].status == StatementStatus.FAILED:
+                self._cancel(futures)
+
+    def _is_cancelled(self, result: StatementResult) -> bool:
+        """Check if a statement should not be (further) executed.
+
+        Args:
+            result: Result of the statement.
+
+        Returns:
+            True if any statement of the load failed.
+        """
+        return self._cancelled.is_set()
+
+    def _cancel(self, futures):
+        """Cancel all statements that did not start yet.
+
+        Args:
+            futures: Futures of the statements.
+        """
+        self._cancelled.set()
+        for future in futures:
+            future.cancel()
+
+
+class BlockingConnectionPool:
+    """Asynchronous connection pool over a blocking DB-API 2.0 driver.
+
+    Statements are offloaded to a thread pool, so that the event loop is never blocked
+    by the database driver (e.g. the Snowflake connector). Connections are created on
+    demand, up to `max_connections`, and reused by all loads that share the pool.
+    """
+
+    def __init__(self, connection_factory: ConnectionFactory, max_connections: int = 4):
+        """Instantiate a BlockingConnectionPool.
+
+        Args:
+            connection_factory: Function that creates a DB-API 2.0 database
+                connection.
+            max_connections: Maximum number of open connections.
+
+        Raises:
+            ValueError: If max_connections is lower than 1.
+        """
+        if max_connections < 1:
+            raise ValueError("max_connections should be greater than 0")
+
+        self.connection_factory = connection_factory
+        self.max_connections = max_connections
+
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_connections, thread_name_prefix="diepvries"
+        )
+        self._connections: List[Any] = []
+        self._idle_connections: List[Any] = []
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    async def __aenter__(self) -> "BlockingConnectionPool":
+        """Enter the pool context.
+
+        Returns:
+            The pool itself.
+        """
+        return self
+
+    async def __aexit__(self, *exc_info):
+        """Exit the pool context, closing all connections.
+
+        Args:
+            exc_info: Exception raised in the context, if any.
+        """
+        await asyncio.get_running_loop().run_in_executor(None, self.close)
+
+    @asynccontextmanager
+    async def acquire(self):
+        """Acquire a connection, that is released when the context exits.
+
+        Yields:
+            The acquired connection.
+        """
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_connections)
+
+        async with self._semaphore:
+            if self._idle_connections:
+                connection = self._idle_connections.pop()
+            else:
+                connection = await self._run(self.connection_factory)
+                self._connections.append(connection)
+            try:
+                yield _BlockingConnection(self, connection)
+            finally:
+                self._idle_connections.append(connection)
+
+    def close(self):
+        """Close all connections and stop the thread pool."""
+        for connection in self._connections:
+            connection.close()
+        self._connections.clear()
+        self._idle_connections.clear()
+        self._executor.shutdown(wait=True)
+
+    async def _run(self, function: Callable, *args) -> Any:
+        """Run a blocking function in the thread pool.
+
+        Args:
+            function: Function to run.
+            args: Function arguments.
+
+        Returns:
+            Function result.
+        """
+        return await asyncio.get_running_loop().run_in_executor(
+            self._executor, function, *args
+        )
+
+
+class _BlockingConnection:  # pylint: disable=too-few-public-methods
+    """AsyncConnection over a DB-API 2.0 connection, used by BlockingConnectionPool."""
+
+    def __init__(self, pool: BlockingConnectionPool, connection: Any):
+        """Instantiate a _BlockingConnection.
+
+        Args:
+            pool: Pool that owns the connection.
+            connection: DB-API 2.0 connection.
+        """
+        self._pool = pool
+        self._connection = connection
+
+    async def execute(self, statement: str) -> Optional[int]:
+        """Execute a SQL statement in the thread pool.
+
+        Args:
+            statement: SQL statement.
+
+        Returns:
+            Number of rows affected by the statement, as reported by the cursor.
+        """
+        return await self._pool._run(  # pylint: disable=protected-access
+            self._execute, statement
+        )
+
+    def _execute(self, statement: str) -> Optional[int]:
+        """Execute a SQL statement, blocking until it finishes.
+
+        Args:
+            statement: SQL statement.
+
+        Returns:
+            Number of rows affected by the statement, as reported by the cursor.
+        """
+        with closing(self._connection.cursor()) as cursor:
+            cursor.execute(statement)
+            return cursor.rowcount
+
+    async def fetchone(self, statement: str) -> Optional[Sequence[Any]]:
+        """Execute a SQL query in the thread pool, returning its first row.
+
+        Args:
+            statement: SQL query.
+
+        Returns:
+            First row of the query, or None if it returns no rows.
+        """
+        return await self._pool._run(  # pylint: disable=protected-access
+            self._fetchone, statement
+        )
+
+    def _fetchone(self, statement: str) -> Optional[Sequence[Any]]:
+        """Execute a SQL query, blocking until its first row is fetched.
+
+        Args:
+            statement: SQL query.
+
+        Returns:
+            First row of the query, or None if it returns no rows.
+        """
+        with closing(self._connection.cursor()) as cursor:
+            cursor.execute(statement)
+            return cursor.fetchone()
+
+
+class AsyncDataVaultLoadExecutor:
+    """Execute a Data Vault load on an asyncio event loop.
+
+    This is the asynchronous counterpart of `DataVaultLoadExecutor`: each group of
+    statements is scheduled with `asyncio.gather`, with at most `max_concurrency`
+    statements running at once, and a group only starts when all statements of the
+    previous group succeeded. When a statement fails, all statements that did not
+    start yet are cancelled.
+
+    Statements run either on an asynchronous driver (see `AsyncConnectionPool`) or on
+    a blocking DB-API 2.0 driver, through a `BlockingConnectionPool`. As no call
+    blocks the event loop, multiple loads can be executed concurrently on the same
+    loop (and share the same pool).
+
+    With InitialLoadMode.AUTO, target tables are probed before the load (see
+    `AsyncConnection.fetchone`), and empty ones are loaded with plain INSERT
+    statements.
+    """
+
+    def __init__(
+        self,
+        data_vault_load: "DataVaultLoad",
+        connection_pool: Union[AsyncConnectionPool, ConnectionFactory],
+        max_concurrency: int = 4,
+    ):
+        """Instantiate an AsyncDataVaultLoadExecutor.
+
+        Args:
+            data_vault_load: Data Vault load to execute.
+            connection_pool: Connection pool of an asynchronous driver, or function
+                that creates a DB-API 2.0 connection. In the latter case, a
+                `BlockingConnectionPool` is created and closed by each execution.
+            max_concurrency: Maximum number of statements executed concurrently.
+
+        Raises:
+            ValueError: If max_concurrency is lower than 1, or if the load creates a
+                temporary staging table (see
+                `DataVaultLoad.uses_temporary_staging_table`).
+        """
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency should be greater than 0")
+        _check_staging_table_visibility(data_vault_load, type(self).__name__)
+
+        self.data_vault_load = data_vault_load
+        self.connection_pool = connection_pool
+        self.max_concurrency = max_concurrency
+
+        self._cancelled = False
+        self._logger = FixedPrefixLoggerAdapter(logging.getLogger(__name__), str(self))
+
+    def __str__(self) -> str:
+        """Representation of an AsyncDataVaultLoadExecutor object as a string.
+
+        This helps with the tracking of logging events per entity.
+
+        Returns:
+            String representation of this AsyncDataVaultLoadExecutor instance.
+        """
+        return f"{type(self).__name__}: {self.data_vault_load}"
+
+    async def execute(self, raise_on_failure: bool = True) -> DataVaultLoadReport:
+        """Execute the Data Vault load.
+
+        Args:
+            raise_on_failure: Raise a `DataVaultLoadExecutionError` if any statement
+                does not succeed.
+
+        Returns:
+            Report with one result per load statement.
+        """
+        if hasattr(self.connection_pool, "acquire"):
+            return await self._execute(self.connection_pool, raise_on_failure)
+
+        async with BlockingConnectionPool(
+            self.connection_pool, max_connections=self.max_concurrency
+        ) as connection_pool:
+            return await self._execute(connection_pool, raise_on_failure)
+
+    async def _execute(
+        self, connection_pool: AsyncConnectionPool, raise_on_failure: bool
+    ) -> DataVaultLoadReport:
+        """Execute the Data Vault load on a connection pool.
+
+        Args:
+            connection_pool: Connection pool where statements are executed.
+            raise_on_failure: Raise an error if any statement does not succeed.
+
+        Returns:
+            Report with one result per load statement.
+
+        Raises:
+            DataVaultLoadExecutionError: If any statement does not succeed (only when
+                raise_on_failure is True).
+        """
+        self._cancelled = False
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        await self._probe_initial_load(connection_pool)
+        report = DataVaultLoadReport.from_data_vault_load(self.data_vault_load)
+
+        for group in report.groups:
+            if self._cancelled:
+                break
+            await asyncio.gather(
+                *(
+                    self._execute_statement(connection_pool, semaphore, result)
+                    for result in group
+                )
+            )
+
+        _log_report(report, self._logger)
+        if raise_on_failure and not report.succeeded:
+            raise DataVaultLoadExecutionError(report)
+        return report
+
+    async def _probe_initial_load(self, connection_pool: AsyncConnectionPool):
+        """Check which target tables are empty, to load them as empty tables.
+
+        Only applies to loads with InitialLoadMode.AUTO (see
+        `DataVaultLoad.initial_load_probes`).
+
+        Args:
+            connection_pool: Connection pool where the probes are executed.
+        """
+        initial_load_probes = self.data_vault_load.initial_load_probes
+        if not initial_load_probes:
+            return
+
+        empty_table_names = []
+        async with connection_pool.acquire() as connection:
+            for table_name, probe in initial_load_probes.items():
+                if await connection.fetchone(probe) is None:
+                    empty_table_names.append(table_name)
+        self.data_vault_load.set_initial_load_tables(empty_table_names)
+
+    async def _execute_statement(
+        self,
+        connection_pool: AsyncConnectionPool,
+        semaphore: asyncio.Semaphore,
+        result: StatementResult,
+    ):
+        """Execute a load statement, on a connection acquired from the pool.
+
+        Each SQL statement of the script is executed in order, in the same session.
+
+        Args:
+            connection_pool: Connection pool where the statement is executed.
+            semaphore: Semaphore that bounds the number of concurrent statements.
+            result: Result of the statement, updated in place.
+        """
+        async with semaphore:
+            if self._cancelled:
+                return
+
+            result.started_at = datetime.now(timezone.utc)
+            try:
+                async with connection_pool.acquire() as connection:
+                    for sql_statement in split_sql_statements(result.statement):
+                        if self._cancelled:
+                            result.status = StatementStatus.CANCELLED
+                            break
+                        result.rowcount = await connection.execute(sql_statement)
+                    else:
+                        result.status = StatementStatus.SUCCEEDED
+            except Exception as e:  # pylint: disable=broad-except
+                self._cancelled = True
+                result.status = StatementStatus.FAILED
+                result.error = e
+                self._logger.exception("Load of (%s) failed.", result.table_name)
+            finally:
+                result.finished_at = datetime.now(timezone.utc)
+
+        _log_result(result, self._logger)
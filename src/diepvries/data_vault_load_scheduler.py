@@ -0,0 +1,306 @@
+"""Concurrent execution of multiple Data Vault loads."""
+
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Dict, List, Set, Tuple
+
+from . import StatementStatus
+from .data_vault_load import DataVaultLoad
+from .data_vault_load_executor import (
+    ConnectionFactory,
+    DataVaultLoadExecutionError,
+    DataVaultLoadReport,
+    StatementResult,
+    _check_staging_table_visibility,
+    _log_report,
+    _ThreadedExecutor,
+)
+from .link import Link
+from .role_playing_hub import RolePlayingHub
+from .satellite import Satellite
+from .table import DataVaultTable
+
+
+@dataclass(eq=False)
+class _Task:
+    """A load statement, as a node of the scheduler DAG."""
+
+    #: Result of the statement, updated in place.
+    result: StatementResult
+    #: Position of the load, in the list of scheduled loads.
+    load: int
+    #: Physical table written by the statement (schema, name).
+    target: Tuple[str, str]
+    #: Tasks that must succeed before the statement starts.
+    dependencies: List["_Task"] = field(default_factory=list)
+
+
+class DataVaultLoadScheduler(_ThreadedExecutor):
+    """Execute multiple Data Vault loads concurrently.
+
+    All load statements are scheduled on a single DAG, instead of running each load
+    group by group:
+
+    - The statements of a load depend on the creation of its staging table (if not
+      inlined);
+    - A link depends on the hubs of the same load listed in `Link.parent_hub_names`;
+    - A satellite depends on its `Satellite.parent_table`, if part of the same load;
+    - The drop of the staging table (if any) depends on all statements of its load.
+
+    A statement starts as soon as all its dependencies succeeded and no other
+    statement is writing to the same target table (role playing hubs write to their
+    parent hub). Writes to the same table are thus serialized, while everything else
+    runs concurrently, on a thread pool with one database connection per worker.
+    When multiple statements are ready, the lowest `loading_order` runs first.
+
+    When a statement fails, the statements of the same load that did not start yet
+    are cancelled. Other loads are not affected.
+
+    Each load must hold its own table instances (as `DataVaultLoad` assigns its
+    staging table to its target tables). Loads that create a temporary staging table
+    are rejected with a ValueError (see `DataVaultLoad.uses_temporary_staging_table`).
+
+    Target tables are not probed for initial loads (see `InitialLoadMode.AUTO`).
+    Initial loads do not merge into the target table: a table loaded as an empty
+    table (see `DataVaultTable.initial_load`) by more than one load is rejected with
+    a ValueError, as the loads would insert the same records (or open versions)
+    twice.
+    """
+
+    def __init__(
+        self,
+        data_vault_loads: List[DataVaultLoad],
+        connection_factory: ConnectionFactory,
+        max_workers: int = 8,
+    ):
+        """Instantiate a DataVaultLoadScheduler.
+
+        Args:
+            data_vault_loads: Data Vault loads to execute.
+            connection_factory: Function that creates a DB-API 2.0 database
+                connection. It is called once per worker thread.
+            max_workers: Maximum number of statements executed in parallel.
+
+        Raises:
+            ValueError: If a table is loaded as an empty table by more than one load.
+        """
+        initial_load_targets: Set[Tuple[str, str]] = set()
+        for data_vault_load in data_vault_loads:
+            _check_staging_table_visibility(data_vault_load, type(self).__name__)
+            for table in data_vault_load.target_tables:
+                if not table.initial_load:
+                    continue
+                target = self._get_target(table)
+                if target in initial_load_targets:
+                    raise ValueError(
+                        f"{type(self).__name__}: ({'.'.join(target)}) is loaded as an "
+                        f"empty table by more than one load"
+                    )
+                initial_load_targets.add(target)
+        self.data_vault_loads = data_vault_loads
+        self._failed_loads: Set[int] = set()
+        super().__init__(connection_factory, max_workers)
+
+    def __str__(self) -> str:
+        """Representation of a DataVaultLoadScheduler object as a string.
+
+        This helps with the tracking of logging events per entity.
+
+        Returns:
+            String representation of this DataVaultLoadScheduler instance.
+        """
+        return f"{type(self).__name__}: {len(self.data_vault_loads)} load(s)"
+
+    def execute(self, raise_on_failure: bool = True) -> List[DataVaultLoadReport]:
+        """Execute all Data Vault loads.
+
+        Args:
+            raise_on_failure: Raise an error if any statement does not succeed.
+
+        Returns:
+            Reports with one result per load statement, one per Data Vault load.
+
+        Raises:
+            DataVaultLoadExecutionError: If any statement does not succeed (only when
+                raise_on_failure is True). Its report holds the results of all loads.
+        """
+        self._failed_loads.clear()
+        reports = [
+            DataVaultLoadReport.from_data_vault_load(data_vault_load)
+            for data_vault_load in self.data_vault_loads
+        ]
+        tasks = self._build_tasks(reports)
+
+        try:
+            with ThreadPoolExecutor(
+                max_workers=self.max_workers, thread_name_prefix="diepvries"
+            ) as pool:
+                self._run(pool, tasks)
+        finally:
+            self._close_connections()
+
+        report = DataVaultLoadReport(
+            results=[result for report in reports for result in report.results]
+        )
+        _log_report(report, self._logger)
+        if raise_on_failure and not report.succeeded:
+            raise DataVaultLoadExecutionError(report)
+        return reports
+
+    def _build_tasks(self, reports: List[DataVaultLoadReport]) -> List[_Task]:
+        """Build the DAG of load statements.
+
+        Args:
+            reports: Reports of the Data Vault loads (one per load).
+
+        Returns:
+            Tasks, one per load statement.
+        """
+        tasks = []
+        for load, (data_vault_load, report) in enumerate(
+            zip(self.data_vault_loads, reports)
+        ):
+            table_results = report.results
+            staging_tasks = []
+            if not data_vault_load.uses_inline_staging:
+                staging_result, *table_results = report.results
+                staging_table = data_vault_load.staging_table
+                staging_tasks.append(
+                    _Task(
+                        result=staging_result,
+                        load=load,
+                        target=(staging_table.schema, staging_table.name),
+                    )
+                )
+                tasks.extend(staging_tasks)
+
+            # Results follow the same order as target tables
+            # (see DataVaultLoadReport.from_data_vault_load).
+            tasks_by_table: Dict[str, _Task] = {}
+            for table, result in zip(data_vault_load.target_tables, table_results):
+                tasks_by_table[table.name] = _Task(
+                    result=result,
+                    load=load,
+                    target=self._get_target(table),
+                    dependencies=list(staging_tasks),
+                )
+
+            for table in data_vault_load.target_tables:
+                tasks_by_table[table.name].dependencies.extend(
+                    tasks_by_table[parent_name]
+                    for parent_name in self._get_parent_names(table)
+                    if parent_name in tasks_by_table
+                )
+            tasks.extend(tasks_by_table.values())
+
+            # The staging table is dropped once all target tables are loaded.
+            if data_vault_load.staging_drop_sql_statement is not None:
+                staging_table = data_vault_load.staging_table
+                tasks.append(
+                    _Task(
+                        result=report.results[-1],
+                        load=load,
+                        target=(staging_table.schema, staging_table.name),
+                        dependencies=list(tasks_by_table.values()),
+                    )
+                )
+
+        return tasks
+
+    @staticmethod
+    def _get_target(table: DataVaultTable) -> Tuple[str, str]:
+        """Get the physical table written by the load of a table.
+
+        Args:
+            table: Data Vault table.
+
+        Returns:
+            Schema and name of the table.
+        """
+        if isinstance(table, RolePlayingHub):
+            table = table.parent_table
+        return table.schema, table.name
+
+    @staticmethod
+    def _get_parent_names(table: DataVaultTable) -> List[str]:
+        """Get the names of the tables that must be loaded before a table.
+
+        Args:
+            table: Data Vault table.
+
+        Returns:
+            Names of the parent tables.
+        """
+        if isinstance(table, Link):
+            return table.parent_hub_names
+        if isinstance(table, Satellite) and table.parent_table is not None:
+            return [table.parent_table.name]
+        return []
+
+    def _run(self, pool: ThreadPoolExecutor, tasks: List[_Task]):
+        """Run all tasks, respecting dependencies and target table locks.
+
+        Args:
+            pool: Thread pool where statements are executed.
+            tasks: Tasks to run.
+
+        Raises:
+            RuntimeError: If no pending task can start while none is running (their
+                dependencies can never finish).
+        """
+        # Lowest loading order first, then follow the order of the loads.
+        pending = sorted(tasks, key=lambda x: (x.result.group, x.load))
+        finished: Set[int] = set()
+        running: Dict[Future, _Task] = {}
+        locked_targets: Set[Tuple[str, str]] = set()
+
+        while pending or running:
+            for task in list(pending):
+                if len(running) >= self.max_workers:
+                    break
+                if task.load in self._failed_loads or any(
+                    id(dependency) in finished
+                    and dependency.result.status != StatementStatus.SUCCEEDED
+                    for dependency in task.dependencies
+                ):
+                    # Statement will never run: leave it as cancelled.
+                    pending.remove(task)
+                    finished.add(id(task))
+                elif task.target not in locked_targets and all(
+                    id(dependency) in finished for dependency in task.dependencies
+                ):
+                    pending.remove(task)
+                    locked_targets.add(task.target)
+                    running[pool.submit(self._execute_statement, task.result)] = task
+
+            if not running:
+                # Either all tasks finished, or the pending ones are all blocked.
+                if pending:
+                    raise RuntimeError(
+                        f"{type(self).__name__}: ({len(pending)}) statements are "
+                        f"waiting for dependencies that never finish"
+                    )
+                continue
+
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                task = running.pop(future)
+                future.result()
+                locked_targets.discard(task.target)
+                finished.add(id(task))
+                if task.result.status == StatementStatus.FAILED:
+                    self._failed_loads.add(task.load)
+
+    def _is_cancelled(self, result: StatementResult) -> bool:
+        """Check if a statement should not be (further) executed.
+
+        Args:
+            result: Result of the statement.
+
+        Running statements are never interrupted: a failure only cancels the
+        statements that did not start yet.
+
+        Returns:
+            False.
+        """
+        return False
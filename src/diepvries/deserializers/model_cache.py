@@ -0,0 +1,160 @@
+"""On-disk cache of Data Vault model metadata."""
+
+import json
+import logging
+import os
+import time
+from datetime import timedelta
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional, Union
+
+from .. import FixedPrefixLoggerAdapter
+
+# Version of the cache file format. Files with a different version are ignored.
+MODEL_CACHE_VERSION = 1
+
+
+class ColumnMetadata(NamedTuple):
+    """Metadata of a table column, as needed to instantiate a Field."""
+
+    name: str
+    data_type: str
+    is_mandatory: bool
+    precision: Optional[int] = None
+    scale: Optional[int] = None
+    length: Optional[int] = None
+
+
+class ModelCache:
+    """On-disk cache of the column metadata of all tables in a schema.
+
+    Each schema is stored in its own compact JSON file, named after the database and
+    the schema. A cached model is only used if it is not older than `ttl` (when
+    defined) and, when a fingerprint is given, if the fingerprint of the schema did
+    not change since the model was cached.
+    """
+
+    def __init__(self, directory: Union[str, Path], ttl: Optional[timedelta] = None):
+        """Instantiate a ModelCache.
+
+        Args:
+            directory: Directory where cache files are stored (created if needed).
+            ttl: Maximum age of a cached model. Cached models never expire if None.
+        """
+        self.directory = Path(directory)
+        self.ttl = ttl
+
+        self._logger = FixedPrefixLoggerAdapter(logging.getLogger(__name__), str(self))
+
+    def __str__(self) -> str:
+        """Representation of a ModelCache object as a string.
+
+        This helps the tracking of logging events per entity.
+
+        Returns:
+            Logger string format.
+        """
+        return f"{type(self).__name__}: directory={self.directory}"
+
+    def get_path(self, database: str, schema: str) -> Path:
+        """Get the path of the cache file of a schema.
+
+        Args:
+            database: Database name.
+            schema: Schema name.
+
+        Returns:
+            Path of the cache file.
+        """
+        return self.directory / f"{database.lower()}.{schema.lower()}.json"
+
+    def load(
+        self, database: str, schema: str, fingerprint: Optional[str] = None
+    ) -> Optional[Dict[str, List[ColumnMetadata]]]:
+        """Load the cached column metadata of all tables in a schema.
+
+        Args:
+            database: Database name.
+            schema: Schema name.
+            fingerprint: Current fingerprint of the schema. If defined, the cached
+                model is only used if it was stored with the same fingerprint.
+
+        Returns:
+            Mapping between each table and its columns (ordered by position), or None
+            if the model is not cached, expired or outdated.
+        """
+        path = self.get_path(database, schema)
+        try:
+            content = json.loads(path.read_text())
+        except FileNotFoundError:
+            self._logger.info("Model (%s.%s) not cached.", database, schema)
+            return None
+        except (OSError, ValueError):
+            self._logger.warning("Cache file (%s) is not readable.", path)
+            return None
+
+        if content.get("version") != MODEL_CACHE_VERSION:
+            self._logger.info("Cache file (%s) has an outdated format.", path)
+            return None
+        if self.ttl is not None and (
+            time.time() - content["created_at"] > self.ttl.total_seconds()
+        ):
+            self._logger.info("Cached model (%s.%s) expired.", database, schema)
+            return None
+        if fingerprint is not None and content["fingerprint"] != fingerprint:
+            self._logger.info("Cached model (%s.%s) is outdated.", database, schema)
+            return None
+
+        columns = {
+            table_name: [ColumnMetadata(*column) for column in table_columns]
+            for table_name, table_columns in content["tables"].items()
+        }
+        self._logger.info("Model (%s.%s) loaded from cache.", database, schema)
+
+        return columns
+
+    def save(
+        self,
+        database: str,
+        schema: str,
+        columns: Dict[str, List[ColumnMetadata]],
+        fingerprint: Optional[str] = None,
+    ):
+        """Store the column metadata of all tables in a schema.
+
+        The file is written atomically, so that concurrent processes never read a
+        partially written cache.
+
+        Args:
+            database: Database name.
+            schema: Schema name.
+            columns: Mapping between each table and its columns (ordered by
+                position).
+            fingerprint: Current fingerprint of the schema.
+        """
+        content = {
+            "version": MODEL_CACHE_VERSION,
+            "created_at": time.time(),
+            "fingerprint": fingerprint,
+            "tables": {
+                table_name: [list(column) for column in table_columns]
+                for table_name, table_columns in columns.items()
+            },
+        }
+
+        path = self.get_path(database, schema)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        temporary_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        temporary_path.write_text(json.dumps(content, separators=(",", ":")))
+        os.replace(temporary_path, path)
+
+        self._logger.info("Model (%s.%s) stored in cache.", database, schema)
+
+    def invalidate(self, database: str, schema: str):
+        """Remove the cached model of a schema (if it exists).
+
+        Args:
+            database: Database name.
+            schema: Schema name.
+        """
+        self.get_path(database, schema).unlink(missing_ok=True)
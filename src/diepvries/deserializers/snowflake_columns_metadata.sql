@@ -0,0 +1,14 @@
+/* Fetch all needed properties to initialize the fields of a list of tables. */
+SELECT
+  table_name AS "table_name",
+  column_name AS "column_name",
+  data_type AS "data_type",
+  is_nullable AS "is_nullable",
+  character_maximum_length AS "character_maximum_length",
+  numeric_precision AS "numeric_precision",
+  numeric_scale AS "numeric_scale",
+  datetime_precision AS "datetime_precision"
+FROM {target_database}.information_schema.columns
+WHERE table_schema = UPPER('{target_schema}')
+  AND table_name IN ({target_tables})
+ORDER BY table_name, ordinal_position;
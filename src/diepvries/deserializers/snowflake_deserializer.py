@@ -3,11 +3,13 @@
 import json
 import logging
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import asdict, dataclass
+from enum import Enum
 from functools import cached_property
-from typing import Dict, List, Type
+from typing import Any, Collection, Dict, Iterable, List, Optional, Tuple, Type
 
-from snowflake.connector import DictCursor, connect
+from snowflake.connector import DictCursor, SnowflakeConnection, connect
 
 from .. import TABLE_PREFIXES, FieldDataType, FixedPrefixLoggerAdapter, TableType
 from ..driving_key_field import DrivingKeyField
@@ -19,8 +21,37 @@ from ..role_playing_hub import RolePlayingHub
 from ..satellite import Satellite
 from ..table import DataVaultTable
 from . import DESERIALIZERS_DIR
+from .model_cache import ColumnMetadata, ModelCache
 
 METADATA_SQL_FILE_PATH = DESERIALIZERS_DIR / "snowflake_model_metadata.sql"
+TABLE_METADATA_SQL_FILE_PATH = DESERIALIZERS_DIR / "snowflake_table_metadata.sql"
+COLUMNS_METADATA_SQL_FILE_PATH = DESERIALIZERS_DIR / "snowflake_columns_metadata.sql"
+FINGERPRINT_SQL_FILE_PATH = DESERIALIZERS_DIR / "snowflake_model_fingerprint.sql"
+
+# Maximum number of tables fetched with one `SHOW COLUMNS IN TABLE` command per table
+# (when MetadataQueryStrategy.AUTO is used). Above it, a single query on
+# INFORMATION_SCHEMA.COLUMNS is used.
+SHOW_COLUMNS_IN_TABLE_MAX_TABLES = 10
+
+# Maximum number of `SHOW COLUMNS IN TABLE` commands executed concurrently.
+SHOW_COLUMNS_IN_TABLE_MAX_WORKERS = 8
+
+# Data types returned by INFORMATION_SCHEMA.COLUMNS that are named differently in
+# `SHOW COLUMNS` results (and FieldDataType).
+INFORMATION_SCHEMA_DATA_TYPES = {"FLOAT": "REAL"}
+
+
+class MetadataQueryStrategy(Enum):
+    """Possible strategies to fetch the model metadata from Snowflake."""
+
+    # SHOW_COLUMNS_IN_TABLE for a few tables, INFORMATION_SCHEMA otherwise.
+    AUTO = "auto"
+    # One `SHOW COLUMNS IN SCHEMA` command (all tables in the schema are fetched).
+    SCHEMA = "schema"
+    # One `SHOW COLUMNS IN TABLE` command per table, executed concurrently.
+    SHOW_COLUMNS_IN_TABLE = "show_columns_in_table"
+    # One query on INFORMATION_SCHEMA.COLUMNS, filtered by table name.
+    INFORMATION_SCHEMA = "information_schema"
 
 
 @dataclass
@@ -51,11 +82,16 @@ class SnowflakeDeserializer:
         database_configuration: DatabaseConfiguration,
         driving_keys: List[DrivingKeyField] = None,
         role_playing_hubs: Dict[str, str] = None,
+        *,
+        model_cache: Optional[ModelCache] = None,
+        check_model_fingerprint: bool = False,
+        refresh_model_cache: bool = False,
+        metadata_query_strategy: MetadataQueryStrategy = MetadataQueryStrategy.AUTO,
     ):
         """Instantiate a SnowflakeDeserializer.
 
-        Besides setting __init__ arguments as class attributes, it also creates a
-        Snowflake database connection.
+        Besides setting __init__ arguments as class attributes, it also prepares a
+        Snowflake database connection (only created when the database is accessed).
 
         Both target_tables and fields have their own setters (check
         @target_tables.setter and @fields.setter for more detail).
@@ -70,15 +106,25 @@ class SnowflakeDeserializer:
             role_playing_hubs: List of tables that should be created as
                 RolePlayingHub objects. Each dictionary has the role playing hub as key
                 and the parent table as value.
+            model_cache: Cache of the model metadata. When the model is cached, the
+                `SHOW COLUMNS` command is skipped (as well as the database connection,
+                unless check_model_fingerprint is True).
+            check_model_fingerprint: Only use the cached model if the fingerprint of
+                the schema (a hash of its column metadata) did not change.
+            refresh_model_cache: Ignore the cached model, fetching the model metadata
+                from the database (and storing it in the cache).
+            metadata_query_strategy: How to fetch the metadata of the target tables
+                (ignored when model_cache is set, as the whole schema is cached).
         """
         self.target_schema = target_schema
         self.target_tables = [table.lower() for table in target_tables]
-        self.target_database = database_configuration.database
         self.driving_keys = driving_keys or []
         self.role_playing_hubs = role_playing_hubs or {}
-
-        # Create Snowflake database connection.
-        self.database_connection = connect(**asdict(database_configuration))
+        self.database_configuration = database_configuration
+        self.model_cache = model_cache
+        self.check_model_fingerprint = check_model_fingerprint
+        self.refresh_model_cache = refresh_model_cache
+        self.metadata_query_strategy = metadata_query_strategy
 
         self._logger = FixedPrefixLoggerAdapter(logging.getLogger(__name__), str(self))
 
@@ -97,6 +143,24 @@ class SnowflakeDeserializer:
             f"target_tables={';'.join(self.target_tables)}"
         )
 
+    @property
+    def target_database(self) -> str:
+        """Get the name of the database where the Data Vault model is stored.
+
+        Returns:
+            Database name.
+        """
+        return self.database_configuration.database
+
+    @cached_property
+    def database_connection(self) -> SnowflakeConnection:
+        """Get the Snowflake database connection, creating it on first access.
+
+        Returns:
+            Snowflake database connection.
+        """
+        return connect(**asdict(self.database_configuration))
+
     def _deserialize_table(self, target_table_name: str) -> DataVaultTable:
         """Instantiate a DataVault table.
 
@@ -144,8 +208,6 @@ class SnowflakeDeserializer:
     def _fields(self) -> Dict[str, List[Field]]:
         """Deserialize all fields present in `self.target_tables`.
 
-        This deserialization will be done using Snowflake's `SHOW COLUMNS` command.
-
         Returns:
             Mapping between each table and its fields list.
         """
@@ -154,54 +216,265 @@ class SnowflakeDeserializer:
         else:
             tables = self.target_tables
 
-        model_metadata_sql = METADATA_SQL_FILE_PATH.read_text().format(
+        fields = defaultdict(list)
+        for table_name, columns in self._get_model_columns(tables).items():
+            if table_name not in tables:
+                continue
+
+            fields[table_name] = [
+                Field(
+                    parent_table_name=table_name,
+                    name=column.name,
+                    data_type=FieldDataType(column.data_type),
+                    position=position,
+                    is_mandatory=column.is_mandatory,
+                    precision=column.precision,
+                    scale=column.scale,
+                    length=column.length,
+                )
+                # Snowflake's `SHOW COLUMNS` command returns the columns' metadata in
+                # the correct order, but does not return a pre-calculated field with
+                # the position of the field.
+                for position, column in enumerate(columns, start=1)
+            ]
+
+        return fields
+
+    def _get_model_columns(
+        self, tables: Collection[str]
+    ) -> Dict[str, List[ColumnMetadata]]:
+        """Get the column metadata of the model.
+
+        Without model cache, only the metadata of the given tables is fetched (see
+        MetadataQueryStrategy). Otherwise, the metadata of all tables in the target
+        schema is loaded from the cache, or fetched from the database and stored in
+        the cache.
+
+        Args:
+            tables: Names of the tables whose metadata is needed.
+
+        Returns:
+            Mapping between each table and its columns (ordered by position).
+        """
+        if self.model_cache is None:
+            return self._fetch_model_columns(tables)
+
+        fingerprint = self._model_fingerprint if self.check_model_fingerprint else None
+        if not self.refresh_model_cache:
+            columns = self.model_cache.load(
+                self.target_database, self.target_schema, fingerprint=fingerprint
+            )
+            if columns is not None:
+                return columns
+
+        columns = self._fetch_model_columns(strategy=MetadataQueryStrategy.SCHEMA)
+        self.model_cache.save(
+            self.target_database, self.target_schema, columns, fingerprint=fingerprint
+        )
+        return columns
+
+    @property
+    def _model_fingerprint(self) -> str:
+        """Get a fingerprint of the target schema, that changes with its structure.
+
+        Only the columns of the tables are fingerprinted: `LAST_ALTERED` of
+        `INFORMATION_SCHEMA.TABLES` also changes when records are loaded, so the
+        cached model would never be used.
+
+        Returns:
+            Number of columns and order-independent hash of the column metadata of
+            the target schema.
+        """
+        fingerprint_sql = FINGERPRINT_SQL_FILE_PATH.read_text().format(
             target_database=self.target_database, target_schema=self.target_schema
         )
         with self.database_connection.cursor(DictCursor) as cursor:
-            # Get model properties from database metadata (for all tables in
-            # self.target_tables).
-            cursor.execute(model_metadata_sql)
-            fields = defaultdict(list)
-
-            # Variables used to calculate the position of each field within its table.
-            # Snowflake's `SHOW COLUMNS` command returns the columns' metadata in the
-            # correct order, but does not return a pre-calculated field with the
-            # position of the field.
-            previous_table = None
-            position = 1
-
-            for field in cursor:
-                table_name = field["table_name"].lower()
-
-                if table_name not in tables:
-                    continue
-
-                if previous_table != table_name:
-                    position = 1
-
-                data_type_properties = json.loads(field["data_type"])
-
-                fields[table_name].append(
-                    Field(
-                        parent_table_name=table_name,
-                        name=field["column_name"].lower(),
-                        data_type=FieldDataType(
-                            data_type_properties["type"]
-                            if data_type_properties["type"] != "FIXED"
-                            else "NUMBER"
+            cursor.execute(fingerprint_sql)
+            fingerprint = next(iter(cursor))
+
+        return f"{fingerprint['column_count']}:{fingerprint['structure_hash']}"
+
+    def _fetch_model_columns(
+        self,
+        tables: Optional[Collection[str]] = None,
+        strategy: Optional[MetadataQueryStrategy] = None,
+    ) -> Dict[str, List[ColumnMetadata]]:
+        """Fetch the column metadata of the target schema from the database.
+
+        Args:
+            tables: Names of the tables whose metadata is needed (all tables in the
+                target schema if None).
+            strategy: How to fetch the metadata (self.metadata_query_strategy if None).
+
+        Returns:
+            Mapping between each table and its columns (ordered by position).
+        """
+        strategy = strategy or self.metadata_query_strategy
+        if tables is None:
+            strategy = MetadataQueryStrategy.SCHEMA
+        elif strategy == MetadataQueryStrategy.AUTO:
+            strategy = (
+                MetadataQueryStrategy.SHOW_COLUMNS_IN_TABLE
+                if len(tables) <= SHOW_COLUMNS_IN_TABLE_MAX_TABLES
+                else MetadataQueryStrategy.INFORMATION_SCHEMA
+            )
+        self._logger.info("Fetching model metadata (strategy: %s).", strategy.value)
+
+        if strategy == MetadataQueryStrategy.SHOW_COLUMNS_IN_TABLE:
+            with ThreadPoolExecutor(
+                max_workers=min(len(tables), SHOW_COLUMNS_IN_TABLE_MAX_WORKERS) or 1
+            ) as pool:
+                rows = [
+                    row
+                    for table_rows in pool.map(
+                        self._execute_metadata_query,
+                        (
+                            TABLE_METADATA_SQL_FILE_PATH.read_text().format(
+                                target_database=self.target_database,
+                                target_schema=self.target_schema,
+                                target_table=table,
+                            )
+                            for table in sorted(tables)
                         ),
-                        position=position,
-                        is_mandatory=not (data_type_properties["nullable"]),
-                        precision=data_type_properties.get("precision"),
-                        scale=data_type_properties.get("scale"),
-                        length=data_type_properties.get("length"),
                     )
+                    for row in table_rows
+                ]
+            return self._parse_show_columns(rows, tables)
+
+        if strategy == MetadataQueryStrategy.INFORMATION_SCHEMA:
+            columns_metadata_sql = COLUMNS_METADATA_SQL_FILE_PATH.read_text().format(
+                target_database=self.target_database,
+                target_schema=self.target_schema,
+                target_tables=", ".join(
+                    f"'{table.upper()}'" for table in sorted(tables)
+                ),
+            )
+            return self._parse_information_schema_columns(
+                self._execute_metadata_query(columns_metadata_sql)
+            )
+
+        model_metadata_sql = METADATA_SQL_FILE_PATH.read_text().format(
+            target_database=self.target_database, target_schema=self.target_schema
+        )
+        return self._parse_show_columns(
+            self._execute_metadata_query(model_metadata_sql), tables
+        )
+
+    def fetch_table_columns(
+        self, table: str, schema: Optional[str] = None
+    ) -> List[ColumnMetadata]:
+        """Fetch the column metadata of any table of the target database.
+
+        Used to get the columns of an extraction table (see
+        `DataVaultLoad.extract_columns`).
+
+        Args:
+            table: Table name.
+            schema: Schema of the table (target_schema if None).
+
+        Returns:
+            Columns of the table (ordered by position).
+        """
+        table_metadata_sql = TABLE_METADATA_SQL_FILE_PATH.read_text().format(
+            target_database=self.target_database,
+            target_schema=schema or self.target_schema,
+            target_table=table,
+        )
+        return self._parse_show_columns(
+            self._execute_metadata_query(table_metadata_sql)
+        ).get(table.lower(), [])
+
+    def _execute_metadata_query(self, sql: str) -> List[Dict[str, Any]]:
+        """Execute a metadata query, in its own cursor.
+
+        Args:
+            sql: Metadata query.
+
+        Returns:
+            Query results.
+        """
+        with self.database_connection.cursor(DictCursor) as cursor:
+            cursor.execute(sql)
+            return list(cursor)
+
+    @staticmethod
+    def _parse_show_columns(
+        rows: Iterable[Dict[str, Any]], tables: Optional[Collection[str]] = None
+    ) -> Dict[str, List[ColumnMetadata]]:
+        """Parse the results of Snowflake's `SHOW COLUMNS` command.
+
+        Args:
+            rows: Results of the command (ordered by table and column position).
+            tables: Names of the tables whose metadata is needed (all tables if None).
+
+        Returns:
+            Mapping between each table and its columns (ordered by position).
+        """
+        columns = defaultdict(list)
+
+        for column in rows:
+            table_name = column["table_name"].lower()
+
+            if tables is not None and table_name not in tables:
+                continue
+
+            data_type_properties = json.loads(column["data_type"])
+
+            columns[table_name].append(
+                ColumnMetadata(
+                    name=column["column_name"].lower(),
+                    data_type=(
+                        data_type_properties["type"]
+                        if data_type_properties["type"] != "FIXED"
+                        else "NUMBER"
+                    ),
+                    is_mandatory=not (data_type_properties["nullable"]),
+                    precision=data_type_properties.get("precision"),
+                    scale=data_type_properties.get("scale"),
+                    length=data_type_properties.get("length"),
                 )
+            )
 
-                position += 1
-                previous_table = table_name
+        return columns
 
-        return fields
+    @staticmethod
+    def _parse_information_schema_columns(
+        rows: Iterable[Dict[str, Any]],
+    ) -> Dict[str, List[ColumnMetadata]]:
+        """Parse the results of a query on INFORMATION_SCHEMA.COLUMNS.
+
+        Results are converted to the same metadata returned by `SHOW COLUMNS`.
+
+        Args:
+            rows: Results of the query (ordered by table and column position).
+
+        Returns:
+            Mapping between each table and its columns (ordered by position).
+        """
+        columns = defaultdict(list)
+
+        for column in rows:
+            data_type = INFORMATION_SCHEMA_DATA_TYPES.get(
+                column["data_type"], column["data_type"]
+            )
+            precision, scale = _get_information_schema_precision(data_type, column)
+            columns[column["table_name"].lower()].append(
+                ColumnMetadata(
+                    name=column["column_name"].lower(),
+                    data_type=data_type,
+                    is_mandatory=column["is_nullable"] == "NO",
+                    precision=precision,
+                    scale=scale,
+                    length=(
+                        column["character_maximum_length"]
+                        if data_type
+                        in (FieldDataType.TEXT.value, FieldDataType.BINARY.value)
+                        else None
+                    ),
+                )
+            )
+
+        return columns
 
     def _get_table_type(self, target_table_name: str) -> Type[DataVaultTable]:
         """Get the type (class) that should be used to instantiate a given target table.
@@ -259,3 +532,24 @@ class SnowflakeDeserializer:
             rph.parent_table = self._deserialize_table(self.role_playing_hubs[rph.name])
 
         return deserialized_target_tables
+
+
+def _get_information_schema_precision(
+    data_type: str, column: Dict[str, Any]
+) -> Tuple[Optional[int], Optional[int]]:
+    """Get precision and scale of a column, as returned by `SHOW COLUMNS`.
+
+    Args:
+        data_type: Column data type.
+        column: Column metadata, from INFORMATION_SCHEMA.COLUMNS.
+
+    Returns:
+        Precision and scale of the column.
+    """
+    if data_type == FieldDataType.NUMBER.value:
+        return column["numeric_precision"], column["numeric_scale"]
+    if data_type.startswith(FieldDataType.TIME.value):
+        # Time and timestamp types: `SHOW COLUMNS` returns the fractional seconds
+        # precision as scale.
+        return 0, column["datetime_precision"]
+    return None, None
@@ -0,0 +1,16 @@
+/* Fetch a fingerprint of the model structure, that only changes when a column is added, altered or dropped (not when records are loaded). */
+SELECT
+  COUNT(*) AS "column_count",
+  HASH_AGG(
+    table_name,
+    column_name,
+    ordinal_position,
+    data_type,
+    is_nullable,
+    character_maximum_length,
+    numeric_precision,
+    numeric_scale,
+    datetime_precision
+  ) AS "structure_hash"
+FROM {target_database}.information_schema.columns
+WHERE table_schema = UPPER('{target_schema}');
@@ -1,12 +1,16 @@
 """An effectivity satellite."""
 
-from typing import Dict, List
+from typing import Dict, List, Tuple
 
-from . import TEMPLATES_DIR
+from . import SatelliteLoadMode
 from .driving_key_field import DrivingKeyField
 from .field import Field
+from .pruning import PreScanPruning
 from .satellite import Satellite
+from .table import sql_artifact
+from .template_sql import get_template
 from .template_sql.sql_formulas import (
+    BEGINNING_OF_TIME_SQL_TEMPLATE,
     RECORD_END_TIMESTAMP_SQL_TEMPLATE,
     format_fields_for_join,
     format_fields_for_select,
@@ -24,8 +28,18 @@ class EffectivitySatellite(Satellite):
     a given point in time. This means that, if a customer changes contacts, only the
     latest relationship between the Customer and its Contact is kept as an open
     relationship. Hub Customer's hashkey would be the driving key.
+
+    With SatelliteLoadMode.SINGLE_PASS, the open version of each driving key is
+    looked up once, with a QUALIFY over a single join of the staging table, the link
+    and the satellite, instead of also joining them to calculate the minimum
+    timestamps before the MERGE statement.
     """
 
+    _pruning_template_prefix = "effectivity_satellite"
+
+    # Versions are end dated by driving key, in the MERGE statement.
+    _load_modes = (SatelliteLoadMode.MERGE, SatelliteLoadMode.SINGLE_PASS)
+
     def __init__(
         self,
         schema: str,
@@ -51,19 +65,91 @@ class EffectivitySatellite(Satellite):
         self.driving_keys = driving_keys
 
     @property
+    def _sql_cache_key(self) -> Tuple:
+        """Get the key that identifies the current version of the SQL artifacts.
+
+        Driving keys are part of the effectivity satellite key.
+
+        Returns:
+            Key of the SQL artifacts.
+        """
+        return (
+            *super()._sql_cache_key,
+            tuple(
+                (driving_key.parent_table_name, driving_key.name)
+                for driving_key in self.driving_keys
+            ),
+        )
+
+    @property
+    def _min_timestamp_tables(self) -> Dict[str, str]:
+        """Get the minimum timestamps of the load statement.
+
+        Both the parent link and the effectivity satellite are pruned (the link
+        first, as the satellite minimum timestamp depends on it).
+
+        Returns:
+            Name of the table bounded by each minimum timestamp, indexed by the
+            minimum timestamp placeholder.
+        """
+        return {
+            "min_timestamp_link": self.parent_table.name,
+            "min_timestamp_satellite": self.name,
+        }
+
+    def get_pruning_placeholders(
+        self, sql_placeholders: Dict[str, str]
+    ) -> Dict[str, str]:
+        """Get the placeholders that prune the target records scanned by the load.
+
+        In single pass mode, the pre-scan is the join of the load statement itself:
+        the link and satellite records are not bounded beforehand, and the MERGE
+        target is bounded by the earliest open version found by that join (see
+        template_sql.effectivity_satellite_single_pass_dml.sql).
+
+        Args:
+            sql_placeholders: Placeholders of the load statement.
+
+        Returns:
+            Statements that run before the load statement (pruning_statements) and
+            the SQL expression of each minimum timestamp.
+        """
+        if self.load_mode == SatelliteLoadMode.SINGLE_PASS and isinstance(
+            self.pruning_strategy, PreScanPruning
+        ):
+            pruning_placeholders = {
+                f"{variable}{suffix}": BEGINNING_OF_TIME_SQL_TEMPLATE
+                for variable in self._min_timestamp_tables
+                for suffix in ("", "_bound", "_merge")
+            }
+            pruning_placeholders.update(
+                pruning_ctes="", pruning_columns="", pruning_statements=""
+            )
+            return pruning_placeholders
+        return super().get_pruning_placeholders(sql_placeholders)
+
+    @sql_artifact
     def sql_load_statement(self) -> str:
         """Get the SQL query to populate current effectivity satellite.
 
         All needed placeholders are calculated, in order to match template SQL (check
-        template_sql.effectivity_satellite_dml.sql).
+        template_sql.effectivity_satellite_dml.sql, or
+        template_sql.effectivity_satellite_single_pass_dml.sql with
+        SatelliteLoadMode.SINGLE_PASS, and
+        template_sql.effectivity_satellite_initial_dml.sql in initial loads).
 
         Returns:
             SQL query to load target satellite.
         """
-        sql_load_statement = (
-            (TEMPLATES_DIR / "effectivity_satellite_dml.sql")
-            .read_text()
-            .format(**self.sql_placeholders)
+        sql_placeholders = self.sql_placeholders
+        if self.initial_load:
+            template_name = "effectivity_satellite_initial_dml.sql"
+        elif self.load_mode == SatelliteLoadMode.SINGLE_PASS:
+            template_name = "effectivity_satellite_single_pass_dml.sql"
+        else:
+            template_name = "effectivity_satellite_dml.sql"
+        sql_load_statement = get_template(template_name).render(
+            **sql_placeholders, **self.get_pruning_placeholders(sql_placeholders)
         )
 
         self._logger.info(
@@ -73,7 +159,7 @@ class EffectivitySatellite(Satellite):
 
         return sql_load_statement
 
-    @property
+    @sql_artifact
     def sql_placeholders(self) -> Dict[str, str]:
         """Calculate effectivity satellite specific placeholders.
 
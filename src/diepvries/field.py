@@ -1,5 +1,7 @@
 """Module for a Data Vault field."""
 
+import sys
+from functools import lru_cache
 from typing import Optional
 
 from . import (
@@ -15,7 +17,33 @@ from . import (
 
 
 class Field:
-    """A field in a Data Vault model."""
+    """A field in a Data Vault model.
+
+    Fields are immutable (all attributes are read-only properties): all properties
+    derived from the field name (role, prefix, suffix, parent table type and staging
+    representations) are calculated once, when the field is instantiated.
+    """
+
+    # pylint: disable=too-many-instance-attributes
+
+    __slots__ = (
+        "_parent_table_name",
+        "_name",
+        "_data_type",
+        "_position",
+        "_is_mandatory",
+        "_precision",
+        "_scale",
+        "_length",
+        "_prefix",
+        "_suffix",
+        "_parent_table_type",
+        "_role",
+        "_data_type_sql",
+        "_name_in_staging",
+        "_ddl_in_staging",
+        "_hash_concatenation_sql",
+    )
 
     def __init__(
         self,
@@ -42,17 +70,62 @@ class Field:
                 separator). Only applicable when `self.data_type==FieldDataType.NUMBER`.
             scale: Numeric scale (maximum number of digits after the decimal
                 separator). Only applicable when `self.data_type==FieldDataType.NUMBER`.
-            length: Character length (maximum number of characters allowed). Only
-                applicable when `self.data_type==FieldDataType.TEXT`.
+            length: Character length (maximum number of characters allowed), or
+                binary length (maximum number of bytes). Only applicable when
+                `self.data_type` is `FieldDataType.TEXT` or `FieldDataType.BINARY`.
         """
-        self.parent_table_name = parent_table_name.lower()
-        self.name = name.lower()
-        self.data_type = data_type
-        self.position = position
-        self.is_mandatory = is_mandatory
-        self.precision = precision
-        self.scale = scale
-        self.length = length
+        # Names are interned, as the same names (metadata fields, hashkeys, parent
+        # table names) are repeated across all fields of a model.
+        self._parent_table_name = sys.intern(parent_table_name.lower())
+        self._name = sys.intern(name.lower())
+        self._data_type = data_type
+        self._position = position
+        self._is_mandatory = is_mandatory
+        self._precision = precision
+        self._scale = scale
+        self._length = length
+
+        name_parts = self._name.split("_")
+        self._prefix = sys.intern(name_parts[0])
+        self._suffix = sys.intern(name_parts[-1])
+        self._parent_table_type = _get_table_type(self._parent_table_name)
+        self._data_type_sql = _get_data_type_sql(data_type, precision, scale, length)
+
+        self._role = self._get_role()
+
+        # Properties that depend on the field role are only calculated when a valid
+        # role was found (otherwise, the `RuntimeError` is raised when accessing them).
+        name_in_staging = ddl_in_staging = hash_concatenation_sql = None
+        if self._role is not None:
+            name_in_staging = self._get_name_in_staging()
+            ddl_in_staging = sys.intern(
+                f"{name_in_staging} {self._data_type_sql}"
+                f"{' NOT NULL' if is_mandatory else ''}"
+            )
+            hash_concatenation_sql = sys.intern(self._get_hash_concatenation_sql())
+        self._name_in_staging = name_in_staging
+        self._ddl_in_staging = ddl_in_staging
+        self._hash_concatenation_sql = hash_concatenation_sql
+
+    def __reduce__(self):
+        """Support copy and pickle (needed given that fields are immutable).
+
+        Returns:
+            Arguments needed to instantiate a copy of the field.
+        """
+        return (
+            type(self),
+            (
+                self.parent_table_name,
+                self.name,
+                self.data_type,
+                self.position,
+                self.is_mandatory,
+                self.precision,
+                self.scale,
+                self.length,
+            ),
+        )
 
     def __hash__(self):
         """Hash of a Data Vault field."""
@@ -72,20 +145,97 @@ class Field:
         """
         return f"{type(self).__name__}: {self.name}"
 
+    @property
+    def parent_table_name(self) -> str:
+        """Get name of parent table in the database."""
+        return self._parent_table_name
+
+    @property
+    def name(self) -> str:
+        """Get column name in the database."""
+        return self._name
+
+    @property
+    def data_type(self) -> FieldDataType:
+        """Get column data type in the database."""
+        return self._data_type
+
+    @property
+    def position(self) -> int:
+        """Get column position in the database."""
+        return self._position
+
+    @property
+    def is_mandatory(self) -> bool:
+        """Get whether the column is mandatory in the database."""
+        return self._is_mandatory
+
+    @property
+    def precision(self) -> Optional[int]:
+        """Get numeric precision, only applicable to NUMBER columns."""
+        return self._precision
+
+    @property
+    def scale(self) -> Optional[int]:
+        """Get numeric scale, only applicable to NUMBER columns."""
+        return self._scale
+
+    @property
+    def length(self) -> Optional[int]:
+        """Get character (or byte) length, only applicable to TEXT/BINARY columns."""
+        return self._length
+
     @property
     def data_type_sql(self) -> str:
         """Build SQL expression to represent the field data type."""
-        if self.data_type == FieldDataType.NUMBER:
-            return f"{self.data_type.value} ({self.precision}, {self.scale})"
-        if self.data_type == FieldDataType.TEXT and self.length:
-            return f"{self.data_type.value} ({self.length})"
-
-        return f"{self.data_type.name}"
+        return self._data_type_sql
 
     @property
     def hash_concatenation_sql(self) -> str:
         """Build SQL expression to deterministically represent the field as a string.
 
+        See `_get_hash_concatenation_sql`.
+
+        Returns:
+            SQL expression to deterministically represent the field as a string.
+
+        Raises:
+            RuntimeError: When no field role can be attributed.
+        """
+        if self._hash_concatenation_sql is None:
+            raise RuntimeError(self._role_error_message)
+        return self._hash_concatenation_sql
+
+    def get_hash_concatenation_sql(
+        self, cast: bool = True, coalesce: bool = True
+    ) -> str:
+        """Build SQL expression to represent the field as a string, skipping steps.
+
+        Skipping a step only produces the same string as `hash_concatenation_sql`
+        when it is redundant: the cast, when the field is already stored with its
+        data type in the extraction table; the COALESCE, when it is never NULL there.
+
+        Args:
+            cast: Cast the field to its data type in the DV model (step 1).
+            coalesce: Replace NULL by a default value (step 3).
+
+        Returns:
+            SQL expression to represent the field as a string.
+
+        Raises:
+            RuntimeError: When no field role can be attributed.
+        """
+        if cast and coalesce:
+            return self.hash_concatenation_sql
+        if self._role is None:
+            raise RuntimeError(self._role_error_message)
+        return self._get_hash_concatenation_sql(cast=cast, coalesce=coalesce)
+
+    def _get_hash_concatenation_sql(
+        self, cast: bool = True, coalesce: bool = True
+    ) -> str:
+        """Build SQL expression to deterministically represent the field as a string.
+
         This expression is needed to produce hashes (hashkey/hashdiff) that are
         consistent, independently on the data type used to store the field in the
         extraction table.
@@ -97,6 +247,10 @@ class Field:
         on the field data type.
         3. Ensure the result of step 2 never returns NULL.
 
+        Args:
+            cast: Include step 1.
+            coalesce: Include step 3.
+
         Returns:
             SQL expression to deterministically represent the field as a string.
         """
@@ -104,11 +258,12 @@ class Field:
         date_format = "yyyy-mm-dd"
         time_format = "hh24:mi:ss.ff9"
         timezone_format = "tzhtzm"
-        cast_expression = (
-            f"CAST({self.name} AS {self.data_type_sql})"
-            if self.data_type != FieldDataType.GEOGRAPHY
-            else f"TO_GEOGRAPHY({self.name})"
-        )
+        if not cast:
+            cast_expression = self.name
+        elif self.data_type != FieldDataType.GEOGRAPHY:
+            cast_expression = f"CAST({self.name} AS {self.data_type_sql})"
+        else:
+            cast_expression = f"TO_GEOGRAPHY({self.name})"
 
         if self.data_type in (FieldDataType.TIMESTAMP_LTZ, FieldDataType.TIMESTAMP_TZ):
             hash_concatenation_sql = (
@@ -128,10 +283,16 @@ class Field:
             hash_concatenation_sql = cast_expression
         elif self.data_type == FieldDataType.GEOGRAPHY:
             hash_concatenation_sql = f"ST_ASTEXT({cast_expression})"
+        elif self.data_type == FieldDataType.BINARY:
+            # Independent of the BINARY_OUTPUT_FORMAT session parameter.
+            hash_concatenation_sql = f"HEX_ENCODE({cast_expression})"
         else:
             hash_concatenation_sql = f"CAST({cast_expression} AS TEXT)"
 
-        default_value = UNKNOWN if self.role == FieldRole.BUSINESS_KEY else ""
+        if not coalesce:
+            return hash_concatenation_sql
+
+        default_value = UNKNOWN if self._role == FieldRole.BUSINESS_KEY else ""
 
         return f"COALESCE({hash_concatenation_sql}, '{default_value}')"
 
@@ -142,7 +303,7 @@ class Field:
         Returns:
             Field suffix.
         """
-        return self.name.split("_").pop()
+        return self._suffix
 
     @property
     def prefix(self) -> str:
@@ -151,7 +312,7 @@ class Field:
         Returns:
            Field prefix.
         """
-        return next(split_part for split_part in self.name.split("_"))
+        return self._prefix
 
     @property
     def parent_table_type(self) -> TableType:
@@ -160,19 +321,27 @@ class Field:
         Returns:
             Table type (HUB, LINK or SATELLITE).
         """
-        table_prefix = next(
-            split_part for split_part in self.parent_table_name.split("_")
-        )
-        if table_prefix in TABLE_PREFIXES[TableType.LINK]:
-            return TableType.LINK
-        if table_prefix in TABLE_PREFIXES[TableType.SATELLITE]:
-            return TableType.SATELLITE
-        return TableType.HUB
+        return self._parent_table_type
 
     @property
     def name_in_staging(self) -> str:
         """Get the name that this field should have, when created in a staging table.
 
+        See `_get_name_in_staging`.
+
+        Returns:
+            Name of the field in staging.
+
+        Raises:
+            RuntimeError: When no field role can be attributed.
+        """
+        if self._name_in_staging is None:
+            raise RuntimeError(self._role_error_message)
+        return self._name_in_staging
+
+    def _get_name_in_staging(self) -> str:
+        """Get the name that this field should have, when created in a staging table.
+
         In most cases this function will return `self.name`, but for hashdiffs the name
         is <parent_table_name>_hashdiff (every Satellite has one hashdiff field, named
         s_hashdiff).
@@ -180,8 +349,10 @@ class Field:
         Returns:
             Name of the field in staging.
         """
-        if self.role == FieldRole.HASHDIFF:
-            return f"{self.parent_table_name}_{FIELD_SUFFIX[FieldRole.HASHDIFF]}"
+        if self._role == FieldRole.HASHDIFF:
+            return sys.intern(
+                f"{self.parent_table_name}_{FIELD_SUFFIX[FieldRole.HASHDIFF]}"
+            )
         return self.name
 
     @property
@@ -190,11 +361,13 @@ class Field:
 
         Returns:
             The DDL expression for this field.
+
+        Raises:
+            RuntimeError: When no field role can be attributed.
         """
-        return (
-            f"{self.name_in_staging} {self.data_type_sql}"
-            f"{' NOT NULL' if self.is_mandatory else ''}"
-        )
+        if self._ddl_in_staging is None:
+            raise RuntimeError(self._role_error_message)
+        return self._ddl_in_staging
 
     @property
     def role(self) -> FieldRole:
@@ -208,36 +381,95 @@ class Field:
         Raises:
             RuntimeError: When no field role can be attributed.
         """
+        if self._role is None:
+            raise RuntimeError(self._role_error_message)
+        return self._role
+
+    @property
+    def _role_error_message(self) -> str:
+        """Get the error message used when no field role can be attributed.
+
+        Returns:
+            Error message.
+        """
+        return (
+            f"{self.name}: It was not possible to assign a valid field role "
+            f" (validate FieldRole and FIELD_PREFIXES configuration)"
+        )
+
+    def _get_role(self) -> Optional[FieldRole]:
+        """Calculate the role of the field in a Data Vault model.
+
+        Returns:
+            Field role in a Data Vault model, or None when no field role can be
+            attributed.
+        """
         found_role: Optional[FieldRole] = None
 
         if self.name in METADATA_FIELDS.values():
             found_role = FieldRole.METADATA
         elif (
-            self.name == f"{self.parent_table_name}_{self.suffix}"
-            and self.suffix == FIELD_SUFFIX[FieldRole.HASHKEY]
+            self.name == f"{self.parent_table_name}_{self._suffix}"
+            and self._suffix == FIELD_SUFFIX[FieldRole.HASHKEY]
         ):
             found_role = FieldRole.HASHKEY
-        elif self.suffix == FIELD_SUFFIX[FieldRole.HASHKEY]:
+        elif self._suffix == FIELD_SUFFIX[FieldRole.HASHKEY]:
             found_role = FieldRole.HASHKEY_PARENT
-        elif self.prefix == FIELD_PREFIX[FieldRole.CHILD_KEY]:
+        elif self._prefix == FIELD_PREFIX[FieldRole.CHILD_KEY]:
             found_role = FieldRole.CHILD_KEY
         elif (
-            self.parent_table_type != TableType.SATELLITE
-            and self.prefix not in FIELD_PREFIX.values()
+            self._parent_table_type != TableType.SATELLITE
+            and self._prefix not in FIELD_PREFIX.values()
             and self.position != 1
         ):
             found_role = FieldRole.BUSINESS_KEY
-        elif self.suffix == FIELD_SUFFIX[FieldRole.HASHDIFF]:
+        elif self._suffix == FIELD_SUFFIX[FieldRole.HASHDIFF]:
             found_role = FieldRole.HASHDIFF
-        elif self.parent_table_type == TableType.SATELLITE:
+        elif self._parent_table_type == TableType.SATELLITE:
             found_role = FieldRole.DESCRIPTIVE
 
-        if found_role is not None:
-            return found_role
-
-        raise RuntimeError(
-            (
-                f"{self.name}: It was not possible to assign a valid field role "
-                f" (validate FieldRole and FIELD_PREFIXES configuration)"
-            )
-        )
+        return found_role
+
+
+@lru_cache(maxsize=None)
+def _get_table_type(table_name: str) -> TableType:
+    """Get the type of a table, based on its prefix.
+
+    Args:
+        table_name: Table name.
+
+    Returns:
+        Table type (HUB, LINK or SATELLITE).
+    """
+    table_prefix = next(split_part for split_part in table_name.split("_"))
+    if table_prefix in TABLE_PREFIXES[TableType.LINK]:
+        return TableType.LINK
+    if table_prefix in TABLE_PREFIXES[TableType.SATELLITE]:
+        return TableType.SATELLITE
+    return TableType.HUB
+
+
+@lru_cache(maxsize=None)
+def _get_data_type_sql(
+    data_type: FieldDataType,
+    precision: Optional[int],
+    scale: Optional[int],
+    length: Optional[int],
+) -> str:
+    """Build SQL expression to represent a data type.
+
+    Args:
+        data_type: Field data type.
+        precision: Numeric precision.
+        scale: Numeric scale.
+        length: Character (or byte) length.
+
+    Returns:
+        SQL expression of the data type.
+    """
+    if data_type == FieldDataType.NUMBER:
+        return f"{data_type.value} ({precision}, {scale})"
+    if data_type in (FieldDataType.TEXT, FieldDataType.BINARY) and length:
+        return f"{data_type.value} ({length})"
+
+    return f"{data_type.name}"
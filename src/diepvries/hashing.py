@@ -0,0 +1,530 @@
+"""Calculation of hashkeys and hashdiffs in Python.
+
+Hashkeys and hashdiffs are usually calculated in Snowflake, while creating the staging
+table (see `DataVaultTable.hashkey_sql` and `Satellite.hashdiff_sql`). This module
+calculates the same hashes in Python, from columnar batches of extracted data, so
+that they can be calculated before the data is uploaded to Snowflake.
+
+Batches are columnar at the interface only: Arrow, NumPy and pandas columns are
+converted to lists of Python objects, and values are converted, concatenated and
+hashed row by row, in pure Python. This is a row-wise fallback, that needs no
+optional dependency: its throughput is bound by the Python interpreter, not by a
+vectorized (e.g. `pyarrow.compute`) implementation.
+
+Each field is converted to the string produced by `Field.hash_concatenation_sql`:
+
+- TEXT: the value itself;
+- NUMBER: the value rounded to the field scale (half away from zero), with exactly
+  `scale` decimal digits;
+- REAL: the value with (up to) 15 significant digits, in Snowflake's format;
+- BOOLEAN: `true` or `false`;
+- DATE, TIME and TIMESTAMP_*: the value formatted as `yyyy-mm-dd`, `hh24:mi:ss.ff9`
+  and `tzhtzm` (naive timestamps are in the session time zone);
+- ARRAY, OBJECT and VARIANT: compact JSON, with object keys sorted (strings stored
+  in a VARIANT are not quoted);
+- GEOGRAPHY: the value in WKT, that is expected to follow Snowflake's `ST_ASTEXT`
+  format;
+- BINARY: the value in (upper case) hexadecimal (strings are expected to be
+  hexadecimal already).
+
+Hashes are calculated by the hash function of the table (see `HashFunction`):
+hexadecimal strings (MD5, SHA1 and SHA2) or bytes (MD5_BINARY, SHA1_BINARY and
+SHA2_BINARY). HASH, Snowflake's own 64-bit hash, cannot be calculated in Python.
+
+NULL values (`None`) are replaced by `UNKNOWN` for business keys, and by an empty
+string otherwise. Trailing empty fields are removed from hashdiffs as by the
+hashdiff formula of the satellite (see `HashdiffFormula`).
+"""
+
+import functools
+import hashlib
+import json
+import re
+from datetime import date, datetime, time, timedelta, timezone, tzinfo
+from decimal import ROUND_HALF_UP, Decimal
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Sequence, Union
+
+from . import (
+    HASH_DELIMITER,
+    UNKNOWN,
+    FieldDataType,
+    FieldRole,
+    HashdiffFormula,
+    HashFunction,
+)
+from .field import Field
+from .satellite import Satellite
+from .table import DataVaultTable
+
+# Columnar batch: mapping between each field name and its values (a list, or any
+# array that implements `to_pylist` (Arrow) or `tolist` (NumPy, pandas), converted
+# to a list before hashing).
+ColumnarBatch = Mapping[str, Any]
+
+# Hashkey or hashdiff, as returned by the hash function of the table.
+Hash = Union[str, bytes]
+
+# Textual values accepted by Snowflake when casting to BOOLEAN.
+_BOOLEAN_VALUES = {
+    **dict.fromkeys(("true", "t", "yes", "y", "on", "1"), "true"),
+    **dict.fromkeys(("false", "f", "no", "n", "off", "0"), "false"),
+}
+
+# Trailing delimiters removed from the hashdiff concatenation (see
+# HASHDIFF_SQL_TEMPLATE).
+_TRAILING_DELIMITERS = re.compile(f"(?:{re.escape(HASH_DELIMITER)})+$")
+
+
+def hashkeys(
+    table: DataVaultTable,
+    batch: ColumnarBatch,
+    session_timezone: tzinfo = timezone.utc,
+) -> List[Hash]:
+    """Calculate the hashkey of each row of a batch, as in `table.hashkey_sql`.
+
+    Args:
+        table: Hub or link whose hashkey is calculated.
+        batch: Values of the business keys and child keys of the table, by field
+            name.
+        session_timezone: Time zone of the Snowflake session (TIMEZONE parameter).
+
+    Returns:
+        Hashkey of each row.
+    """
+    hash_function = _get_hash_function(table)
+    return [
+        hash_function(row.encode("utf-8"))
+        for row in _concatenate(table.hashkey_fields, batch, session_timezone)
+    ]
+
+
+def hashdiffs(
+    satellite: Satellite,
+    batch: ColumnarBatch,
+    session_timezone: tzinfo = timezone.utc,
+) -> List[Hash]:
+    """Calculate the hashdiff of each row of a batch, as in `satellite.hashdiff_sql`.
+
+    Args:
+        satellite: Satellite whose hashdiff is calculated.
+        batch: Values of the business keys and child keys of the parent table, and
+            of the descriptive fields of the satellite, by field name.
+        session_timezone: Time zone of the Snowflake session (TIMEZONE parameter).
+
+    Returns:
+        Hashdiff of each row.
+    """
+    hash_function = _get_hash_function(satellite)
+    if satellite.hashdiff_formula == HashdiffFormula.STRUCTURAL:
+        rows = map(
+            _join_without_trailing_empty_values,
+            _get_rows(satellite.hashdiff_fields, batch, session_timezone),
+        )
+    else:
+        rows = (
+            _TRAILING_DELIMITERS.sub("", row)
+            for row in _concatenate(satellite.hashdiff_fields, batch, session_timezone)
+        )
+    return [hash_function(row.encode("utf-8")) for row in rows]
+
+
+def hash_concatenation_values(
+    field: Field, values: Any, session_timezone: tzinfo = timezone.utc
+) -> List[str]:
+    """Convert values to their string representation in hashes.
+
+    This is the Python equivalent of `field.hash_concatenation_sql`.
+
+    Args:
+        field: Field the values belong to.
+        values: Values to convert (a list or an Arrow/NumPy array).
+        session_timezone: Time zone of the Snowflake session (TIMEZONE parameter).
+
+    Returns:
+        String representation of each value.
+
+    Raises:
+        ValueError: If a value cannot be converted to the field data type.
+    """
+    default_value = UNKNOWN if field.role == FieldRole.BUSINESS_KEY else ""
+    to_string = _get_converter(field, session_timezone)
+
+    result = []
+    for value in _to_list(values):
+        if value is None:
+            result.append(default_value)
+            continue
+        try:
+            result.append(to_string(value))
+        except (ArithmeticError, TypeError, ValueError) as e:
+            raise ValueError(
+                f"{field.parent_table_name}.{field.name}: Value {value!r} cannot be "
+                f"converted to {field.data_type_sql}"
+            ) from e
+    return result
+
+
+def timestamp_values(
+    field: Field, values: Any, session_timezone: tzinfo = timezone.utc
+) -> List[Any]:
+    """Convert the values of a timestamp field to the datetimes that are hashed.
+
+    Values are converted as in `hash_concatenation_values`: naive for TIMESTAMP_NTZ
+    (the UTC offset of aware values is dropped, as when casting them), in the session
+    time zone for TIMESTAMP_LTZ, and with their own UTC offset (the session one for
+    naive values) for TIMESTAMP_TZ. Values of other fields are returned unchanged.
+
+    Args:
+        field: Field the values belong to.
+        values: Values to convert (a list or an Arrow/NumPy array).
+        session_timezone: Time zone of the Snowflake session (TIMEZONE parameter).
+
+    Returns:
+        Converted values (NULL values are kept).
+    """
+    values = _to_list(values)
+    to_datetime = _TIMESTAMP_CONVERTERS.get(field.data_type)
+    if to_datetime is None:
+        return list(values)
+    return [
+        None if value is None else to_datetime(value, session_timezone)
+        for value in values
+    ]
+
+
+def _get_hash_function(table: DataVaultTable) -> Callable[[bytes], Hash]:
+    """Get the Python equivalent of the hash function of a table.
+
+    Args:
+        table: Hub, link or satellite.
+
+    Returns:
+        Hash function.
+
+    Raises:
+        ValueError: If the hash function cannot be calculated in Python.
+    """
+    try:
+        return _HASH_FUNCTIONS[table.hash_function]
+    except KeyError as e:
+        raise ValueError(
+            f"{table.name}: ({table.hash_function.value}) cannot be calculated in "
+            f"Python"
+        ) from e
+
+
+def _concatenate(
+    fields: List[Field], batch: ColumnarBatch, session_timezone: tzinfo
+) -> Iterable[str]:
+    """Concatenate the string representation of fields, row by row.
+
+    Args:
+        fields: Fields to concatenate, in order.
+        batch: Values of each field, by field name.
+        session_timezone: Time zone of the Snowflake session.
+
+    Returns:
+        Concatenation of each row.
+    """
+    return map(HASH_DELIMITER.join, _get_rows(fields, batch, session_timezone))
+
+
+def _join_without_trailing_empty_values(values: Sequence[str]) -> str:
+    """Concatenate values, ignoring trailing empty values (HashdiffFormula.STRUCTURAL).
+
+    Args:
+        values: String representation of the fields of a row.
+
+    Returns:
+        Concatenation of the row.
+    """
+    last_index = len(values)
+    while last_index > 0 and not values[last_index - 1]:
+        last_index -= 1
+    return HASH_DELIMITER.join(values[:last_index])
+
+
+def _get_rows(
+    fields: List[Field], batch: ColumnarBatch, session_timezone: tzinfo
+) -> Iterable[Sequence[str]]:
+    """Get the string representation of fields, row by row.
+
+    Args:
+        fields: Fields, in order.
+        batch: Values of each field, by field name.
+        session_timezone: Time zone of the Snowflake session.
+
+    Returns:
+        String representation of the fields of each row.
+
+    Raises:
+        KeyError: If the batch does not have all fields.
+        ValueError: If the batch columns do not have the same length.
+    """
+    missing_fields = [field.name for field in fields if field.name not in batch]
+    if missing_fields:
+        raise KeyError(f"Fields missing in batch: {', '.join(missing_fields)}")
+
+    columns = [
+        hash_concatenation_values(field, batch[field.name], session_timezone)
+        for field in fields
+    ]
+    if len({len(column) for column in columns}) > 1:
+        raise ValueError("All batch columns should have the same length")
+
+    return zip(*columns)
+
+
+def _to_list(values: Any) -> Sequence[Any]:
+    """Convert a column to a list of Python objects.
+
+    Args:
+        values: A list or an Arrow/NumPy array.
+
+    Returns:
+        List of values.
+    """
+    if hasattr(values, "to_pylist"):
+        return values.to_pylist()
+    if hasattr(values, "tolist"):
+        return values.tolist()
+    return values
+
+
+def _get_converter(field: Field, session_timezone: tzinfo) -> Callable[[Any], str]:
+    """Get the function that converts a (non NULL) value of a field to a string.
+
+    Args:
+        field: Field.
+        session_timezone: Time zone of the Snowflake session.
+
+    Returns:
+        Conversion function.
+    """
+    return _CONVERTER_FACTORIES[field.data_type](field, session_timezone)
+
+
+def _number_to_string(value: Any, exponent: Decimal) -> str:
+    """Convert a number to a string, as `CAST(CAST(value AS NUMBER) AS TEXT)`.
+
+    Args:
+        value: Number (or its string representation).
+        exponent: Smallest unit of the field scale (e.g. 0.01 for a scale of 2).
+
+    Returns:
+        Number rounded to the scale, with exactly `scale` decimal digits.
+    """
+    number = Decimal(value if isinstance(value, (int, str)) else str(value))
+    number = number.quantize(exponent, rounding=ROUND_HALF_UP)
+    return f"{abs(number) if number.is_zero() else number:f}"
+
+
+def _real_to_string(value: Any) -> str:
+    """Convert a float to a string, as `CAST(CAST(value AS REAL) AS TEXT)`.
+
+    Args:
+        value: Float (or its string representation).
+
+    Returns:
+        Float with up to 15 significant digits.
+    """
+    number = float(value)
+    if number != number:  # pylint: disable=comparison-with-itself
+        return "NaN"
+    return f"{number:.15g}"
+
+
+def _boolean_to_string(value: Any) -> str:
+    """Convert a boolean to a string, as `CAST(CAST(value AS BOOLEAN) AS TEXT)`.
+
+    Args:
+        value: Boolean, number or Snowflake textual boolean.
+
+    Returns:
+        `true` or `false`.
+    """
+    if isinstance(value, str):
+        return _BOOLEAN_VALUES[value.strip().lower()]
+    return "true" if value else "false"
+
+
+def _to_date(value: Any) -> date:
+    """Convert a value to a date.
+
+    Args:
+        value: Date, datetime or ISO 8601 string.
+
+    Returns:
+        Date.
+    """
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    return date.fromisoformat(value[:10])
+
+
+def _to_time(value: Any) -> time:
+    """Convert a value to a time.
+
+    Args:
+        value: Time, datetime, ISO 8601 string or nanoseconds since midnight.
+
+    Returns:
+        Time (nanoseconds are truncated to microseconds).
+    """
+    if isinstance(value, datetime):
+        return value.time()
+    if isinstance(value, time):
+        return value
+    if isinstance(value, int):
+        return (datetime.min + timedelta(microseconds=value // 1000)).time()
+    return time.fromisoformat(value)
+
+
+def _to_datetime(value: Any, naive_timezone: tzinfo = None) -> datetime:
+    """Convert a value to a datetime.
+
+    Args:
+        value: Datetime, date, ISO 8601 string or nanoseconds since the epoch (UTC).
+        naive_timezone: Time zone of naive datetimes (kept naive if None).
+
+    Returns:
+        Datetime (nanoseconds are truncated to microseconds).
+    """
+    if isinstance(value, int):
+        value = datetime(1970, 1, 1) + timedelta(microseconds=value // 1000)
+        if naive_timezone is not None:
+            value = value.replace(tzinfo=timezone.utc)
+    elif isinstance(value, str):
+        value = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    elif not isinstance(value, datetime):
+        value = datetime.combine(value, time())
+
+    if value.tzinfo is None and naive_timezone is not None:
+        value = value.replace(tzinfo=naive_timezone)
+    return value
+
+
+def _time_to_string(value: time) -> str:
+    """Format a time as `hh24:mi:ss.ff9`.
+
+    Args:
+        value: Time.
+
+    Returns:
+        Formatted time.
+    """
+    return f"{value:%H:%M:%S}.{value.microsecond:06d}000"
+
+
+def _timestamp_to_string(value: datetime, with_timezone: bool = False) -> str:
+    """Format a timestamp as `yyyy-mm-dd hh24:mi:ss.ff9` (+ ` tzhtzm`).
+
+    Args:
+        value: Timestamp.
+        with_timezone: Add the UTC offset of the timestamp.
+
+    Returns:
+        Formatted timestamp.
+    """
+    formatted = f"{value.date().isoformat()} {_time_to_string(value.time())}"
+    if with_timezone:
+        formatted = f"{formatted} {value:%z}"
+    return formatted
+
+
+def _to_json(value: Any) -> str:
+    """Serialize a semi-structured value, as `CAST(value AS TEXT)`.
+
+    Args:
+        value: Semi-structured value (list, dict or scalar).
+
+    Returns:
+        Compact JSON, with object keys sorted.
+    """
+    return json.dumps(value, separators=(",", ":"), sort_keys=True, default=str)
+
+
+def _semi_structured_to_string(value: Any) -> str:
+    """Serialize an ARRAY or OBJECT, as `CAST(value AS TEXT)`.
+
+    Args:
+        value: List/dict, or its JSON representation.
+
+    Returns:
+        Compact JSON, with object keys sorted.
+    """
+    return _to_json(json.loads(value) if isinstance(value, str) else value)
+
+
+def _binary_to_string(value: Any) -> str:
+    """Convert a binary value to a string, as `HEX_ENCODE(CAST(value AS BINARY))`.
+
+    Args:
+        value: Bytes (or their hexadecimal representation).
+
+    Returns:
+        Upper case hexadecimal representation.
+    """
+    if isinstance(value, str):
+        value = bytes.fromhex(value)
+    return bytes(value).hex().upper()
+
+
+# Python equivalent of each hash function, applied to the UTF-8 encoded concatenation.
+_HASH_FUNCTIONS: Dict[HashFunction, Callable[[bytes], Hash]] = {
+    HashFunction.MD5: lambda data: hashlib.md5(data).hexdigest(),
+    HashFunction.MD5_BINARY: lambda data: hashlib.md5(data).digest(),
+    HashFunction.SHA1: lambda data: hashlib.sha1(data).hexdigest(),
+    HashFunction.SHA1_BINARY: lambda data: hashlib.sha1(data).digest(),
+    HashFunction.SHA2: lambda data: hashlib.sha256(data).hexdigest(),
+    HashFunction.SHA2_BINARY: lambda data: hashlib.sha256(data).digest(),
+}
+
+# Conversion of timestamps to the datetime that is hashed, by data type.
+_TIMESTAMP_CONVERTERS: Dict[FieldDataType, Callable[[Any, tzinfo], datetime]] = {
+    FieldDataType.TIMESTAMP_LTZ: lambda value, tz: _to_datetime(value, tz).astimezone(
+        tz
+    ),
+    FieldDataType.TIMESTAMP_NTZ: lambda value, tz: _to_datetime(value).replace(
+        tzinfo=None
+    ),
+    FieldDataType.TIMESTAMP_TZ: _to_datetime,
+}
+
+# Builders of the conversion function of a field, by data type.
+_CONVERTER_FACTORIES: Dict[
+    FieldDataType, Callable[[Field, tzinfo], Callable[[Any], str]]
+] = {
+    FieldDataType.ARRAY: lambda field, tz: _semi_structured_to_string,
+    FieldDataType.BINARY: lambda field, tz: _binary_to_string,
+    FieldDataType.BOOLEAN: lambda field, tz: _boolean_to_string,
+    FieldDataType.DATE: lambda field, tz: lambda value: _to_date(value).isoformat(),
+    FieldDataType.GEOGRAPHY: lambda field, tz: lambda value: getattr(
+        value, "wkt", value
+    ),
+    FieldDataType.NUMBER: lambda field, tz: functools.partial(
+        _number_to_string, exponent=Decimal(1).scaleb(-(field.scale or 0))
+    ),
+    FieldDataType.OBJECT: lambda field, tz: _semi_structured_to_string,
+    FieldDataType.REAL: lambda field, tz: _real_to_string,
+    FieldDataType.TEXT: lambda field, tz: str,
+    FieldDataType.TIME: lambda field, tz: lambda value: _time_to_string(
+        _to_time(value)
+    ),
+    FieldDataType.TIMESTAMP_LTZ: lambda field, tz: lambda value: _timestamp_to_string(
+        _TIMESTAMP_CONVERTERS[FieldDataType.TIMESTAMP_LTZ](value, tz),
+        with_timezone=True,
+    ),
+    FieldDataType.TIMESTAMP_NTZ: lambda field, tz: lambda value: _timestamp_to_string(
+        _TIMESTAMP_CONVERTERS[FieldDataType.TIMESTAMP_NTZ](value, tz)
+    ),
+    FieldDataType.TIMESTAMP_TZ: lambda field, tz: lambda value: _timestamp_to_string(
+        _TIMESTAMP_CONVERTERS[FieldDataType.TIMESTAMP_TZ](value, tz),
+        with_timezone=True,
+    ),
+    FieldDataType.VARIANT: lambda field, tz: lambda value: (
+        value if isinstance(value, str) else _to_json(value)
+    ),
+}
@@ -2,14 +2,48 @@
 
 from typing import Dict
 
-from . import FIELD_SUFFIX, METADATA_FIELDS, TEMPLATES_DIR, FieldRole
-from .table import DataVaultTable
-from .template_sql.sql_formulas import format_fields_for_select
+from . import FIELD_SUFFIX, METADATA_FIELDS, FieldRole, InsertStrategy
+from .table import (
+    HUB_LINK_DML_TEMPLATES,
+    HUB_LINK_INITIAL_DML_TEMPLATE,
+    DataVaultTable,
+    _revisions,
+    sql_artifact,
+)
+from .template_sql import get_template
+from .template_sql.sql_formulas import (
+    STAGING_EARLIEST_RECORDS_SQL_TEMPLATE,
+    format_fields_for_select,
+)
 
 
 class Hub(DataVaultTable):
     """A hub."""
 
+    _pruning_template_prefix = "hub_link"
+
+    # Statement that inserts new hashkeys.
+    _insert_strategy: InsertStrategy = InsertStrategy.MERGE
+
+    @property
+    def insert_strategy(self) -> InsertStrategy:
+        """Get the statement that inserts new hashkeys in the hub.
+
+        Returns:
+            Insert strategy.
+        """
+        return self._insert_strategy
+
+    @insert_strategy.setter
+    def insert_strategy(self, insert_strategy: InsertStrategy):
+        """Set the statement that inserts new hashkeys, invalidating SQL artifacts.
+
+        Args:
+            insert_strategy: Insert strategy.
+        """
+        self._insert_strategy = insert_strategy
+        self._revision = next(_revisions)
+
     @property
     def prefix(self) -> str:
         """Get table prefix.
@@ -67,7 +101,7 @@ class Hub(DataVaultTable):
                 f"({','.join(business_keys)})"
             )
 
-    @property
+    @sql_artifact
     def sql_placeholders(self) -> Dict[str, str]:
         """Hub specific SQL placeholders.
 
@@ -103,23 +137,37 @@ class Hub(DataVaultTable):
             "staging_source_fields": staging_fields,
         }
         sql_placeholders.update(super().sql_placeholders)
+        # When backfilling, hashkeys are inserted with their earliest record timestamp.
+        if self.staging_table.backfill:
+            sql_placeholders["staging_relation"] = (
+                STAGING_EARLIEST_RECORDS_SQL_TEMPLATE.format(
+                    staging_relation=sql_placeholders["staging_relation"],
+                    hashkey=hashkey.name,
+                )
+            )
 
         return sql_placeholders
 
-    @property
+    @sql_artifact
     def sql_load_statement(self) -> str:
         """Get the SQL query to populate current hub.
 
         All needed placeholders are calculated, in order to match template SQL
-        (check template_sql.hub_link_dml.sql).
+        (check template_sql.hub_link_dml.sql, or
+        template_sql.hub_link_anti_join_dml.sql with InsertStrategy.ANTI_JOIN, and
+        template_sql.hub_link_initial_dml.sql in initial loads).
 
         Returns:
             SQL query to load target hub.
         """
-        sql_load_statement = (
-            (TEMPLATES_DIR / "hub_link_dml.sql")
-            .read_text()
-            .format(**self.sql_placeholders)
+        sql_placeholders = self.sql_placeholders
+        template = get_template(
+            HUB_LINK_INITIAL_DML_TEMPLATE
+            if self.initial_load
+            else HUB_LINK_DML_TEMPLATES[self.insert_strategy]
+        )
+        sql_load_statement = template.render(
+            **sql_placeholders, **self.get_pruning_placeholders(sql_placeholders)
         )
 
         self._logger.info("Loading SQL for hub (%s) generated.", self.name)
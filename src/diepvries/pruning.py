@@ -0,0 +1,235 @@
+"""Strategies to prune the target table records scanned by a load."""
+
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+from .template_sql import get_template
+from .template_sql.sql_formulas import (
+    BEGINNING_OF_TIME_SQL_TEMPLATE,
+    MIN_TIMESTAMP_CTE_SQL_TEMPLATE,
+)
+
+
+class PruningStrategy(ABC):
+    """Strategy that bounds the target table records scanned by a load statement.
+
+    Load statements only match staging records with target records whose record
+    timestamp (r_timestamp) is at or after a minimum timestamp. As target tables are
+    clustered by r_timestamp, this lower bound lets Snowflake prune micro-partitions.
+
+    A strategy decides how each minimum timestamp is calculated. The lower bound must
+    be at or before the timestamp of the oldest record the load can match, otherwise
+    existing records are not found (duplicate hashkeys are inserted in hubs and links,
+    and open satellite versions are not closed).
+    """
+
+    def get_statements_sql(
+        self, template_name: str, sql_placeholders: Dict[str, str]
+    ) -> str:
+        """Get the SQL statements that run before the load statement.
+
+        Args:
+            template_name: Template that calculates the minimum timestamps of the
+                target table (see `PreScanPruning`).
+            sql_placeholders: Placeholders of the load statement.
+
+        Returns:
+            SQL statements (each one followed by an empty line), or an empty string.
+        """
+        # pylint: disable=unused-argument
+        return ""
+
+    @abstractmethod
+    def get_min_timestamp_sql(self, variable: str, table_name: str, query: str) -> str:
+        """Get the SQL expression of a minimum timestamp.
+
+        Args:
+            variable: Name of the minimum timestamp in the load statement (e.g.
+                min_timestamp).
+            table_name: Name of the table whose records are bounded.
+            query: Scalar subquery that calculates the minimum timestamp (see
+                `PreScanPruning`).
+
+        Returns:
+            SQL expression of the minimum timestamp.
+        """
+
+    def get_min_timestamp_cte_sql(self, variable: str, query: str) -> Optional[str]:
+        """Get the CTE that calculates a minimum timestamp in the load statement.
+
+        Minimum timestamps used more than once by a load statement are calculated
+        once, in this CTE, and read by name (see
+        `DataVaultTable.get_pruning_placeholders`).
+
+        Args:
+            variable: Name of the minimum timestamp.
+            query: Scalar subquery that calculates the minimum timestamp (see
+                `PreScanPruning`).
+
+        Returns:
+            CTE definition, or None if the load statement does not calculate the
+            minimum timestamp.
+        """
+        # pylint: disable=unused-argument
+        return None
+
+
+@dataclass(frozen=True)
+class PreScanPruning(PruningStrategy):
+    """Calculate the minimum timestamp by joining the staging and target tables.
+
+    The earliest record of the target table that matches the staging table is looked
+    up before the load statement, and stored in a session variable. This is exact,
+    but costs an extra join between the staging and target tables per load.
+
+    Without session variables, the lookup is part of the load statement: each table
+    is then loaded by a single, self-contained statement, that can run on any
+    connection, concurrently with other statements of the same session. Minimum
+    timestamps that the statement uses more than once are looked up once, in a CTE.
+    """
+
+    #: Store minimum timestamps in session variables, set before the load statement.
+    session_variables: bool = True
+
+    def get_statements_sql(
+        self, template_name: str, sql_placeholders: Dict[str, str]
+    ) -> str:
+        """Get the query that calculates the minimum timestamps.
+
+        Args:
+            template_name: Template that calculates the minimum timestamps of the
+                target table.
+            sql_placeholders: Placeholders of the load statement.
+
+        Returns:
+            SQL statements that set the minimum timestamps (if session variables are
+            used).
+        """
+        if not self.session_variables:
+            return ""
+        return f"{get_template(template_name).render(**sql_placeholders)}\n"
+
+    def get_min_timestamp_sql(self, variable: str, table_name: str, query: str) -> str:
+        """Get the session variable (or the subquery) of a minimum timestamp.
+
+        Args:
+            variable: Name of the minimum timestamp.
+            table_name: Name of the table whose records are bounded.
+            query: Scalar subquery that calculates the minimum timestamp.
+
+        Returns:
+            Session variable, or scalar subquery.
+        """
+        if not self.session_variables:
+            return query
+        return f"${variable}"
+
+    def get_min_timestamp_cte_sql(self, variable: str, query: str) -> Optional[str]:
+        """Get the CTE that looks up a minimum timestamp, without session variables.
+
+        Args:
+            variable: Name of the minimum timestamp.
+            query: Scalar subquery that calculates the minimum timestamp.
+
+        Returns:
+            CTE definition, or None if session variables are used.
+        """
+        if self.session_variables:
+            return None
+        return MIN_TIMESTAMP_CTE_SQL_TEMPLATE.format(variable=variable, query=query)
+
+
+@dataclass(frozen=True)
+class LookbackPruning(PruningStrategy):
+    """Only scan target records loaded in a fixed window before the load.
+
+    This is only correct when records older than the window can not be received
+    again (e.g. immutable events, that are extracted once).
+    """
+
+    #: Length of the window, in hours.
+    hours: int
+
+    def __post_init__(self):
+        """Check that the window is not empty.
+
+        Raises:
+            ValueError: If hours is not positive.
+        """
+        if self.hours <= 0:
+            raise ValueError("The lookback window should be positive")
+
+    def get_min_timestamp_sql(self, variable: str, table_name: str, query: str) -> str:
+        """Get the start of the lookback window.
+
+        Args:
+            variable: Name of the minimum timestamp.
+            table_name: Name of the table whose records are bounded.
+            query: Scalar subquery that calculates the minimum timestamp (see
+                `PreScanPruning`).
+
+        Returns:
+            Current timestamp, minus the lookback window.
+        """
+        return f"DATEADD(HOUR, -{self.hours}, CURRENT_TIMESTAMP())"
+
+
+@dataclass(frozen=True)
+class WatermarkPruning(PruningStrategy):
+    """Read the minimum timestamp of each table from a state table.
+
+    The state table holds one row per target table, with the earliest record
+    timestamp that a load can match. It is maintained outside of diepvries. When a
+    table has no watermark, its records are not pruned.
+    """
+
+    #: Schema of the state table.
+    schema: str
+    #: Name of the state table.
+    table: str
+    #: Column holding the target table name.
+    table_name_column: str = "table_name"
+    #: Column holding the watermark.
+    watermark_column: str = "watermark"
+
+    def get_min_timestamp_sql(self, variable: str, table_name: str, query: str) -> str:
+        """Get the query that reads the watermark of a table.
+
+        Args:
+            variable: Name of the minimum timestamp.
+            table_name: Name of the table whose records are bounded.
+            query: Scalar subquery that calculates the minimum timestamp (see
+                `PreScanPruning`).
+
+        Returns:
+            Scalar subquery that reads the watermark.
+        """
+        return (
+            f"(SELECT COALESCE(MAX({self.watermark_column}), "
+            f"{BEGINNING_OF_TIME_SQL_TEMPLATE}) "
+            f"FROM {self.schema}.{self.table} "
+            f"WHERE {self.table_name_column} = '{table_name}')"
+        )
+
+
+@dataclass(frozen=True)
+class NoPruning(PruningStrategy):
+    """Scan all target records, without any extra query.
+
+    Recommended for small target tables, where pruning costs more than it saves.
+    """
+
+    def get_min_timestamp_sql(self, variable: str, table_name: str, query: str) -> str:
+        """Get a minimum timestamp that matches all records.
+
+        Args:
+            variable: Name of the minimum timestamp.
+            table_name: Name of the table whose records are bounded.
+            query: Scalar subquery that calculates the minimum timestamp (see
+                `PreScanPruning`).
+
+        Returns:
+            Beginning of time.
+        """
+        return BEGINNING_OF_TIME_SQL_TEMPLATE
@@ -1,10 +1,12 @@
 """A role playing Hub."""
 
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 
-from . import TEMPLATES_DIR, FieldRole
+from . import FieldRole
 from .field import Field
 from .hub import Hub
+from .table import HUB_LINK_DML_TEMPLATES, sql_artifact
+from .template_sql import get_template
 from .template_sql.sql_formulas import format_fields_for_select
 
 
@@ -23,6 +25,10 @@ class RolePlayingHub(Hub):
     views pointing to the main hub.
     """
 
+    # The parent hub is also loaded by itself (and by other role playing hubs): none of
+    # them can assume that it is empty.
+    _supports_initial_load = False
+
     def __init__(self, schema: str, name: str, fields: List[Field]):
         """Instantiate a role RolePlayingHub.
 
@@ -31,11 +37,57 @@ class RolePlayingHub(Hub):
             name: Role playing hub name.
             fields: List of fields that this Hub holds.
         """
+        self._parent_table: Optional[Hub] = None
         super().__init__(schema, name, fields)
-        # Parent table is set just after instantiation.
-        self.parent_table: Optional[Hub] = None
 
     @property
+    def parent_table(self) -> Optional[Hub]:
+        """Get the parent (materialized) hub.
+
+        Parent table is set just after instantiation.
+
+        Returns:
+            Parent hub.
+        """
+        return self._parent_table
+
+    @parent_table.setter
+    def parent_table(self, parent_table: Optional[Hub]):
+        """Set the parent (materialized) hub.
+
+        Args:
+            parent_table: Parent hub.
+        """
+        self._parent_table = parent_table
+
+    @property
+    def _sql_cache_key(self) -> Tuple:
+        """Get the key that identifies the current version of the SQL artifacts.
+
+        The target of the load is the parent hub, so the parent hub key is part of the
+        role playing hub key.
+
+        Returns:
+            Key of the SQL artifacts.
+        """
+        if self._parent_table is None:
+            return (*super()._sql_cache_key, None)
+        # pylint: disable=protected-access
+        return (*super()._sql_cache_key, self._parent_table._sql_cache_key)
+
+    @property
+    def _min_timestamp_tables(self) -> Dict[str, str]:
+        """Get the minimum timestamps of the load statement.
+
+        The target of the load is the parent hub, so its records are bounded.
+
+        Returns:
+            Name of the table bounded by each minimum timestamp, indexed by the
+            minimum timestamp placeholder.
+        """
+        return {"min_timestamp": self.parent_table.name}
+
+    @sql_artifact
     def sql_placeholders(self) -> Dict[str, str]:
         """Role playing hub specific SQL placeholders.
 
@@ -69,22 +121,23 @@ class RolePlayingHub(Hub):
 
         return sql_placeholders
 
-    @property
+    @sql_artifact
     def sql_load_statement(self) -> str:
         """Get the SQL query to populate the current role playing hub.
 
         If table has a parent table - role playing hub.
 
         All needed placeholders are calculated, in order to match template SQL (check
-        template_sql.hub_link_dml.sql).
+        template_sql.hub_link_dml.sql, or template_sql.hub_link_anti_join_dml.sql with
+        InsertStrategy.ANTI_JOIN).
 
         Returns:
             SQL query to load target hub.
         """
-        sql_load_statement = (
-            (TEMPLATES_DIR / "hub_link_dml.sql")
-            .read_text()
-            .format(**self.sql_placeholders)
+        sql_placeholders = self.sql_placeholders
+        template = get_template(HUB_LINK_DML_TEMPLATES[self.insert_strategy])
+        sql_load_statement = template.render(
+            **sql_placeholders, **self.get_pruning_placeholders(sql_placeholders)
         )
 
         self._logger.info("Loading SQL for role playing hub (%s) generated.", self.name)
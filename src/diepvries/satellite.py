@@ -1,18 +1,43 @@
 """A Satellite."""
 
-from typing import Dict, Optional, Union
-
-from . import FIELD_SUFFIX, HASH_DELIMITER, METADATA_FIELDS, TEMPLATES_DIR, FieldRole
+from typing import Dict, List, Mapping, Optional, Tuple, Union
+
+from . import (
+    FIELD_SUFFIX,
+    HASH_DELIMITER,
+    METADATA_FIELDS,
+    FieldRole,
+    HashdiffFormula,
+    SatelliteLoadMode,
+)
+from .field import Field
 from .hub import Hub
 from .link import Link
-from .table import DataVaultTable
+from .table import DataVaultTable, _revisions, sql_artifact
+from .template_sql import get_template
 from .template_sql.sql_formulas import (
     END_OF_TIME_SQL_TEMPLATE,
     HASHDIFF_SQL_TEMPLATE,
     RECORD_END_TIMESTAMP_SQL_TEMPLATE,
+    STRUCTURAL_COMPATIBLE_HASHDIFF_SQL_TEMPLATE,
+    STRUCTURAL_HASHDIFF_FIELD_SQL_TEMPLATE,
+    STRUCTURAL_HASHDIFF_LAST_FIELD_SQL_TEMPLATE,
+    STRUCTURAL_HASHDIFF_SQL_TEMPLATE,
     format_fields_for_select,
 )
 
+# Suffix of the name of satellite views (see `Satellite.view_sql_statement`).
+SATELLITE_VIEW_SUFFIX = "view"
+
+# Template of the load statement of each load mode, by whether the staged records
+# hold multiple record timestamps per hashkey (see `DataVaultLoad`, backfill).
+SATELLITE_DML_TEMPLATES = {
+    (SatelliteLoadMode.MERGE, False): "satellite_dml.sql",
+    (SatelliteLoadMode.MERGE, True): "satellite_backfill_dml.sql",
+    (SatelliteLoadMode.INSERT_ONLY, False): "satellite_insert_only_dml.sql",
+    (SatelliteLoadMode.INSERT_ONLY, True): "satellite_insert_only_backfill_dml.sql",
+}
+
 
 class Satellite(DataVaultTable):
     """A Satellite.
@@ -27,7 +52,116 @@ class Satellite(DataVaultTable):
     """
 
     # Parent table is set after instantiation.
-    parent_table: Optional[Union[Link, Hub]] = None
+    _parent_table: Optional[Union[Link, Hub]] = None
+
+    # Formula that removes trailing empty fields from the hashdiff.
+    _hashdiff_formula: HashdiffFormula = HashdiffFormula.REGEX
+
+    # How new versions are loaded, and the load modes supported by the satellite type.
+    _load_mode: SatelliteLoadMode = SatelliteLoadMode.MERGE
+    _load_modes: Tuple[SatelliteLoadMode, ...] = (
+        SatelliteLoadMode.MERGE,
+        SatelliteLoadMode.INSERT_ONLY,
+    )
+
+    @property
+    def parent_table(self) -> Optional[Union[Link, Hub]]:
+        """Get the parent table (hub or link) of the satellite.
+
+        Returns:
+            Parent table.
+        """
+        return self._parent_table
+
+    @parent_table.setter
+    def parent_table(self, parent_table: Optional[Union[Link, Hub]]):
+        """Set the parent table (hub or link) of the satellite.
+
+        Args:
+            parent_table: Parent table.
+        """
+        self._parent_table = parent_table
+
+    @property
+    def hashdiff_formula(self) -> HashdiffFormula:
+        """Get the formula that removes trailing empty fields from the hashdiff.
+
+        Returns:
+            Hashdiff formula.
+        """
+        return self._hashdiff_formula
+
+    @hashdiff_formula.setter
+    def hashdiff_formula(self, hashdiff_formula: HashdiffFormula):
+        """Set the hashdiff formula, invalidating SQL artifacts.
+
+        Args:
+            hashdiff_formula: Hashdiff formula.
+        """
+        self._hashdiff_formula = hashdiff_formula
+        self._revision = next(_revisions)
+
+    @property
+    def load_mode(self) -> SatelliteLoadMode:
+        """Get how new versions are loaded in the satellite.
+
+        Returns:
+            Satellite load mode.
+        """
+        return self._load_mode
+
+    @load_mode.setter
+    def load_mode(self, load_mode: SatelliteLoadMode):
+        """Set how new versions are loaded in the satellite, invalidating SQL artifacts.
+
+        Args:
+            load_mode: Satellite load mode.
+
+        Raises:
+            ValueError: If the load mode is not supported by the satellite type.
+        """
+        if load_mode not in self._load_modes:
+            raise ValueError(
+                f"{self.name}: ({load_mode.value}) load mode is not supported by "
+                f"{type(self).__name__}"
+            )
+        self._load_mode = load_mode
+        self._revision = next(_revisions)
+
+    @property
+    def view_name(self) -> str:
+        """Get the name of the satellite view (see `view_sql_statement`).
+
+        Returns:
+            View name.
+        """
+        return f"{self.name}_{SATELLITE_VIEW_SUFFIX}"
+
+    @property
+    def _pruning_template_prefix(self) -> str:
+        """Get the prefix of the templates that calculate the minimum timestamp.
+
+        Returns:
+            Template prefix, depending on the load mode.
+        """
+        if self.load_mode == SatelliteLoadMode.INSERT_ONLY:
+            return "satellite_insert_only"
+        return "satellite"
+
+    @property
+    def _sql_cache_key(self) -> Tuple:
+        """Get the key that identifies the current version of the SQL artifacts.
+
+        Hashdiffs depend on the parent table keys, so the parent table key is part
+        of the satellite key.
+
+        Returns:
+            Key of the SQL artifacts.
+        """
+        if self._parent_table is None:
+            return (*super()._sql_cache_key, None)
+        # pylint: disable=protected-access
+        return (*super()._sql_cache_key, self._parent_table._sql_cache_key)
 
     @property
     def loading_order(self) -> int:
@@ -71,27 +205,43 @@ class Satellite(DataVaultTable):
                 f"'{self.name}': No field named '{hashdiff_name}' found"
             ) from e
 
-    @property
+    @sql_artifact
     def sql_load_statement(self) -> str:
         """Get the SQL query to populate the satellite.
 
         All needed placeholders are calculated, in order to match template SQL (check
-        template_sql.satellite_dml.sql).
+        template_sql.satellite_dml.sql, or template_sql.satellite_insert_only_dml.sql
+        with SatelliteLoadMode.INSERT_ONLY).
+
+        When backfilling, staged versions of each hashkey are collapsed when their
+        hashdiff does not change, and loaded as a whole version chain (check
+        template_sql.satellite_backfill_dml.sql and
+        template_sql.satellite_insert_only_backfill_dml.sql). In initial loads, all
+        staged versions are inserted (check template_sql.satellite_initial_dml.sql).
 
         Returns:
             SQL query to load target satellite.
         """
+        sql_placeholders = self.sql_placeholders
         record_end_timestamp = RECORD_END_TIMESTAMP_SQL_TEMPLATE.format(
-            key_fields=self.sql_placeholders["hashkey_field"]
+            key_fields=sql_placeholders["hashkey_field"]
         )
-
-        sql_load_statement = (
-            (TEMPLATES_DIR / "satellite_dml.sql")
-            .read_text()
-            .format(
-                **self.sql_placeholders,
-                record_end_timestamp_expression=record_end_timestamp,
+        if self.load_mode == SatelliteLoadMode.INSERT_ONLY:
+            # Versions are never end dated in insert-only satellites.
+            record_end_timestamp = (
+                f"{END_OF_TIME_SQL_TEMPLATE} AS "
+                f"{sql_placeholders['record_end_timestamp_name']}"
             )
+
+        template_name = (
+            "satellite_initial_dml.sql"
+            if self.initial_load
+            else SATELLITE_DML_TEMPLATES[(self.load_mode, self.staging_table.backfill)]
+        )
+        sql_load_statement = get_template(template_name).render(
+            **sql_placeholders,
+            record_end_timestamp_expression=record_end_timestamp,
+            **self.get_pruning_placeholders(sql_placeholders),
         )
 
         self._logger.info("Loading SQL for satellite (%s) generated.", self.name)
@@ -99,6 +249,28 @@ class Satellite(DataVaultTable):
 
         return sql_load_statement
 
+    @sql_artifact
+    def view_sql_statement(self) -> str:
+        """Get the SQL query to create the satellite view.
+
+        The view derives the end timestamp of each version from the start timestamp
+        of the next one, as the MERGE load mode does. It is needed to read satellites
+        loaded with SatelliteLoadMode.INSERT_ONLY, where r_timestamp_end is not
+        updated (all versions are stored with the end of time). The view only has to
+        be created once (check template_sql.satellite_view_ddl.sql).
+
+        Returns:
+            SQL query to create the satellite view.
+        """
+        sql_placeholders = self.sql_placeholders
+        return get_template("satellite_view_ddl.sql").render(
+            **sql_placeholders,
+            view_name=self.view_name,
+            record_end_timestamp_expression=RECORD_END_TIMESTAMP_SQL_TEMPLATE.format(
+                key_fields=sql_placeholders["hashkey_field"]
+            ),
+        )
+
     @property
     def parent_table_name(self) -> str:
         """Get the name the parent table.
@@ -117,10 +289,24 @@ class Satellite(DataVaultTable):
         return parent_table_name
 
     @property
+    def hashdiff_fields(self) -> List[Field]:
+        """Get the fields concatenated in the hashdiff, in order.
+
+        Returns:
+            Business keys and child keys of the parent table, and descriptive fields
+            of the satellite.
+        """
+        return [
+            *self.parent_table.hashkey_fields,
+            *self.fields_by_role[FieldRole.DESCRIPTIVE],
+        ]
+
+    @sql_artifact
     def hashdiff_sql(self) -> str:
         """Get the SQL expression that should be used to calculate a hashdiff field.
 
-        The hashdiff formula is the following:::
+        The hashdiff formula is the following (MD5 being the default
+        `hash_function`):::
 
             MD5(business_key_1   + |~~|
                 + business_key_n + |~~|
@@ -129,7 +315,26 @@ class Satellite(DataVaultTable):
 
         To ensure that a hashdiff does not change if a new field is added to the
         table, it is assumed that all ``|~~|`` character sequences placed at the end of
-        the string are removed.
+        the string are removed (see `HashdiffFormula`).
+
+        Returns:
+            Hashdiff SQL expression.
+        """
+        return self.get_hashdiff_sql()
+
+    def get_hashdiff_sql(
+        self,
+        hash_inputs: Optional[Mapping[str, str]] = None,
+        hashdiff_input: Optional[str] = None,
+    ) -> str:
+        """Get the SQL expression to calculate the hashdiff (see `hashdiff_sql`).
+
+        Args:
+            hash_inputs: Columns that replace the string representation of fields
+                (`Field.hash_concatenation_sql`), when it is calculated beforehand.
+            hashdiff_input: Column that holds the concatenation of the hashdiff
+                fields (see `get_hashdiff_concatenation_sql`), when it is calculated
+                beforehand.
 
         Returns:
             Hashdiff SQL expression.
@@ -137,27 +342,19 @@ class Satellite(DataVaultTable):
         hashdiff = next(
             hashdiff for hashdiff in self.fields_by_role[FieldRole.HASHDIFF]
         )
-        fields_for_hashdiff = [
-            field.hash_concatenation_sql
-            for field in self.parent_table.fields_by_role[FieldRole.BUSINESS_KEY]
-        ]
-        fields_for_hashdiff.extend(
-            [
-                field.hash_concatenation_sql
-                for field in self.parent_table.fields_by_role[FieldRole.CHILD_KEY]
-            ]
-        )
-        fields_for_hashdiff.extend(
-            [
-                field.hash_concatenation_sql
-                for field in self.fields_by_role[FieldRole.DESCRIPTIVE]
-            ]
-        )
-
-        hashdiff_expression = f"||'{HASH_DELIMITER}'||".join(fields_for_hashdiff)
-
-        hashdiff_sql = HASHDIFF_SQL_TEMPLATE.format(
-            hashdiff_expression=hashdiff_expression, hashdiff=hashdiff.name_in_staging
+        if self.hashdiff_formula == HashdiffFormula.REGEX:
+            hashdiff_template = HASHDIFF_SQL_TEMPLATE
+        elif self.hashdiff_formula == HashdiffFormula.STRUCTURAL:
+            hashdiff_template = STRUCTURAL_HASHDIFF_SQL_TEMPLATE
+        else:
+            hashdiff_template = STRUCTURAL_COMPATIBLE_HASHDIFF_SQL_TEMPLATE
+
+        hashdiff_sql = hashdiff_template.format(
+            hash_function=self.hash_function.value,
+            hashdiff_expression=(
+                hashdiff_input or self.get_hashdiff_concatenation_sql(hash_inputs)
+            ),
+            hashdiff=hashdiff.name_in_staging,
         )
         self._logger.debug(
             "Hashdiff SQL expression for table (%s) is (%s)", self.name, hashdiff_sql
@@ -165,7 +362,38 @@ class Satellite(DataVaultTable):
 
         return hashdiff_sql
 
-    @property
+    def get_hashdiff_concatenation_sql(
+        self, hash_inputs: Optional[Mapping[str, str]] = None
+    ) -> str:
+        """Get the SQL expression that concatenates the hashdiff fields.
+
+        With HashdiffFormula.STRUCTURAL_COMPATIBLE, the concatenation is used up to
+        three times in the hashdiff expression: it should be calculated beforehand,
+        in an inner projection (see `DataVaultLoad`).
+
+        Args:
+            hash_inputs: Columns that replace the string representation of fields
+                (`Field.hash_concatenation_sql`), when it is calculated beforehand.
+
+        Returns:
+            Concatenation of the hashdiff fields, delimited by HASH_DELIMITER.
+        """
+        fields_for_hashdiff = self._get_hash_inputs_sql(
+            self.hashdiff_fields, hash_inputs
+        )
+        if self.hashdiff_formula == HashdiffFormula.REGEX:
+            return f"||'{HASH_DELIMITER}'||".join(fields_for_hashdiff)
+
+        hashdiff_expression = STRUCTURAL_HASHDIFF_LAST_FIELD_SQL_TEMPLATE.format(
+            field=fields_for_hashdiff[-1]
+        )
+        for field in reversed(fields_for_hashdiff[:-1]):
+            hashdiff_expression = STRUCTURAL_HASHDIFF_FIELD_SQL_TEMPLATE.format(
+                field=field, next_fields=hashdiff_expression
+            )
+        return hashdiff_expression
+
+    @sql_artifact
     def sql_placeholders(self) -> Dict[str, str]:
         """Satellite specific SQL placeholders.
 
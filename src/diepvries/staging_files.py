@@ -0,0 +1,316 @@
+"""Staging table populated from local files."""
+
+import gzip
+import itertools
+import json
+import logging
+from datetime import date, datetime, time, timezone, tzinfo
+from pathlib import Path
+from typing import (
+    IO,
+    TYPE_CHECKING,
+    Any,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Union,
+)
+
+from . import METADATA_FIELDS, UNKNOWN, FieldRole, FixedPrefixLoggerAdapter
+from .field import Field
+from .hashing import hashdiffs, hashkeys, timestamp_values
+from .hub import Hub
+from .link import Link
+from .satellite import Satellite
+from .template_sql import get_template
+
+if TYPE_CHECKING:
+    from .data_vault_load import DataVaultLoad
+
+# Default maximum size of each (compressed) staging file: Snowflake recommends files
+# of 100-250 MB (compressed) to parallelize loads.
+DEFAULT_MAX_FILE_SIZE = 128 * 1024 * 1024
+
+# Default number of records converted (and hashed) at once.
+DEFAULT_BATCH_SIZE = 10_000
+
+# Default time zone of the Snowflake session that loads the files (TIMEZONE
+# parameter), as assumed by `diepvries.hashing`.
+DEFAULT_SESSION_TIMEZONE = timezone.utc
+
+
+class StagingFileWriter:
+    """Write the staging table of a Data Vault load to local files.
+
+    Instead of creating the staging table from an extraction table (see
+    `StagingMode.FILES`), records are read from a Python
+    iterable, converted to staging records (metadata fields, hashkeys and hashdiffs
+    are calculated in Python, see `diepvries.hashing`) and written to gzip compressed
+    CSV files. The staging table is then created empty, files are uploaded to its
+    table stage (`PUT`) and loaded (`COPY INTO`).
+
+    Records are processed in batches and files are rotated when they reach their
+    maximum size, so that memory usage does not depend on the number of records.
+
+    Each record is a mapping between extraction column names (the names of the
+    business keys, child keys and descriptive fields, plus the record source when
+    the load has no source) and their values. Timestamps are written as they are
+    hashed (see `diepvries.hashing.timestamp_values`), in the time zone of the
+    session that loads the files.
+    """
+
+    def __init__(
+        self,
+        data_vault_load: "DataVaultLoad",
+        directory: Union[str, Path],
+        max_file_size: int = DEFAULT_MAX_FILE_SIZE,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        session_timezone: tzinfo = DEFAULT_SESSION_TIMEZONE,
+    ):
+        """Instantiate a StagingFileWriter.
+
+        Args:
+            data_vault_load: Data Vault load whose staging table is written.
+            directory: Directory where staging files are written (created if needed).
+            max_file_size: Size (in bytes, compressed) after which a new file is
+                started.
+            batch_size: Number of records converted (and hashed) at once.
+            session_timezone: Time zone of the Snowflake session that loads the files
+                (TIMEZONE parameter).
+
+        Raises:
+            ValueError: If max_file_size or batch_size are not positive.
+        """
+        if max_file_size <= 0 or batch_size <= 0:
+            raise ValueError("max_file_size and batch_size should be positive")
+
+        self.data_vault_load = data_vault_load
+        self.directory = Path(directory)
+        self.max_file_size = max_file_size
+        self.batch_size = batch_size
+        self.session_timezone = session_timezone
+        self._logger = FixedPrefixLoggerAdapter(logging.getLogger(__name__), str(self))
+
+    def __str__(self) -> str:
+        """Representation of a StagingFileWriter object as a string.
+
+        This helps with the tracking of logging events per entity.
+
+        Returns:
+            String representation of this StagingFileWriter instance.
+        """
+        return (
+            f"{type(self).__name__}: "
+            f"staging_table={self.data_vault_load.staging_table.name}"
+        )
+
+    def write(self, records: Iterable[Mapping[str, Any]]) -> List[Path]:
+        """Write records to staging files.
+
+        Args:
+            records: Extracted records.
+
+        Returns:
+            Paths of the written files.
+        """
+        self.directory.mkdir(parents=True, exist_ok=True)
+        staging_table = self.data_vault_load.staging_table
+        paths: List[Path] = []
+        raw_file: Optional[IO[bytes]] = None
+        csv_file: Optional[IO[str]] = None
+        record_count = 0
+
+        try:
+            for row in self._get_staging_rows(records):
+                if raw_file is None or raw_file.tell() >= self.max_file_size:
+                    if csv_file is not None:
+                        csv_file.close()
+                        raw_file.close()
+                    path = self.directory / (
+                        f"{staging_table.name}_{len(paths):05d}.csv.gz"
+                    )
+                    paths.append(path)
+                    raw_file = path.open("wb")
+                    csv_file = gzip.open(raw_file, "wt", encoding="utf-8", newline="")
+                csv_file.write(row)
+                record_count += 1
+        finally:
+            if csv_file is not None:
+                csv_file.close()
+                raw_file.close()
+
+        self._logger.info(
+            "(%d) records written to (%d) staging files.", record_count, len(paths)
+        )
+        return paths
+
+    def get_sql_statements(self, paths: List[Path]) -> List[str]:
+        """Generate the SQL statements to create and populate the staging table.
+
+        Args:
+            paths: Staging files (see `write`).
+
+        Returns:
+            Ordered list of SQL statements: CREATE TABLE, one PUT per file, and COPY
+            INTO.
+        """
+        staging_table = self.data_vault_load.staging_table
+        placeholders = {
+            **staging_table.sql_placeholders,
+            "fields_ddl": ", ".join(
+                field.ddl_in_staging for field in self.data_vault_load.staging_fields
+            ),
+        }
+
+        statements = [get_template("staging_table_file_ddl.sql").render(**placeholders)]
+        statements.extend(
+            get_template("staging_table_file_put.sql").render(
+                **placeholders, file_path=path.resolve().as_posix()
+            )
+            for path in paths
+        )
+        statements.append(
+            get_template("staging_table_file_copy.sql").render(**placeholders)
+        )
+
+        self._logger.info(
+            "Loading SQL for staging table (%s) from (%d) files generated.",
+            staging_table.name,
+            len(paths),
+        )
+        return statements
+
+    def _get_staging_rows(self, records: Iterable[Mapping[str, Any]]) -> Iterator[str]:
+        """Convert records to CSV rows of the staging table, batch by batch.
+
+        Args:
+            records: Extracted records.
+
+        Yields:
+            CSV rows (with line terminator).
+        """
+        records = iter(records)
+        while True:
+            batch = list(itertools.islice(records, self.batch_size))
+            if not batch:
+                return
+            columns = self._get_staging_columns(batch)
+            for values in zip(*columns):
+                yield ",".join(_to_csv_value(value) for value in values) + "\n"
+
+    def _get_staging_columns(self, records: List[Mapping[str, Any]]) -> List[List[Any]]:
+        """Calculate the staging table columns of a batch of records.
+
+        This is the Python equivalent of the SELECT expressions of the staging table
+        (see `DataVaultLoad._get_staging_dml_expression`).
+
+        Args:
+            records: Batch of extracted records.
+
+        Returns:
+            Values of each staging field, in the order of the staging table.
+
+        Raises:
+            KeyError: If a record does not have all extraction columns.
+        """
+        data_vault_load = self.data_vault_load
+        record_timestamp_column = data_vault_load.staging_table.record_timestamp_column
+        try:
+            batch: Dict[str, List[Any]] = {
+                field.name: timestamp_values(
+                    field,
+                    [record[field.name] for record in records],
+                    self.session_timezone,
+                )
+                for field in data_vault_load.staging_fields
+                if self._is_extracted(field)
+            }
+            if record_timestamp_column is not None:
+                batch[record_timestamp_column] = [
+                    record[record_timestamp_column] for record in records
+                ]
+        except KeyError as e:
+            raise KeyError(f"{self}: Column {e} missing in extracted record") from e
+
+        record_count = len(records)
+        columns = []
+        for field in data_vault_load.staging_fields:
+            # pylint: disable=protected-access
+            table = data_vault_load._get_target_table(field.parent_table_name)
+            if field.name_in_staging == METADATA_FIELDS["record_start_timestamp"]:
+                extract_start_timestamp = data_vault_load.extract_start_timestamp
+                columns.append(
+                    [extract_start_timestamp.replace(tzinfo=None)] * record_count
+                    if record_timestamp_column is None
+                    else timestamp_values(
+                        field, batch[record_timestamp_column], self.session_timezone
+                    )
+                )
+            elif (
+                field.name_in_staging == METADATA_FIELDS["record_source"]
+                and data_vault_load.source is not None
+            ):
+                columns.append([data_vault_load.source] * record_count)
+            elif field.role == FieldRole.BUSINESS_KEY:
+                columns.append(
+                    [UNKNOWN if value is None else value for value in batch[field.name]]
+                )
+            elif field.role == FieldRole.HASHKEY and isinstance(table, (Hub, Link)):
+                columns.append(hashkeys(table, batch, self.session_timezone))
+            elif field.role == FieldRole.HASHDIFF and isinstance(table, Satellite):
+                columns.append(hashdiffs(table, batch, self.session_timezone))
+            else:
+                columns.append(batch[field.name])
+
+        return columns
+
+    def _is_extracted(self, field: Field) -> bool:
+        """Check if a staging field is read from the extracted records.
+
+        Args:
+            field: Staging field.
+
+        Returns:
+            True if the field is not calculated.
+        """
+        if field.role in (FieldRole.HASHKEY, FieldRole.HASHDIFF):
+            return False
+        if field.name == METADATA_FIELDS["record_start_timestamp"]:
+            return False
+        return not (
+            field.name == METADATA_FIELDS["record_source"]
+            and self.data_vault_load.source is not None
+        )
+
+
+def _to_csv_value(value: Any) -> str:
+    """Convert a value to a CSV field.
+
+    NULL values are written as empty (unquoted) fields, all other values are quoted,
+    so that NULL and empty strings can be told apart.
+
+    Args:
+        value: Value to convert.
+
+    Returns:
+        CSV field.
+    """
+    if value is None:
+        return ""
+    if isinstance(value, bool):
+        value = "true" if value else "false"
+    elif isinstance(value, datetime):
+        value = value.isoformat(sep=" ")
+    elif isinstance(value, (date, time)):
+        value = value.isoformat()
+    elif isinstance(value, bytes):
+        # Default BINARY_FORMAT of COPY INTO.
+        value = value.hex().upper()
+    elif isinstance(value, (dict, list)):
+        value = json.dumps(value, separators=(",", ":"), default=str)
+    else:
+        value = str(value)
+    return '"' + value.replace('"', '""') + '"'
@@ -1,14 +1,77 @@
 """Data Vault table."""
 
+import itertools
 import logging
 from abc import ABC, abstractmethod
+from dataclasses import dataclass
 from datetime import datetime
-from functools import cached_property
-from typing import Dict, List
-
-from . import HASH_DELIMITER, METADATA_FIELDS, FieldRole, FixedPrefixLoggerAdapter
+from functools import cached_property, wraps
+from typing import Any, Callable, Dict, List, Mapping, Optional, Tuple
+
+from . import (
+    HASH_DELIMITER,
+    METADATA_FIELDS,
+    FieldRole,
+    FixedPrefixLoggerAdapter,
+    HashFunction,
+    InsertStrategy,
+    StagingTableType,
+)
 from .field import Field
-from .template_sql.sql_formulas import HASHKEY_SQL_TEMPLATE
+from .pruning import PreScanPruning, PruningStrategy
+from .template_sql import get_template
+from .template_sql.sql_formulas import (
+    HASHKEY_SQL_TEMPLATE,
+    INITIAL_LOAD_PROBE_SQL_TEMPLATE,
+    MIN_TIMESTAMP_CTE_REFERENCE_SQL_TEMPLATE,
+)
+
+# Source of table revisions: each change in a table structure (fields, staging table,
+# parent table) assigns a new revision to the table, invalidating its SQL artifacts.
+_revisions = itertools.count()
+
+# Template of the load statement of hubs and links, by insert strategy.
+HUB_LINK_DML_TEMPLATES = {
+    InsertStrategy.MERGE: "hub_link_dml.sql",
+    InsertStrategy.ANTI_JOIN: "hub_link_anti_join_dml.sql",
+}
+
+# Template of the load statement of empty hubs and links (see
+# `DataVaultTable.initial_load`).
+HUB_LINK_INITIAL_DML_TEMPLATE = "hub_link_initial_dml.sql"
+
+
+class sql_artifact(property):
+    """Property of a DataVaultTable, cached until the table changes.
+
+    SQL artifacts (placeholders, hash expressions and load statements) only depend on
+    the table structure, staging table and parent table, so they are calculated once
+    and stored in the table, until one of these is reassigned (see
+    `DataVaultTable._sql_cache_key`).
+
+    As placeholders are usually extended by the caller, dictionaries are returned as
+    shallow copies of the cached value.
+    """
+
+    # pylint: disable=invalid-name
+
+    def __init__(self, method: Callable[[Any], Any]):
+        """Instantiate a sql_artifact property.
+
+        Args:
+            method: Method that calculates the SQL artifact.
+        """
+        artifact_name = method.__qualname__
+
+        @wraps(method)
+        def get_sql_artifact(table):
+            # pylint: disable=protected-access
+            artifact = table._get_sql_artifact(artifact_name, method)
+            if isinstance(artifact, dict):
+                return dict(artifact)
+            return artifact
+
+        super().__init__(get_sql_artifact, doc=method.__doc__)
 
 
 class Table(ABC):
@@ -46,24 +109,105 @@ class Table(ABC):
         return f"{type(self).__name__}: {self.schema}.{self.name}"
 
 
+@dataclass(frozen=True)
+class StagingTableOptions:
+    """Physical design of a staging table.
+
+    Staging tables only live for the duration of a load: transient (or temporary)
+    tables without Time Travel avoid their Fail-safe and Time Travel storage costs.
+    """
+
+    #: Table type.
+    table_type: StagingTableType = StagingTableType.PERMANENT
+    #: Time Travel retention period (Snowflake default if None).
+    data_retention_time_in_days: Optional[int] = None
+    #: Sort staged records by the hashkey of the first hub, so that micro-partitions
+    #: of the staging table can be pruned in MERGE joins.
+    order_by_hashkey: bool = False
+    #: Drop the staging table once all target tables are loaded.
+    drop_after_load: bool = False
+    #: Calculate each field expression concatenated in hashkeys and hashdiffs once,
+    #: in an inner projection of the staging query, instead of once per hash (also
+    #: applies to inlined staging queries).
+    share_hash_inputs: bool = False
+
+
 class StagingTable(Table):
     """A table used for staging."""
 
     # pylint: disable=too-few-public-methods
 
-    def __init__(self, schema: str, name: str, extract_start_timestamp: datetime):
+    def __init__(
+        self,
+        schema: str,
+        name: str,
+        extract_start_timestamp: datetime,
+        options: Optional[StagingTableOptions] = None,
+        record_timestamp_column: Optional[str] = None,
+    ):
         """Instantiate a StagingTable.
 
         Args:
              schema: Schema name.
              name: Table name.
              extract_start_timestamp: Extract start timestamp.
+             options: Physical design of the table (defaults to a permanent table).
+             record_timestamp_column: Extraction column that holds the timestamp of
+                each record, when backfilling (see `DataVaultLoad`).
         """
         staging_table_suffix = extract_start_timestamp.strftime("%Y%m%d_%H%M%S")
         physical_name = f"{name}_{staging_table_suffix}"
 
         super().__init__(schema=schema, name=physical_name)
 
+        self.options = options or StagingTableOptions()
+        self.record_timestamp_column = record_timestamp_column
+        # Query that replaces the staging table, when it is not materialized (set in
+        # DataVaultLoad, see StagingMode.INLINE).
+        self.inline_sql: Optional[str] = None
+
+    @property
+    def backfill(self) -> bool:
+        """Check if staged records hold their own record timestamps.
+
+        Returns:
+            True if records can have multiple record timestamps per hashkey.
+        """
+        return self.record_timestamp_column is not None
+
+    @property
+    def sql_placeholders(self) -> Dict[str, str]:
+        """Get the placeholders needed to generate SQL for this staging table.
+
+        Returns:
+            Staging table name and DDL options.
+        """
+        table_type = self.options.table_type.value
+        table_properties = ""
+        if self.options.data_retention_time_in_days is not None:
+            table_properties = (
+                " DATA_RETENTION_TIME_IN_DAYS = "
+                f"{self.options.data_retention_time_in_days}"
+            )
+
+        return {
+            "staging_schema": self.schema,
+            "staging_table": self.name,
+            "table_type": f"{table_type} " if table_type else "",
+            "table_properties": table_properties,
+        }
+
+    @property
+    def relation(self) -> str:
+        """Get the relation that load statements read staged data from.
+
+        Returns:
+            Staging table name (with schema), or the staging query as a subquery.
+        """
+        if self.inline_sql is not None:
+            return self.inline_sql
+        return f"{self.schema}.{self.name}"
+
 
 class DataVaultTable(Table):
     """A Data Vault table.
@@ -75,7 +219,24 @@ class DataVaultTable(Table):
     _fields = None
 
     # Table used for staging. Set in DataVaultLoad.
-    staging_table: StagingTable
+    _staging_table: Optional[StagingTable] = None
+
+    # Function that calculates the hash of the table: hashkey in hubs and links,
+    # hashdiff in satellites.
+    _hash_function: HashFunction = HashFunction.MD5
+
+    # Strategy that bounds the target records scanned by the load statement.
+    _pruning_strategy: PruningStrategy = PreScanPruning()
+
+    # Whether the target table is empty (see `initial_load`), and whether the table
+    # type can be loaded as an empty table.
+    _initial_load: bool = False
+    _supports_initial_load: bool = True
+
+    # Prefix of the templates that calculate the minimum timestamps of the load
+    # statement: {prefix}_pre_scan.sql (see PreScanPruning) and one
+    # {prefix}_{placeholder}.sql scalar subquery per minimum timestamp.
+    _pruning_template_prefix: str
 
     def __init__(self, schema: str, name: str, fields: List[Field], *_args, **_kwargs):
         """Instantiate a Data Vault table.
@@ -100,6 +261,9 @@ class DataVaultTable(Table):
             _kwargs: Unused here, useful for children classes.
         """
         super().__init__(schema=schema, name=name)
+        self._revision = next(_revisions)
+        self._sql_artifacts: Dict[str, Any] = {}
+        self._sql_artifacts_key: Optional[Tuple] = None
         self.fields = fields
 
         # Check if table structure is valid. Each subclass has its own implementation
@@ -130,10 +294,249 @@ class DataVaultTable(Table):
         (check hashkey_sql and hashdiff_sql for more detail about hash fields
         generation).
 
+        Fields indexes (fields_by_name and fields_by_role) and SQL artifacts are
+        invalidated.
+
         Args:
             fields: Fields list that the current table holds.
         """
         self._fields = sorted(fields, key=lambda x: x.position)
+        self.__dict__.pop("fields_by_name", None)
+        self.__dict__.pop("fields_by_role", None)
+        self._revision = next(_revisions)
+
+    @property
+    def staging_table(self) -> StagingTable:
+        """Get the table used for staging.
+
+        Returns:
+            Staging table.
+        """
+        return self._staging_table
+
+    @staging_table.setter
+    def staging_table(self, staging_table: StagingTable):
+        """Set the table used for staging, invalidating SQL artifacts.
+
+        Args:
+            staging_table: Staging table.
+        """
+        self._staging_table = staging_table
+        self._revision = next(_revisions)
+
+    @property
+    def hash_function(self) -> HashFunction:
+        """Get the function that calculates the hashkey (or hashdiff) of the table.
+
+        Returns:
+            Hash function.
+        """
+        return self._hash_function
+
+    @hash_function.setter
+    def hash_function(self, hash_function: HashFunction):
+        """Set the hash function, invalidating SQL artifacts.
+
+        The data type of the hashed field should match the hash function (see
+        `HashFunction`).
+
+        Args:
+            hash_function: Hash function.
+
+        Raises:
+            ValueError: If the hash function can not calculate hashkeys.
+        """
+        if (
+            hash_function == HashFunction.HASH
+            and self.fields_by_role[FieldRole.HASHKEY]
+        ):
+            raise ValueError(
+                f"{self.name}: ({hash_function.value}) can only be used for hashdiffs"
+            )
+        self._hash_function = hash_function
+        self._revision = next(_revisions)
+
+    @property
+    def pruning_strategy(self) -> PruningStrategy:
+        """Get the strategy that bounds the target records scanned by the load.
+
+        Returns:
+            Pruning strategy.
+        """
+        return self._pruning_strategy
+
+    @pruning_strategy.setter
+    def pruning_strategy(self, pruning_strategy: PruningStrategy):
+        """Set the pruning strategy, invalidating SQL artifacts.
+
+        Args:
+            pruning_strategy: Pruning strategy.
+        """
+        self._pruning_strategy = pruning_strategy
+        self._revision = next(_revisions)
+
+    @property
+    def initial_load(self) -> bool:
+        """Check if the table is loaded as an empty table.
+
+        Initial loads insert all staged records with a plain INSERT statement: the
+        target table is neither merged nor pruned. Hubs and links still skip the
+        hashkeys that exist in the target table (inserted by a concurrent load).
+
+        Returns:
+            True if the target table is empty.
+        """
+        return self._initial_load
+
+    @initial_load.setter
+    def initial_load(self, initial_load: bool):
+        """Set if the table is loaded as an empty table, invalidating SQL artifacts.
+
+        Args:
+            initial_load: True if the target table is empty.
+
+        Raises:
+            ValueError: If the table type can not be loaded as an empty table.
+        """
+        if initial_load and not self._supports_initial_load:
+            raise ValueError(
+                f"{self.name}: Initial loads are not supported by {type(self).__name__}"
+            )
+        self._initial_load = initial_load
+        self._revision = next(_revisions)
+
+    @property
+    def initial_load_probe_sql_statement(self) -> str:
+        """Get the SQL query that checks if the target table holds any record.
+
+        Returns:
+            Query that returns a row if the target table is not empty.
+        """
+        return INITIAL_LOAD_PROBE_SQL_TEMPLATE.format(
+            target_schema=self.schema, target_table=self.name
+        )
+
+    @property
+    def _min_timestamp_tables(self) -> Dict[str, str]:
+        """Get the minimum timestamps of the load statement.
+
+        Returns:
+            Name of the table bounded by each minimum timestamp, indexed by the
+            minimum timestamp placeholder.
+        """
+        return {"min_timestamp": self.name}
+
+    def get_pruning_placeholders(
+        self, sql_placeholders: Dict[str, str]
+    ) -> Dict[str, str]:
+        """Get the placeholders that prune the target records scanned by the load.
+
+        Each minimum timestamp has two forms. `{variable}` is self-contained, for load
+        statements that use it once. Statements that use it more than once read
+        `{variable}_bound` in their CTEs and `{variable}_merge` in their MERGE
+        condition, after `pruning_ctes` (first CTEs of the USING clause) and
+        `pruning_columns` (extra columns of the USING clause). When the pruning
+        strategy calculates a minimum timestamp in the load statement (see
+        `PruningStrategy.get_min_timestamp_cte_sql`), it is then calculated once.
+
+        Args:
+            sql_placeholders: Placeholders of the load statement.
+
+        Returns:
+            Statements that run before the load statement (pruning_statements) and
+            the SQL expressions of each minimum timestamp (none in initial loads, as
+            the target table is not read).
+        """
+        if self.initial_load:
+            return {}
+        # Queries can depend on the minimum timestamps calculated before them, in
+        # either form.
+        self_contained_placeholders = dict(sql_placeholders)
+        cte_placeholders = dict(sql_placeholders)
+        pruning_placeholders = {}
+        pruning_ctes = []
+        pruning_columns = []
+        for variable, table_name in self._min_timestamp_tables.items():
+            template = get_template(f"{self._pruning_template_prefix}_{variable}.sql")
+            query = template.render(**self_contained_placeholders).strip()
+            self_contained_placeholders[f"{variable}_query"] = query
+            min_timestamp = self.pruning_strategy.get_min_timestamp_sql(
+                variable, table_name, query
+            )
+            min_timestamp_cte = self.pruning_strategy.get_min_timestamp_cte_sql(
+                variable, template.render(**cte_placeholders).strip()
+            )
+            if min_timestamp_cte is None:
+                min_timestamp_bound = min_timestamp_merge = min_timestamp
+            else:
+                min_timestamp_bound = MIN_TIMESTAMP_CTE_REFERENCE_SQL_TEMPLATE.format(
+                    variable=variable
+                )
+                min_timestamp_merge = f"staging.{variable}"
+                pruning_ctes.append(f"{min_timestamp_cte},\n          ")
+                pruning_columns.append(
+                    f",\n          {min_timestamp_bound} AS {variable}"
+                )
+
+            self_contained_placeholders[variable] = min_timestamp
+            cte_placeholders[variable] = min_timestamp_bound
+            pruning_placeholders[variable] = min_timestamp
+            pruning_placeholders[f"{variable}_bound"] = min_timestamp_bound
+            pruning_placeholders[f"{variable}_merge"] = min_timestamp_merge
+
+        pruning_placeholders["pruning_ctes"] = "".join(pruning_ctes)
+        pruning_placeholders["pruning_columns"] = "".join(pruning_columns)
+        pruning_placeholders["pruning_statements"] = (
+            self.pruning_strategy.get_statements_sql(
+                f"{self._pruning_template_prefix}_pre_scan.sql",
+                self_contained_placeholders,
+            )
+        )
+
+        return pruning_placeholders
+
+    @property
+    def _sql_cache_key(self) -> Tuple:
+        """Get the key that identifies the current version of the SQL artifacts.
+
+        The key changes whenever the table structure or its staging table change.
+        Subclasses extend it with any other object the SQL depends on (e.g. the
+        parent table).
+
+        Returns:
+            Key of the SQL artifacts.
+        """
+        staging_table = self._staging_table
+        if staging_table is None:
+            return (self._revision, None)
+        return (
+            self._revision,
+            staging_table.schema,
+            staging_table.name,
+            staging_table.inline_sql,
+            staging_table.record_timestamp_column,
+        )
+
+    def _get_sql_artifact(self, name: str, build: Callable[[Any], Any]) -> Any:
+        """Get a SQL artifact, building it if it is not cached.
+
+        Args:
+            name: Name of the SQL artifact.
+            build: Function that builds the SQL artifact.
+
+        Returns:
+            SQL artifact.
+        """
+        key = self._sql_cache_key
+        if key != self._sql_artifacts_key:
+            self._sql_artifacts = {}
+            self._sql_artifacts_key = key
+
+        try:
+            return self._sql_artifacts[name]
+        except KeyError:
+            artifact = self._sql_artifacts[name] = build(self)
+            return artifact
 
     @cached_property
     def fields_by_name(self) -> Dict[str, Field]:
@@ -183,18 +586,21 @@ class DataVaultTable(Table):
            SQL script to load current table.
         """
 
-    @property
+    @sql_artifact
     def sql_placeholders(self) -> Dict[str, str]:
         """Get common placeholders needed to generate SQL for this Table.
 
         Returns:
             Common placeholders to be used in all Table SQL scripts.
         """
+        staging_schema = self.staging_table.schema
+        staging_table = self.staging_table.name
         query_args = {
             "target_schema": self.schema,
             "target_table": self.name,
-            "staging_schema": self.staging_table.schema,
-            "staging_table": self.staging_table.name,
+            "staging_schema": staging_schema,
+            "staging_table": staging_table,
+            "staging_relation": self.staging_table.relation,
             "record_start_timestamp": METADATA_FIELDS["record_start_timestamp"],
             "record_source": METADATA_FIELDS["record_source"],
         }
@@ -227,28 +633,44 @@ class DataVaultTable(Table):
             ) from e
 
     @property
+    def hashkey_fields(self) -> List[Field]:
+        """Get the fields concatenated in the hashkey, in order.
+
+        Returns:
+            Business keys and child keys of the table.
+        """
+        return [
+            *self.fields_by_role[FieldRole.BUSINESS_KEY],
+            *self.fields_by_role[FieldRole.CHILD_KEY],
+        ]
+
+    @sql_artifact
     def hashkey_sql(self) -> str:
         """Get SQL expression to calculate hashkey fields.
 
-        The hashkey formula is the following:
+        The hashkey formula is the following (MD5 being the default `hash_function`):
         `MD5(business_key_1 + |~~| + business_key_n + |~~| child_key_1)`.
 
+        Returns:
+            Hashkey SQL expression.
+        """
+        return self.get_hashkey_sql()
+
+    def get_hashkey_sql(self, hash_inputs: Optional[Mapping[str, str]] = None) -> str:
+        """Get SQL expression to calculate hashkey fields (see `hashkey_sql`).
+
+        Args:
+            hash_inputs: Columns that replace the string representation of fields
+                (`Field.hash_concatenation_sql`), when it is calculated beforehand.
+
         Returns:
             Hashkey SQL expression.
         """
         hashkey = next(hashkey for hashkey in self.fields_by_role[FieldRole.HASHKEY])
-        fields_for_hashkey = [
-            field.hash_concatenation_sql
-            for field in self.fields_by_role[FieldRole.BUSINESS_KEY]
-        ]
-        fields_for_hashkey.extend(
-            [
-                field.hash_concatenation_sql
-                for field in self.fields_by_role[FieldRole.CHILD_KEY]
-            ]
-        )
+        fields_for_hashkey = self._get_hash_inputs_sql(self.hashkey_fields, hash_inputs)
 
         hashkey_sql = HASHKEY_SQL_TEMPLATE.format(
+            hash_function=self.hash_function.value,
             hashkey_expression=f"||'{HASH_DELIMITER}'||".join(fields_for_hashkey),
             hashkey=hashkey.name,
         )
@@ -257,3 +679,23 @@ class DataVaultTable(Table):
         )
 
         return hashkey_sql
+
+    @staticmethod
+    def _get_hash_inputs_sql(
+        fields: List[Field], hash_inputs: Optional[Mapping[str, str]] = None
+    ) -> List[str]:
+        """Get the string representation of each field concatenated in a hash.
+
+        Args:
+            fields: Fields concatenated in the hash.
+            hash_inputs: Columns that replace the string representation of fields,
+                by `Field.hash_concatenation_sql`.
+
+        Returns:
+            SQL expression (or column) of each field.
+        """
+        hash_inputs = hash_inputs or {}
+        return [
+            hash_inputs.get(field.hash_concatenation_sql, field.hash_concatenation_sql)
+            for field in fields
+        ]
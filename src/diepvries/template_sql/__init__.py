@@ -1 +1,95 @@
-"""SQL templates."""
+"""SQL templates.
+
+Templates are loaded from disk only once per process: `get_template` parses each
+`.sql` file into literal and placeholder segments, so that rendering a statement is
+reduced to a string join (no file access and no format string parsing).
+"""
+
+from functools import lru_cache
+from string import Formatter
+from typing import FrozenSet, Tuple
+
+from .. import TEMPLATES_DIR
+
+
+class SQLTemplate:
+    """A parsed SQL template.
+
+    The template follows `str.format` syntax, restricted to named placeholders
+    (`{placeholder}`), as this is the only syntax used in diepvries templates. Escaped
+    braces (`{{` and `}}`) are supported.
+    """
+
+    __slots__ = ("name", "placeholders", "_segments")
+
+    def __init__(self, name: str, text: str):
+        """Instantiate a SQLTemplate, parsing its text into segments.
+
+        Args:
+            name: Template name (used in error messages).
+            text: Template text.
+
+        Raises:
+            ValueError: If the template has positional, indexed, converted or
+                formatted placeholders.
+        """
+        self.name = name
+
+        segments = []
+        for literal, placeholder, format_spec, conversion in Formatter().parse(text):
+            if placeholder is not None and (
+                not placeholder.isidentifier() or format_spec or conversion
+            ):
+                raise ValueError(
+                    f"{name}: Invalid placeholder '{{{placeholder}}}' (only named "
+                    f"placeholders are supported)"
+                )
+            segments.append((literal, placeholder))
+
+        self._segments: Tuple[Tuple[str, str], ...] = tuple(segments)
+        self.placeholders: FrozenSet[str] = frozenset(
+            placeholder for _, placeholder in segments if placeholder is not None
+        )
+
+    def __str__(self) -> str:
+        """Representation of a SQLTemplate object as a string.
+
+        Returns:
+            String representation of the template.
+        """
+        return f"{type(self).__name__}: {self.name}"
+
+    def render(self, **placeholders: str) -> str:
+        """Render the template.
+
+        Placeholders that are not used by the template are ignored and a missing
+        placeholder raises a KeyError, mirroring `str.format` behaviour.
+
+        Args:
+            placeholders: Values for the template placeholders.
+
+        Returns:
+            Rendered SQL.
+        """
+        return "".join(
+            literal if placeholder is None else f"{literal}{placeholders[placeholder]}"
+            for literal, placeholder in self._segments
+        )
+
+
+@lru_cache(maxsize=None)
+def get_template(template_name: str) -> SQLTemplate:
+    """Get a parsed SQL template, stored in the SQL templates folder.
+
+    The template is read and parsed on the first call only: subsequent calls return
+    the same `SQLTemplate` instance.
+
+    Args:
+        template_name: Name of the template file (e.g. `hub_link_dml.sql`).
+
+    Returns:
+        Parsed SQL template.
+    """
+    return SQLTemplate(
+        name=template_name, text=(TEMPLATES_DIR / template_name).read_text()
+    )
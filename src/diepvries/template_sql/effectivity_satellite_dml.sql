@@ -1,45 +1,18 @@
--- Calculate minimum timestamp that can be affected by the current load.
--- This timestamp is used in the MERGE statement to reduce the number of records scanned, ensuring
--- the usage of the recommended clustering key (r_timestamp :: DATE).
--- If there are no matches between the staging table and the target table, the minimum timestamp is set to the
--- current timestamp minus 4 hours. The four hours are subtracted as a "safety net" to avoid the insertion of
--- duplicate records when the first version of a given driving key is being loaded by two processes running in parallel.
--- This is unlikely to happen, but still better to play it on the safe side.
-SET min_timestamp_link = (
-                         SELECT
-                           DATEADD(HOUR, -4, COALESCE(MIN(l.{record_start_timestamp}), CURRENT_TIMESTAMP()))
-                         FROM {target_schema}.{link_table} AS l
-                           INNER JOIN {staging_schema}.{staging_table} AS staging
-                                      ON ({link_driving_key_condition})
-                         );
-
-SET min_timestamp_satellite = (
-                              SELECT
-                                DATEADD(HOUR, -4, COALESCE(MIN(satellite.{record_start_timestamp}), CURRENT_TIMESTAMP()))
-                              FROM {target_schema}.{link_table} AS l
-                                INNER JOIN {target_schema}.{target_table} AS satellite
-                                           ON (l.{hashkey_field} = satellite.{hashkey_field}
-                                             AND satellite.{record_end_timestamp_name} = {end_of_time}
-                                             AND l.{record_start_timestamp} >= $min_timestamp_link)
-                                INNER JOIN {staging_schema}.{staging_table} AS staging
-                                           ON ({link_driving_key_condition})
-                              );
-
-MERGE INTO {target_schema}.{target_table} AS satellite
+{pruning_statements}MERGE INTO {target_schema}.{target_table} AS satellite
   USING (
         WITH
-          filtered_effectivity_satellite AS (
+          {pruning_ctes}filtered_effectivity_satellite AS (
           SELECT
             {link_driving_keys},
             satellite.*
-          FROM {staging_schema}.{staging_table} AS staging
+          FROM {staging_relation} AS staging
             INNER JOIN {target_schema}.{link_table} AS l
                        ON ({link_driving_key_condition}
-                         AND l.{record_start_timestamp} >= $min_timestamp_link)
+                         AND l.{record_start_timestamp} >= {min_timestamp_link_bound})
             INNER JOIN {target_schema}.{target_table} AS satellite
                        ON (l.{hashkey_field} = satellite.{hashkey_field}
                          AND satellite.{record_end_timestamp_name} = {end_of_time}
-                         AND satellite.{record_start_timestamp} >= $min_timestamp_satellite)
+                         AND satellite.{record_start_timestamp} >= {min_timestamp_satellite_bound})
                                             ),
           filtered_staging AS (
           SELECT DISTINCT
@@ -49,7 +22,7 @@ MERGE INTO {target_schema}.{target_table} AS satellite
             staging.{record_start_timestamp},
             staging.{record_source}
             {staging_descriptive_fields}
-          FROM {staging_schema}.{staging_table} AS staging
+          FROM {staging_relation} AS staging
           WHERE NOT EXISTS (
                            SELECT
                              1
@@ -98,12 +71,12 @@ MERGE INTO {target_schema}.{target_table} AS satellite
           {record_start_timestamp} AS {record_start_timestamp},
           {record_end_timestamp_expression},
           {record_source}
-          {descriptive_fields}
+          {descriptive_fields}{pruning_columns}
         FROM staging_satellite_affected_records
         ) AS staging
   ON (satellite.{hashkey_field} = staging.{hashkey_field}
     AND satellite.{record_start_timestamp} = staging.{record_start_timestamp}
-    AND satellite.{record_start_timestamp} >= $min_timestamp_satellite)
+    AND satellite.{record_start_timestamp} >= {min_timestamp_satellite_merge})
   WHEN MATCHED THEN
     UPDATE SET satellite.{record_end_timestamp_name} = staging.{record_end_timestamp_name}
   WHEN NOT MATCHED
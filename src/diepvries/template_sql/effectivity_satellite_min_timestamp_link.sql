@@ -0,0 +1,7 @@
+(
+                         SELECT
+                           DATEADD(HOUR, -4, COALESCE(MIN(l.{record_start_timestamp}), CURRENT_TIMESTAMP()))
+                         FROM {target_schema}.{link_table} AS l
+                           INNER JOIN {staging_relation} AS staging
+                                      ON ({link_driving_key_condition})
+                         )
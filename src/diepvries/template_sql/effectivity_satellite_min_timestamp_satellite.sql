@@ -0,0 +1,11 @@
+(
+                              SELECT
+                                DATEADD(HOUR, -4, COALESCE(MIN(satellite.{record_start_timestamp}), CURRENT_TIMESTAMP()))
+                              FROM {target_schema}.{link_table} AS l
+                                INNER JOIN {target_schema}.{target_table} AS satellite
+                                           ON (l.{hashkey_field} = satellite.{hashkey_field}
+                                             AND satellite.{record_end_timestamp_name} = {end_of_time}
+                                             AND l.{record_start_timestamp} >= {min_timestamp_link})
+                                INNER JOIN {staging_relation} AS staging
+                                           ON ({link_driving_key_condition})
+                              )
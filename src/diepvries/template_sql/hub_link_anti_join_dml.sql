@@ -0,0 +1,21 @@
+{pruning_statements}INSERT INTO {target_schema}.{target_table} ({target_fields})
+  SELECT
+    {staging_source_fields}
+  FROM (
+       SELECT
+         {source_hashkey_field},
+         -- If multiple sources for the same hashkey are received, their values
+         -- are concatenated using a comma.
+         LISTAGG(DISTINCT {record_source_field}, ',')
+                 WITHIN GROUP (ORDER BY {record_source_field}) AS {record_source_field},
+         {source_fields}
+       FROM {staging_relation}
+       GROUP BY {source_hashkey_field}, {source_fields}
+       ) AS staging
+  WHERE NOT EXISTS (
+                   SELECT
+                     1
+                   FROM {target_schema}.{target_table} AS target
+                   WHERE target.{target_hashkey_field} = staging.{source_hashkey_field}
+                     AND target.{record_start_timestamp} >= {min_timestamp}
+                   );
@@ -0,0 +1,7 @@
+(
+                    SELECT
+                      DATEADD(HOUR, -4, COALESCE(MIN(target.{record_start_timestamp}), CURRENT_TIMESTAMP()))
+                    FROM {staging_relation} AS staging
+                      INNER JOIN {target_schema}.{target_table} AS target
+                                 ON (staging.{source_hashkey_field} = target.{target_hashkey_field})
+                    )
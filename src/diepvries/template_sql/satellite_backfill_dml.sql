@@ -0,0 +1,84 @@
+{pruning_statements}MERGE INTO {target_schema}.{target_table} AS satellite
+  USING (
+        WITH
+          {pruning_ctes}filtered_satellite AS (
+          SELECT *
+          FROM {target_schema}.{target_table}
+          WHERE {record_end_timestamp_name} = {end_of_time}
+            AND {record_start_timestamp} >= {min_timestamp_bound}
+                                ),
+          filtered_staging AS (
+          SELECT DISTINCT
+            staging.{hashkey_field},
+            staging.{staging_hashdiff_field},
+            staging.{record_start_timestamp},
+            staging.{record_source}
+            {staging_descriptive_fields}
+          FROM {staging_relation} AS staging
+          WHERE NOT EXISTS (
+                           SELECT
+                             1
+                           FROM filtered_satellite AS satellite
+                           WHERE staging.{hashkey_field} = satellite.{hashkey_field}
+                             AND satellite.{record_start_timestamp} >= staging.{record_start_timestamp}
+                           )
+                              ),
+          -- Versions of each staged hashkey, in order: its open version in the target
+          -- table (if any), followed by its staged versions (one per record timestamp).
+          satellite_versions AS (
+          SELECT
+            staging.{hashkey_field},
+            staging.{staging_hashdiff_field},
+            staging.{record_start_timestamp},
+            staging.{record_source}
+            {staging_descriptive_fields}
+          FROM filtered_staging AS staging
+          UNION ALL
+          SELECT
+            satellite.{hashkey_field},
+            satellite.{hashdiff_field},
+            satellite.{record_start_timestamp},
+            satellite.{record_source}
+            {satellite_descriptive_fields}
+          FROM filtered_satellite AS satellite
+          WHERE EXISTS (
+                       SELECT
+                         1
+                       FROM filtered_staging AS staging
+                       WHERE staging.{hashkey_field} = satellite.{hashkey_field}
+                       )
+                                ),
+          -- Consecutive versions with the same hashdiff are collapsed into the earliest
+          -- one. Staged versions are inserted (WHEN NOT MATCHED condition of the MERGE
+          -- command), and the open version is end dated when a new version follows it
+          -- (WHEN MATCHED condition).
+          staging_satellite_affected_records AS (
+          SELECT *
+          FROM satellite_versions
+          QUALIFY LAG({staging_hashdiff_field}) OVER (PARTITION BY {hashkey_field} ORDER BY {record_start_timestamp})
+                    IS DISTINCT FROM {staging_hashdiff_field}
+                                                )
+        SELECT
+          {hashkey_field},
+          {staging_hashdiff_field},
+          {record_start_timestamp} AS {record_start_timestamp},
+          {record_end_timestamp_expression},
+          {record_source}
+          {descriptive_fields}{pruning_columns}
+        FROM staging_satellite_affected_records
+        ) AS staging
+  ON (satellite.{hashkey_field} = staging.{hashkey_field}
+    AND satellite.{record_start_timestamp} = staging.{record_start_timestamp}
+    AND satellite.{record_start_timestamp} >= {min_timestamp_merge})
+  WHEN MATCHED AND staging.{record_end_timestamp_name} <> {end_of_time} THEN
+    UPDATE SET satellite.{record_end_timestamp_name} = staging.{record_end_timestamp_name}
+  WHEN NOT MATCHED
+    THEN
+    INSERT ({fields})
+      VALUES (
+               staging.{hashkey_field},
+               staging.{staging_hashdiff_field},
+               staging.{record_start_timestamp},
+               staging.{record_end_timestamp_name},
+               staging.{record_source}
+               {staging_descriptive_fields});
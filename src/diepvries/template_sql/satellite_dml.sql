@@ -1,27 +1,11 @@
--- Calculate minimum timestamp that can be affected by the current load.
--- This timestamp is used in the MERGE statement to reduce the number of records scanned, ensuring
--- the usage of the recommended clustering key (r_timestamp :: DATE).
--- If there are no matches between the staging table and the target table, the minimum timestamp is set to the
--- current timestamp minus 4 hours. The four hours are subtracted as a "safety net" to avoid the insertion of
--- duplicate records when the first version of a given hashkey is being loaded by two processes running in parallel.
--- This is unlikely to happen, but still better to play it on the safe side.
-SET min_timestamp = (
-                    SELECT
-                      DATEADD(HOUR, -4, COALESCE(MIN(satellite.{record_start_timestamp}), CURRENT_TIMESTAMP()))
-                    FROM {staging_schema}.{staging_table} AS staging
-                      INNER JOIN {target_schema}.{target_table} AS satellite
-                                 ON (satellite.{hashkey_field} = staging.{hashkey_field}
-                                   AND satellite.{record_end_timestamp_name} = {end_of_time})
-                    );
-
-MERGE INTO {target_schema}.{target_table} AS satellite
+{pruning_statements}MERGE INTO {target_schema}.{target_table} AS satellite
   USING (
         WITH
-          filtered_satellite AS (
+          {pruning_ctes}filtered_satellite AS (
           SELECT *
           FROM {target_schema}.{target_table}
           WHERE {record_end_timestamp_name} = {end_of_time}
-            AND {record_start_timestamp} >= $min_timestamp
+            AND {record_start_timestamp} >= {min_timestamp_bound}
                                 ),
           filtered_staging AS (
           SELECT DISTINCT
@@ -30,7 +14,7 @@ MERGE INTO {target_schema}.{target_table} AS satellite
             staging.{record_start_timestamp},
             staging.{record_source}
             {staging_descriptive_fields}
-          FROM {staging_schema}.{staging_table} AS staging
+          FROM {staging_relation} AS staging
           WHERE NOT EXISTS (
                            SELECT
                              1
@@ -79,12 +63,12 @@ MERGE INTO {target_schema}.{target_table} AS satellite
           {record_start_timestamp} AS {record_start_timestamp},
           {record_end_timestamp_expression},
           {record_source}
-          {descriptive_fields}
+          {descriptive_fields}{pruning_columns}
         FROM staging_satellite_affected_records
         ) AS staging
   ON (satellite.{hashkey_field} = staging.{hashkey_field}
     AND satellite.{record_start_timestamp} = staging.{record_start_timestamp}
-    AND satellite.{record_start_timestamp} >= $min_timestamp)
+    AND satellite.{record_start_timestamp} >= {min_timestamp_merge})
   WHEN MATCHED THEN
     UPDATE SET satellite.{record_end_timestamp_name} = staging.{record_end_timestamp_name}
   WHEN NOT MATCHED
@@ -0,0 +1,29 @@
+-- Initial load: the target table is empty, so all staged versions are inserted, and
+-- end dated by the next version of the same hashkey (if any).
+INSERT INTO {target_schema}.{target_table} ({fields})
+  WITH
+    staging_versions AS (
+    SELECT DISTINCT
+      staging.{hashkey_field},
+      staging.{staging_hashdiff_field},
+      staging.{record_start_timestamp},
+      staging.{record_source}
+      {staging_descriptive_fields}
+    FROM {staging_relation} AS staging
+                        ),
+    -- Consecutive versions with the same hashdiff are collapsed into the earliest one
+    -- (a hashkey only has multiple staged versions when backfilling).
+    staging_version_changes AS (
+    SELECT *
+    FROM staging_versions
+    QUALIFY LAG({staging_hashdiff_field}) OVER (PARTITION BY {hashkey_field} ORDER BY {record_start_timestamp})
+              IS DISTINCT FROM {staging_hashdiff_field}
+                               )
+  SELECT
+    {hashkey_field},
+    {staging_hashdiff_field},
+    {record_start_timestamp},
+    {record_end_timestamp_expression},
+    {record_source}
+    {descriptive_fields}
+  FROM staging_version_changes;
@@ -0,0 +1,71 @@
+{pruning_statements}INSERT INTO {target_schema}.{target_table} ({fields})
+  WITH
+    -- Latest version of each hashkey. Previous versions are not end dated in the
+    -- target table (r_timestamp_end is calculated in the satellite view).
+    latest_satellite AS (
+    SELECT *
+    FROM {target_schema}.{target_table}
+    WHERE {record_start_timestamp} >= {min_timestamp}
+    QUALIFY ROW_NUMBER() OVER (PARTITION BY {hashkey_field} ORDER BY {record_start_timestamp} DESC) = 1
+                        ),
+    filtered_staging AS (
+    SELECT DISTINCT
+      staging.{hashkey_field},
+      staging.{staging_hashdiff_field},
+      staging.{record_start_timestamp},
+      staging.{record_source}
+      {staging_descriptive_fields}
+    FROM {staging_relation} AS staging
+    WHERE NOT EXISTS (
+                     SELECT
+                       1
+                     FROM latest_satellite AS satellite
+                     WHERE staging.{hashkey_field} = satellite.{hashkey_field}
+                       AND satellite.{record_start_timestamp} >= staging.{record_start_timestamp}
+                     )
+                        ),
+    -- Versions of each staged hashkey, in order: its latest version in the target
+    -- table (if any), followed by its staged versions (one per record timestamp).
+    satellite_versions AS (
+    SELECT
+      TRUE AS is_staged,
+      staging.{hashkey_field},
+      staging.{staging_hashdiff_field},
+      staging.{record_start_timestamp},
+      staging.{record_source}
+      {staging_descriptive_fields}
+    FROM filtered_staging AS staging
+    UNION ALL
+    SELECT
+      FALSE AS is_staged,
+      satellite.{hashkey_field},
+      satellite.{hashdiff_field},
+      satellite.{record_start_timestamp},
+      satellite.{record_source}
+      {satellite_descriptive_fields}
+    FROM latest_satellite AS satellite
+    WHERE EXISTS (
+                 SELECT
+                   1
+                 FROM filtered_staging AS staging
+                 WHERE staging.{hashkey_field} = satellite.{hashkey_field}
+                 )
+                          ),
+    -- Consecutive versions with the same hashdiff are collapsed into the earliest one.
+    satellite_version_changes AS (
+    SELECT *
+    FROM satellite_versions
+    QUALIFY LAG({staging_hashdiff_field}) OVER (PARTITION BY {hashkey_field} ORDER BY {record_start_timestamp})
+              IS DISTINCT FROM {staging_hashdiff_field}
+                                 )
+  -- Staged versions that will be inserted (the hashdiff changed since the previous
+  -- version of the hashkey, if any).
+  SELECT
+    {hashkey_field},
+    {staging_hashdiff_field},
+    {record_start_timestamp},
+    {end_of_time},
+    {record_source}
+    {descriptive_fields}
+  FROM satellite_version_changes
+  WHERE is_staged;
@@ -0,0 +1,40 @@
+{pruning_statements}INSERT INTO {target_schema}.{target_table} ({fields})
+  WITH
+    -- Latest version of each hashkey. Previous versions are not end dated in the
+    -- target table (r_timestamp_end is calculated in the satellite view).
+    latest_satellite AS (
+    SELECT *
+    FROM {target_schema}.{target_table}
+    WHERE {record_start_timestamp} >= {min_timestamp}
+    QUALIFY ROW_NUMBER() OVER (PARTITION BY {hashkey_field} ORDER BY {record_start_timestamp} DESC) = 1
+                        ),
+    filtered_staging AS (
+    SELECT DISTINCT
+      staging.{hashkey_field},
+      staging.{staging_hashdiff_field},
+      staging.{record_start_timestamp},
+      staging.{record_source}
+      {staging_descriptive_fields}
+    FROM {staging_relation} AS staging
+    WHERE NOT EXISTS (
+                     SELECT
+                       1
+                     FROM latest_satellite AS satellite
+                     WHERE staging.{hashkey_field} = satellite.{hashkey_field}
+                       AND satellite.{record_start_timestamp} >= staging.{record_start_timestamp}
+                     )
+                        )
+  -- Records that will be inserted (don't exist in target table or exist in the
+  -- target table but the hashdiff changed).
+  SELECT
+    staging.{hashkey_field},
+    staging.{staging_hashdiff_field},
+    staging.{record_start_timestamp},
+    {end_of_time},
+    staging.{record_source}
+    {staging_descriptive_fields}
+  FROM filtered_staging AS staging
+    LEFT OUTER JOIN latest_satellite AS satellite
+                    ON (staging.{hashkey_field} = satellite.{hashkey_field})
+  WHERE satellite.{hashkey_field} IS NULL
+     OR satellite.{hashdiff_field} <> staging.{staging_hashdiff_field};
@@ -0,0 +1,12 @@
+(
+                    SELECT
+                      DATEADD(HOUR, -4, COALESCE(MIN(latest_satellite.{record_start_timestamp}), CURRENT_TIMESTAMP()))
+                    FROM (
+                         SELECT
+                           MAX(satellite.{record_start_timestamp}) AS {record_start_timestamp}
+                         FROM {staging_relation} AS staging
+                           INNER JOIN {target_schema}.{target_table} AS satellite
+                                      ON (satellite.{hashkey_field} = staging.{hashkey_field})
+                         GROUP BY satellite.{hashkey_field}
+                         ) AS latest_satellite
+                    )
@@ -0,0 +1,8 @@
+(
+                    SELECT
+                      DATEADD(HOUR, -4, COALESCE(MIN(satellite.{record_start_timestamp}), CURRENT_TIMESTAMP()))
+                    FROM {staging_relation} AS staging
+                      INNER JOIN {target_schema}.{target_table} AS satellite
+                                 ON (satellite.{hashkey_field} = staging.{hashkey_field}
+                                   AND satellite.{record_end_timestamp_name} = {end_of_time})
+                    )
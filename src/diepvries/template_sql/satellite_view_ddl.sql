@@ -0,0 +1,9 @@
+CREATE OR REPLACE VIEW {target_schema}.{view_name} AS
+  SELECT
+    {hashkey_field},
+    {hashdiff_field},
+    {record_start_timestamp},
+    {record_end_timestamp_expression},
+    {record_source}
+    {descriptive_fields}
+  FROM {target_schema}.{target_table};
@@ -2,7 +2,7 @@
 
 from typing import List, Union
 
-from .. import END_OF_TIME, HASH_DELIMITER, METADATA_FIELDS, UNKNOWN
+from .. import BEGINNING_OF_TIME, END_OF_TIME, HASH_DELIMITER, METADATA_FIELDS, UNKNOWN
 from ..driving_key_field import DrivingKeyField
 from ..field import Field
 
@@ -15,6 +15,12 @@ ALIASED_BUSINESS_KEY_SQL_TEMPLATE = (
 # Field with alias prepended.
 ALIASED_FIELD_SQL_TEMPLATE = "{table_alias}.{field_name}"
 
+# SQL expression that should be used to represent the beginning of times (1900-01-01)
+# in SQL query filters.
+BEGINNING_OF_TIME_SQL_TEMPLATE = (
+    f"CAST('{BEGINNING_OF_TIME.strftime('%Y-%m-%dT%H:%M:%S.%fZ')}' AS TIMESTAMP)"
+)
+
 # SQL expression that should be used to represent the end of times (9999-12-31)
 # in SQL query filters.
 END_OF_TIME_SQL_TEMPLATE = (
@@ -22,19 +28,45 @@ END_OF_TIME_SQL_TEMPLATE = (
 )
 
 # Formula used to calculate HASHDIFF fields. {hashdiff_expression} is the concatenation
-# between all business keys plus descriptive_field delimited by HASH_DELIMITER.
+# between all business keys plus descriptive_field delimited by HASH_DELIMITER, and
+# {hash_function} the name of the HashFunction of the satellite.
 # The REGEXP_REPLACE function is needed in order to avoid changes in hashdiffs
 # when a new field is added to a satellite.
 _HASH_DELIMITER_ESCAPED = HASH_DELIMITER.replace("|", "\\\\|")
 HASHDIFF_SQL_TEMPLATE = (
-    f"MD5(REGEXP_REPLACE({{hashdiff_expression}}, "
+    f"{{hash_function}}(REGEXP_REPLACE({{hashdiff_expression}}, "
     f"'({_HASH_DELIMITER_ESCAPED})+$', '')) "
     f"AS {{hashdiff}}"
 )
 
+# Formulas used to calculate HASHDIFF fields without regular expressions (see
+# HashdiffFormula.STRUCTURAL). {hashdiff_expression} is built from the last field to
+# the first one: the last field is NULL when empty, and each previous field is
+# followed by the delimiter and the next fields only when they are not NULL.
+STRUCTURAL_HASHDIFF_LAST_FIELD_SQL_TEMPLATE = "NULLIF({field}, '')"
+STRUCTURAL_HASHDIFF_FIELD_SQL_TEMPLATE = (
+    f"NULLIF({{field}} || COALESCE('{HASH_DELIMITER}' || {{next_fields}}, ''), '')"
+)
+STRUCTURAL_HASHDIFF_SQL_TEMPLATE = (
+    "{hash_function}(COALESCE({hashdiff_expression}, '')) AS {hashdiff}"
+)
+
+# Formula used to calculate HASHDIFF fields with HashdiffFormula.STRUCTURAL_COMPATIBLE:
+# trailing delimiters that are part of the last non empty field are removed with
+# a regular expression, as in HASHDIFF_SQL_TEMPLATE. As {hashdiff_expression} is
+# repeated, staging queries calculate it beforehand, in an inner projection (see
+# HASHDIFF_INPUT_NAME_TEMPLATE).
+STRUCTURAL_COMPATIBLE_HASHDIFF_SQL_TEMPLATE = (
+    f"{{hash_function}}(IFF(ENDSWITH(COALESCE({{hashdiff_expression}}, ''), "
+    f"'{HASH_DELIMITER}'), "
+    f"REGEXP_REPLACE({{hashdiff_expression}}, '({_HASH_DELIMITER_ESCAPED})+$', ''), "
+    f"COALESCE({{hashdiff_expression}}, ''))) AS {{hashdiff}}"
+)
+
 # Formula used to calculate hashkeys. The {hashkey_expression} is the concatenation of
-# all business keys plus child keys (if they exist) delimited by HASH_DELIMITER.
-HASHKEY_SQL_TEMPLATE = "MD5({hashkey_expression}) AS {hashkey}"
+# all business keys plus child keys (if they exist) delimited by HASH_DELIMITER, and
+# {hash_function} the name of the HashFunction of the hub/link.
+HASHKEY_SQL_TEMPLATE = "{hash_function}({hashkey_expression}) AS {hashkey}"
 
 # JOIN condition template SQL.
 JOIN_CONDITION_SQL_TEMPLATE = (
@@ -59,6 +91,60 @@ RECORD_START_TIMESTAMP_SQL_TEMPLATE = (
     f"{METADATA_FIELDS['record_start_timestamp']}"
 )
 
+# Formula used to create the record timestamp in staging table when backfilling: each
+# record holds its own timestamp, read from a column of the extraction table.
+RECORD_START_TIMESTAMP_COLUMN_SQL_TEMPLATE = (
+    f"CAST({{column}} AS TIMESTAMP) AS {METADATA_FIELDS['record_start_timestamp']}"
+)
+
+# Relation that keeps the earliest records of each hashkey of a staging table, used to
+# load hubs and links when the staged records have multiple record timestamps per
+# hashkey (backfill), so that a single record is inserted.
+STAGING_EARLIEST_RECORDS_SQL_TEMPLATE = (
+    f"(SELECT * FROM {{staging_relation}} "
+    f"QUALIFY {METADATA_FIELDS['record_start_timestamp']} = "
+    f"MIN({METADATA_FIELDS['record_start_timestamp']}) "
+    f"OVER (PARTITION BY {{hashkey}}))"
+)
+
+# Query that returns a row if a target table holds any record (and none if it is
+# empty), used to detect initial loads (see `InitialLoadMode.AUTO`).
+INITIAL_LOAD_PROBE_SQL_TEMPLATE = (
+    "SELECT 1 WHERE EXISTS (SELECT 1 FROM {target_schema}.{target_table})"
+)
+
+# CTE that calculates a minimum timestamp once per load statement, and the scalar
+# subquery that reads it (see `PruningStrategy.get_min_timestamp_cte_sql`).
+MIN_TIMESTAMP_CTE_SQL_TEMPLATE = "{variable}_bound AS (SELECT {query} AS {variable})"
+MIN_TIMESTAMP_CTE_REFERENCE_SQL_TEMPLATE = "(SELECT {variable} FROM {variable}_bound)"
+
+# Relation that replaces the staging table, when it is not materialized. Fields are
+# cast to their data type in staging, as in the staging table DDL.
+STAGING_INLINE_SQL_TEMPLATE = (
+    "(SELECT {fields} FROM (SELECT {fields_dml} FROM {extract_relation}))"
+)
+
+# Relation that staging fields are calculated from, when hash inputs are shared (see
+# `StagingTableOptions.share_hash_inputs`): each distinct field expression concatenated
+# in hashkeys and hashdiffs is calculated once, as an extra column of the extraction.
+HASH_INPUT_SQL_TEMPLATE = "{hash_input_expression} AS {hash_input}"
+HASH_INPUT_NAME_TEMPLATE = "_hash_input_{index}"
+HASH_INPUTS_RELATION_SQL_TEMPLATE = "(SELECT *, {hash_inputs} FROM {relation})"
+
+# Column of the extraction relation that holds the concatenation of the hashdiff fields
+# of a satellite with HashdiffFormula.STRUCTURAL_COMPATIBLE, that is used up to three
+# times in its hashdiff expression (see STRUCTURAL_COMPATIBLE_HASHDIFF_SQL_TEMPLATE).
+HASHDIFF_INPUT_NAME_TEMPLATE = "_hashdiff_input_{satellite}"
+
+# Relation that combines multiple staging tables, used to load a hub or link from all
+# of them in a single statement. When a hashkey is received in more than one staging
+# table, the earliest record timestamp is kept, so that a single record is inserted.
+STAGING_UNION_SQL_TEMPLATE = (
+    f"(SELECT {{fields}}, MIN({METADATA_FIELDS['record_start_timestamp']}) "
+    f"OVER (PARTITION BY {{hashkey}}) AS {METADATA_FIELDS['record_start_timestamp']} "
+    f"FROM ({{staging_selects}}))"
+)
+
 # Formula used to create the record source field in staging table. A simple SQL constant
 # aliased.
 SOURCE_SQL_TEMPLATE = f"'{{source}}' AS {METADATA_FIELDS['record_source']}"
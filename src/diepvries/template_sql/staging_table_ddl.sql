@@ -1,4 +1,4 @@
-CREATE OR REPLACE TABLE {staging_schema}.{staging_table}
-  ({fields_ddl}) AS
+CREATE OR REPLACE {table_type}TABLE {staging_schema}.{staging_table}
+  ({fields_ddl}){table_properties} AS
   SELECT {fields_dml}
-  FROM {extract_schema_name}.{extract_table_name};
+  FROM {extract_relation}{order_by};
@@ -0,0 +1,9 @@
+COPY INTO {staging_schema}.{staging_table}
+  FROM @{staging_schema}.%{staging_table}
+  FILE_FORMAT = (
+    TYPE = CSV
+    COMPRESSION = GZIP
+    FIELD_OPTIONALLY_ENCLOSED_BY = '"'
+    EMPTY_FIELD_AS_NULL = TRUE
+  )
+  PURGE = TRUE;
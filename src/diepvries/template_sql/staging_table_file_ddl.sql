@@ -0,0 +1,2 @@
+CREATE OR REPLACE {table_type}TABLE {staging_schema}.{staging_table}
+  ({fields_ddl}){table_properties};
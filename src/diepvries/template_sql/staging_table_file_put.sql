@@ -0,0 +1,2 @@
+PUT 'file://{file_path}' @{staging_schema}.%{staging_table}
+  AUTO_COMPRESS = FALSE;
@@ -0,0 +1,282 @@
+"""Synthetic Data Vault models, used to benchmark SQL generation at scale."""
+
+import json
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+from diepvries import FieldDataType, FieldRole
+from diepvries.data_vault_load import DataVaultLoad
+from diepvries.driving_key_field import DrivingKeyField
+from diepvries.effectivity_satellite import EffectivitySatellite
+from diepvries.field import Field
+from diepvries.hub import Hub
+from diepvries.link import Link
+from diepvries.role_playing_hub import RolePlayingHub
+from diepvries.satellite import Satellite
+from diepvries.table import DataVaultTable, StagingTable
+
+EXTRACT_START_TIMESTAMP = datetime(2019, 8, 6, tzinfo=timezone.utc)
+
+
+def _metadata_fields(table_name: str, first_position: int) -> List[Field]:
+    """Build the metadata fields (r_timestamp and r_source) of a table."""
+    return [
+        Field(
+            parent_table_name=table_name,
+            name="r_timestamp",
+            data_type=FieldDataType.TIMESTAMP_NTZ,
+            position=first_position,
+            is_mandatory=True,
+        ),
+        Field(
+            parent_table_name=table_name,
+            name="r_source",
+            data_type=FieldDataType.TEXT,
+            position=first_position + 1,
+            is_mandatory=True,
+        ),
+    ]
+
+
+def build_hub(entity: str) -> Hub:
+    """Build a hub with a single business key."""
+    name = f"h_{entity}"
+    fields = [
+        Field(
+            parent_table_name=name,
+            name=f"{name}_hashkey",
+            data_type=FieldDataType.TEXT,
+            position=1,
+            is_mandatory=True,
+            length=32,
+        ),
+        *_metadata_fields(name, first_position=2),
+        Field(
+            parent_table_name=name,
+            name=f"{entity}_id",
+            data_type=FieldDataType.TEXT,
+            position=4,
+            is_mandatory=True,
+        ),
+    ]
+    return Hub(schema="dv", name=name, fields=fields)
+
+
+def build_role_playing_hub(parent: Hub, role: str) -> RolePlayingHub:
+    """Build a role playing hub of `parent`, with a single business key."""
+    entity = f"{parent.name[2:]}_{role}"
+    role_playing_hub = build_hub(entity)
+    role_playing_hub = RolePlayingHub(
+        schema="dv", name=role_playing_hub.name, fields=role_playing_hub.fields
+    )
+    role_playing_hub.parent_table = parent
+    return role_playing_hub
+
+
+def build_link(entities: List[str]) -> Link:
+    """Build a link between the hubs of the given entities."""
+    name = f"l_{'_'.join(entities)}"
+    fields = [
+        Field(
+            parent_table_name=name,
+            name=f"{name}_hashkey",
+            data_type=FieldDataType.TEXT,
+            position=1,
+            is_mandatory=True,
+            length=32,
+        ),
+        *_metadata_fields(name, first_position=2),
+    ]
+    for entity in entities:
+        fields.append(
+            Field(
+                parent_table_name=name,
+                name=f"h_{entity}_hashkey",
+                data_type=FieldDataType.TEXT,
+                position=len(fields) + 1,
+                is_mandatory=True,
+                length=32,
+            )
+        )
+        fields.append(
+            Field(
+                parent_table_name=name,
+                name=f"{entity}_id",
+                data_type=FieldDataType.TEXT,
+                position=len(fields) + 1,
+                is_mandatory=True,
+            )
+        )
+    return Link(schema="dv", name=name, fields=fields)
+
+
+def build_satellite(
+    parent: DataVaultTable, columns: int, driving_key: Optional[str] = None
+) -> Satellite:
+    """Build a satellite with `columns` descriptive fields, attached to `parent`.
+
+    If a driving key (hashkey of one of the hubs of the parent link) is given, an
+    effectivity satellite is built.
+    """
+    name = f"{'hs' if isinstance(parent, Hub) else 'ls'}_{parent.name[2:]}"
+    if driving_key is not None:
+        name = f"{name}_eff"
+    fields = [
+        Field(
+            parent_table_name=name,
+            name=f"{parent.name}_hashkey",
+            data_type=FieldDataType.TEXT,
+            position=1,
+            is_mandatory=True,
+            length=32,
+        ),
+        Field(
+            parent_table_name=name,
+            name="s_hashdiff",
+            data_type=FieldDataType.TEXT,
+            position=2,
+            is_mandatory=True,
+            length=32,
+        ),
+        *_metadata_fields(name, first_position=3),
+        Field(
+            parent_table_name=name,
+            name="r_timestamp_end",
+            data_type=FieldDataType.TIMESTAMP_NTZ,
+            position=5,
+            is_mandatory=True,
+        ),
+    ]
+    data_types = [
+        FieldDataType.TEXT,
+        FieldDataType.NUMBER,
+        FieldDataType.TIMESTAMP_NTZ,
+        FieldDataType.DATE,
+        FieldDataType.BOOLEAN,
+    ]
+    for column in range(columns):
+        data_type = data_types[column % len(data_types)]
+        fields.append(
+            Field(
+                parent_table_name=name,
+                name=f"{data_type.value.lower()}_{column}",
+                data_type=data_type,
+                position=len(fields) + 1,
+                is_mandatory=False,
+                precision=38 if data_type == FieldDataType.NUMBER else None,
+                scale=2 if data_type == FieldDataType.NUMBER else None,
+            )
+        )
+    if driving_key is not None:
+        satellite = EffectivitySatellite(
+            schema="dv",
+            name=name,
+            fields=fields,
+            driving_keys=[
+                DrivingKeyField(
+                    parent_table_name=parent.name,
+                    name=driving_key,
+                    satellite_name=name,
+                )
+            ],
+        )
+    else:
+        satellite = Satellite(schema="dv", name=name, fields=fields)
+    satellite.parent_table = parent
+    return satellite
+
+
+def build_model(
+    hubs: int,
+    satellite_columns: int = 10,
+    role_playing_hubs: int = 0,
+    effectivity_satellites: bool = False,
+) -> List[DataVaultTable]:
+    """Build a model with `hubs` hubs, `hubs` links and one satellite per hub/link.
+
+    Each link connects two consecutive hubs, so the model holds `4 * hubs` tables,
+    plus the role playing hubs (and the links between them and their parent hubs)
+    and the effectivity satellites (one per link).
+
+    Args:
+        hubs: Number of hubs in the model.
+        satellite_columns: Number of descriptive fields in each satellite.
+        role_playing_hubs: Number of hubs that have a role playing hub.
+        effectivity_satellites: Add an effectivity satellite to each link, with the
+            first hub of the link as driving key.
+
+    Returns:
+        Tables of the model, with the staging table already set.
+    """
+    staging_table = StagingTable(
+        schema="dv_stg",
+        name="benchmark",
+        extract_start_timestamp=EXTRACT_START_TIMESTAMP,
+    )
+    entities = [f"entity_{index}" for index in range(hubs)]
+    model: List[DataVaultTable] = [build_hub(entity) for entity in entities]
+    links = [
+        build_link([entity, entities[(index + 1) % hubs]])
+        for index, entity in enumerate(entities)
+    ]
+    for parent in model[:role_playing_hubs]:
+        role_playing_hub = build_role_playing_hub(parent, role="role")
+        model.append(role_playing_hub)
+        links.append(build_link([parent.name[2:], role_playing_hub.name[2:]]))
+    satellites = [build_satellite(table, satellite_columns) for table in model + links]
+    if effectivity_satellites:
+        satellites.extend(
+            build_satellite(
+                link,
+                satellite_columns,
+                driving_key=link.fields_by_role[FieldRole.HASHKEY_PARENT][0].name,
+            )
+            for link in links
+        )
+    model.extend(links)
+    model.extend(satellites)
+
+    for table in model:
+        table.staging_table = staging_table
+
+    return model
+
+
+def build_data_vault_load(hubs: int, **model_options) -> DataVaultLoad:
+    """Build a DataVaultLoad that populates a synthetic model (see `build_model`)."""
+    return DataVaultLoad(
+        extract_schema="dv_extract",
+        extract_table="benchmark",
+        staging_schema="dv_stg",
+        staging_table="benchmark",
+        extract_start_timestamp=EXTRACT_START_TIMESTAMP,
+        target_tables=build_model(hubs, **model_options),
+        source="benchmark",
+    )
+
+
+def build_show_columns_metadata(model: List[DataVaultTable]) -> List[Dict[str, str]]:
+    """Build the result of Snowflake's `SHOW COLUMNS` command for a model.
+
+    Role playing hub parents are expected to be part of the model.
+    """
+    metadata = []
+    for table in model:
+        for field in table.fields:
+            data_type = {"type": field.data_type.value, "nullable": True}
+            if field.data_type == FieldDataType.NUMBER:
+                data_type.update(
+                    type="FIXED", precision=field.precision, scale=field.scale
+                )
+            elif field.data_type == FieldDataType.TEXT:
+                data_type["length"] = field.length or 16777216
+            data_type["nullable"] = not field.is_mandatory
+            metadata.append(
+                {
+                    "table_name": table.name.upper(),
+                    "schema_name": table.schema.upper(),
+                    "column_name": field.name.upper(),
+                    "data_type": json.dumps(data_type),
+                }
+            )
+    return metadata
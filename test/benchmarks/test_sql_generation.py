@@ -0,0 +1,288 @@
+"""Benchmarks for SQL generation on large models."""
+
+from typing import Any, Dict, List
+
+import pytest
+
+from diepvries import InsertStrategy
+from diepvries.data_vault_load import DataVaultLoad
+from diepvries.deserializers.snowflake_deserializer import (
+    DatabaseConfiguration,
+    MetadataQueryStrategy,
+    SnowflakeDeserializer,
+)
+from diepvries.field import Field
+from diepvries.hub import Hub
+from diepvries.link import Link
+from diepvries.table import DataVaultTable
+
+from .model_generator import (
+    EXTRACT_START_TIMESTAMP,
+    build_data_vault_load,
+    build_model,
+    build_show_columns_metadata,
+)
+
+pytest.importorskip("pytest_benchmark")
+
+# Pytest fixtures that depend on other fixtures defined in the same scope will
+# trigger Pylint (Redefined name from outer scope). While usually valid, this doesn't
+# make much sense in this case.
+# pylint: disable=redefined-outer-name
+
+# Shape of the benchmarked model: (number of hubs, descriptive fields per satellite).
+MODEL_SIZES = [(50, 10), (250, 50)]
+
+# Operators of the rendered load statements that shape their query plan, by name (as
+# stored in the `extra_info` of benchmark results).
+PLAN_OPERATORS = {
+    "merge": "MERGE INTO",
+    "insert": "INSERT INTO",
+    "select_distinct": "SELECT DISTINCT",
+    "window_function": " OVER (",
+    "group_by": "GROUP BY",
+    "anti_join": "NOT EXISTS",
+}
+
+
+class FakeCursor:
+    """Snowflake cursor that returns the same rows for every query."""
+
+    def __init__(self, rows: List[Dict[str, Any]]):
+        """Instantiate a FakeCursor.
+
+        Args:
+            rows: Query results.
+        """
+        self.rows = rows
+
+    def __enter__(self) -> "FakeCursor":
+        """Enter the cursor context.
+
+        Returns:
+            The cursor itself.
+        """
+        return self
+
+    def __exit__(self, *exc_info):
+        """Exit the cursor context.
+
+        Args:
+            exc_info: Exception raised in the context, if any.
+        """
+
+    def __iter__(self):
+        """Iterate over the query results.
+
+        Returns:
+            Iterator over the results.
+        """
+        return iter(self.rows)
+
+    def execute(self, sql: str):
+        """Execute a query (ignored).
+
+        Args:
+            sql: Query.
+        """
+
+
+class FakeConnection:
+    """Snowflake connection whose cursors return the same rows for every query."""
+
+    def __init__(self, rows: List[Dict[str, Any]]):
+        """Instantiate a FakeConnection.
+
+        Args:
+            rows: Query results.
+        """
+        self.rows = rows
+
+    def cursor(self, *_) -> FakeCursor:
+        """Create a cursor.
+
+        Returns:
+            Fake cursor.
+        """
+        return FakeCursor(self.rows)
+
+
+@pytest.fixture(scope="module", params=MODEL_SIZES, ids=lambda x: f"{x[0]}x{x[1]}")
+def model(request) -> List[DataVaultTable]:
+    """Build a synthetic model, with role playing hubs and effectivity satellites."""
+    hubs, satellite_columns = request.param
+    return build_model(
+        hubs,
+        satellite_columns=satellite_columns,
+        role_playing_hubs=hubs // 10,
+        effectivity_satellites=True,
+    )
+
+
+@pytest.fixture(scope="module")
+def data_vault_load(model: List[DataVaultTable]) -> DataVaultLoad:
+    """Build a DataVaultLoad that populates the synthetic model."""
+    return DataVaultLoad(
+        extract_schema="dv_extract",
+        extract_table="benchmark",
+        staging_schema="dv_stg",
+        staging_table="benchmark",
+        extract_start_timestamp=EXTRACT_START_TIMESTAMP,
+        target_tables=model,
+        source="benchmark",
+    )
+
+
+@pytest.fixture(scope="module")
+def fields(model: List[DataVaultTable]) -> List[Field]:
+    """Get all fields of the synthetic model."""
+    return [field for table in model for field in table.fields]
+
+
+def test_field_instantiation(benchmark, fields):
+    """Instantiate (and calculate the role of) every field of the model."""
+
+    def instantiate():
+        return [
+            Field(
+                parent_table_name=field.parent_table_name,
+                name=field.name,
+                data_type=field.data_type,
+                position=field.position,
+                is_mandatory=field.is_mandatory,
+                precision=field.precision,
+                scale=field.scale,
+                length=field.length,
+            ).role
+            for field in fields
+        ]
+
+    benchmark(instantiate)
+
+
+def test_fields_by_role(benchmark, model):
+    """Index the fields of every table of the model by role (cold index)."""
+
+    def reset_fields():
+        for table in model:
+            table.fields = table.fields
+
+    benchmark.pedantic(
+        lambda: [table.fields_by_role for table in model],
+        setup=reset_fields,
+        rounds=20,
+    )
+
+
+def test_staging_create_sql_statement(benchmark, model):
+    """Generate the staging DDL of the model (cold SQL artifacts)."""
+
+    def build_data_vault_load_from_scratch():
+        for table in model:
+            table.fields = table.fields
+        return (
+            DataVaultLoad(
+                extract_schema="dv_extract",
+                extract_table="benchmark",
+                staging_schema="dv_stg",
+                staging_table="benchmark",
+                extract_start_timestamp=EXTRACT_START_TIMESTAMP,
+                target_tables=model,
+                source="benchmark",
+            ),
+        ), {}
+
+    benchmark.pedantic(
+        lambda x: x.staging_create_sql_statement,
+        setup=build_data_vault_load_from_scratch,
+        rounds=20,
+    )
+
+
+def test_sql_load_scripts_by_group_cold(benchmark, data_vault_load):
+    """Generate the load script of the model (cold SQL artifacts)."""
+
+    def reset_fields():
+        for table in data_vault_load.target_tables:
+            table.fields = table.fields
+
+    benchmark.pedantic(
+        lambda: data_vault_load.sql_load_scripts_by_group,
+        setup=reset_fields,
+        rounds=20,
+    )
+
+
+def test_sql_load_scripts_by_group_warm(benchmark, data_vault_load):
+    """Generate the load script of the model (SQL artifacts already cached)."""
+    assert data_vault_load.sql_load_scripts_by_group
+    benchmark(lambda: data_vault_load.sql_load_scripts_by_group)
+
+
+def test_deserializer_fields(benchmark, model):
+    """Deserialize the fields of every table of the model, from a fake cursor."""
+    target_tables = [table.name for table in model]
+    connection = FakeConnection(build_show_columns_metadata(model))
+
+    def build_deserializer():
+        deserializer = SnowflakeDeserializer(
+            target_schema="dv",
+            target_tables=target_tables,
+            database_configuration=DatabaseConfiguration(
+                database="benchmark",
+                user="benchmark",
+                password="benchmark",
+                warehouse="benchmark",
+                account="benchmark",
+            ),
+            metadata_query_strategy=MetadataQueryStrategy.SCHEMA,
+        )
+        deserializer.database_connection = connection
+        return (deserializer,), {}
+
+    def deserialize(deserializer: SnowflakeDeserializer) -> Dict[str, List[Field]]:
+        return deserializer._fields  # pylint: disable=protected-access
+
+    fields = benchmark.pedantic(deserialize, setup=build_deserializer, rounds=5)
+    assert fields == {table.name: table.fields for table in model}
+
+
+def test_build_data_vault_load(benchmark):
+    """Build a 1,000-table model and generate its load script, from scratch."""
+    benchmark.pedantic(
+        lambda: list(build_data_vault_load(hubs=250).sql_load_script), rounds=5
+    )
+
+
+@pytest.mark.parametrize("insert_strategy", InsertStrategy, ids=lambda x: x.value)
+def test_hub_link_insert_strategy(benchmark, model, insert_strategy):
+    """Generate the hub and link load statements with each insert strategy.
+
+    Besides the generation time, the number of plan operators in the rendered
+    statements is stored in the benchmark results, to compare strategies.
+    """
+    tables = [table for table in model if isinstance(table, (Hub, Link))]
+
+    def set_insert_strategy():
+        for table in tables:
+            table.insert_strategy = insert_strategy
+
+    try:
+        statements = benchmark.pedantic(
+            lambda: [table.sql_load_statement for table in tables],
+            setup=set_insert_strategy,
+            rounds=20,
+        )
+    finally:
+        for table in tables:
+            table.insert_strategy = InsertStrategy.MERGE
+
+    benchmark.extra_info.update(
+        {
+            name: sum(statement.count(operator) for statement in statements)
+            for name, operator in PLAN_OPERATORS.items()
+        }
+    )
+    assert benchmark.extra_info["merge"] == (
+        len(tables) if insert_strategy == InsertStrategy.MERGE else 0
+    )
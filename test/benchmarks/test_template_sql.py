@@ -0,0 +1,93 @@
+"""Benchmarks for SQL template rendering."""
+
+from typing import Dict, List, Tuple
+
+import pytest
+
+from diepvries import TEMPLATES_DIR
+from diepvries.satellite import Satellite
+from diepvries.table import DataVaultTable
+from diepvries.template_sql import get_template
+
+from .model_generator import build_model
+
+pytest.importorskip("pytest_benchmark")
+
+# Pytest fixtures that depend on other fixtures defined in the same scope will
+# trigger Pylint (Redefined name from outer scope). While usually valid, this doesn't
+# make much sense in this case.
+# pylint: disable=redefined-outer-name
+
+# Placeholders calculated by the table pruning strategy (pre-scan in session
+# variables), that are not part of `sql_placeholders`.
+PRUNING_PLACEHOLDERS = {
+    "pruning_statements": "",
+    "pruning_ctes": "",
+    "pruning_columns": "",
+    "min_timestamp": "$min_timestamp",
+    "min_timestamp_bound": "$min_timestamp",
+    "min_timestamp_merge": "$min_timestamp",
+}
+
+
+@pytest.fixture(scope="module")
+def model_2000_tables() -> List[DataVaultTable]:
+    """Build a synthetic model holding 2,000 tables."""
+    return build_model(hubs=500)
+
+
+@pytest.fixture(scope="module")
+def rendering_inputs(
+    model_2000_tables: List[DataVaultTable],
+) -> List[Tuple[str, Dict[str, str]]]:
+    """Compute template names and placeholders for each table of the model.
+
+    Placeholders are computed upfront, so that benchmarks only measure template
+    loading and rendering.
+    """
+    inputs = []
+    for table in model_2000_tables:
+        sql_placeholders = {**table.sql_placeholders, **PRUNING_PLACEHOLDERS}
+        if isinstance(table, Satellite):
+            inputs.append(
+                (
+                    "satellite_dml.sql",
+                    {**sql_placeholders, "record_end_timestamp_expression": ""},
+                )
+            )
+        else:
+            inputs.append(("hub_link_dml.sql", sql_placeholders))
+    return inputs
+
+
+def test_render_reading_template_files(benchmark, rendering_inputs):
+    """Render all statements, reading the template file for each statement."""
+
+    def render():
+        return [
+            (TEMPLATES_DIR / template_name).read_text().format(**placeholders)
+            for template_name, placeholders in rendering_inputs
+        ]
+
+    benchmark(render)
+
+
+def test_render_template_registry(benchmark, rendering_inputs):
+    """Render all statements from the process-wide template registry."""
+
+    def render():
+        return [
+            get_template(template_name).render(**placeholders)
+            for template_name, placeholders in rendering_inputs
+        ]
+
+    assert render() == [
+        (TEMPLATES_DIR / template_name).read_text().format(**placeholders)
+        for template_name, placeholders in rendering_inputs
+    ]
+    benchmark(render)
+
+
+def test_sql_load_statements(benchmark, model_2000_tables):
+    """Generate the load statement of every table in a 2,000-table model."""
+    benchmark(lambda: [table.sql_load_statement for table in model_2000_tables])
@@ -1,5 +1,6 @@
 """Pytest fixtures."""
 
+import copy
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Dict, List
@@ -807,3 +808,27 @@ def data_vault_load(
     return DataVaultLoad(
         **data_vault_load_configuration, extract_start_timestamp=extract_start_timestamp
     )
+
+
+@pytest.fixture
+def data_vault_loads(data_vault_load: DataVaultLoad) -> List[DataVaultLoad]:
+    """Define three Data Vault loads that target the same tables.
+
+    Args:
+        data_vault_load: Data Vault load fixture value.
+
+    Returns:
+        Data Vault loads, each one with its own staging table and table instances.
+    """
+    return [
+        DataVaultLoad(
+            extract_schema=data_vault_load.extract_schema,
+            extract_table=f"{data_vault_load.extract_table}_{index}",
+            staging_schema=data_vault_load.staging_table.schema,
+            staging_table=f"orders_{index}",
+            extract_start_timestamp=data_vault_load.extract_start_timestamp,
+            target_tables=copy.deepcopy(data_vault_load.target_tables),
+            source=data_vault_load.source,
+        )
+        for index in range(3)
+    ]
@@ -0,0 +1,158 @@
+"""Unit tests for ModelCache."""
+
+import re
+import time
+from datetime import timedelta
+from pathlib import Path
+from typing import Dict, List
+from unittest import mock
+from unittest.mock import MagicMock, Mock
+
+from snowflake.connector.cursor import SnowflakeCursor
+
+from diepvries.deserializers.model_cache import ColumnMetadata, ModelCache
+from diepvries.deserializers.snowflake_deserializer import (
+    FINGERPRINT_SQL_FILE_PATH,
+    DatabaseConfiguration,
+    SnowflakeDeserializer,
+)
+from diepvries.field import Field
+
+# pylint: disable=protected-access
+
+
+def build_fingerprint_row(*values) -> Dict:
+    """Build the row returned by a DictCursor for the fingerprint query.
+
+    As in Snowflake, unquoted aliases are returned in uppercase.
+
+    Args:
+        values: Value of each column of the fingerprint query.
+
+    Returns:
+        Fingerprint row, indexed by column name.
+    """
+    aliases = re.findall(r'AS ("\w+"|\w+)', FINGERPRINT_SQL_FILE_PATH.read_text())
+    column_names = [
+        alias.strip('"') if alias.startswith('"') else alias.upper()
+        for alias in aliases
+    ]
+    return dict(zip(column_names, values))
+
+
+def test_model_cache(tmp_path: Path):
+    """Test `ModelCache` load, save and invalidation."""
+    model_cache = ModelCache(tmp_path / "cache")
+    columns = {
+        "h_customer": [
+            ColumnMetadata("h_customer_hashkey", "TEXT", True, length=32),
+            ColumnMetadata("customer_id", "NUMBER", False, precision=38, scale=0),
+        ]
+    }
+
+    assert model_cache.load("some_db", "dv") is None
+
+    model_cache.save("some_db", "dv", columns, fingerprint="1:2022")
+    assert model_cache.get_path("SOME_DB", "DV").exists()
+    assert model_cache.load("some_db", "dv") == columns
+    assert model_cache.load("some_db", "dv", fingerprint="1:2022") == columns
+    assert model_cache.load("some_db", "dv", fingerprint="2:2022") is None
+    assert model_cache.load("some_db", "other_schema") is None
+
+    model_cache.invalidate("some_db", "dv")
+    assert model_cache.load("some_db", "dv") is None
+
+
+def test_model_cache_ttl(tmp_path: Path):
+    """Test that expired models are not loaded."""
+    model_cache = ModelCache(tmp_path, ttl=timedelta(hours=1))
+    columns = {"h_customer": [ColumnMetadata("customer_id", "TEXT", True)]}
+    model_cache.save("some_db", "dv", columns)
+
+    assert model_cache.load("some_db", "dv") == columns
+    with mock.patch("time.time", return_value=time.time() + 3601):
+        assert model_cache.load("some_db", "dv") is None
+
+
+def test_model_cache_invalid_file(tmp_path: Path):
+    """Test that unreadable cache files are ignored."""
+    model_cache = ModelCache(tmp_path)
+    model_cache.get_path("some_db", "dv").write_text("{not json")
+
+    assert model_cache.load("some_db", "dv") is None
+
+
+def test_deserializer_model_cache(
+    tmp_path: Path,
+    snowflake_deserializer: SnowflakeDeserializer,
+    database_configuration: DatabaseConfiguration,
+    fields_metadata: List[Dict[str, str]],
+    fields: Dict[str, List[Field]],
+):
+    """Test that a cached model is deserialized without accessing the database."""
+    model_cache = ModelCache(tmp_path)
+
+    # First deserialization: model is fetched from the database and cached.
+    snowflake_deserializer.model_cache = model_cache
+    cursor = snowflake_deserializer.database_connection.cursor
+    cursor.return_value = MagicMock(SnowflakeCursor)
+    cursor.return_value.__enter__().__iter__.return_value = iter(fields_metadata)
+    assert snowflake_deserializer._fields == fields
+    assert model_cache.get_path(database_configuration.database, "dv").exists()
+
+    # Second deserialization: model is loaded from the cache.
+    with mock.patch(
+        "diepvries.deserializers.snowflake_deserializer.connect", Mock()
+    ) as connect:
+        cached_deserializer = SnowflakeDeserializer(
+            target_schema=snowflake_deserializer.target_schema,
+            target_tables=snowflake_deserializer.target_tables,
+            database_configuration=database_configuration,
+            driving_keys=snowflake_deserializer.driving_keys,
+            role_playing_hubs=snowflake_deserializer.role_playing_hubs,
+            model_cache=model_cache,
+        )
+        assert cached_deserializer._fields == fields
+        assert len(cached_deserializer.deserialized_target_tables) == len(
+            snowflake_deserializer.target_tables
+        )
+        connect.assert_not_called()
+
+
+def test_deserializer_model_cache_refresh(
+    tmp_path: Path,
+    snowflake_deserializer: SnowflakeDeserializer,
+    fields_metadata: List[Dict[str, str]],
+    fields: Dict[str, List[Field]],
+):
+    """Test that the cache is refreshed on request, or when the fingerprint changes."""
+    model_cache = ModelCache(tmp_path)
+    model_cache.save(
+        snowflake_deserializer.target_database,
+        snowflake_deserializer.target_schema,
+        {"h_customer": [ColumnMetadata("outdated", "TEXT", True)]},
+        fingerprint="8:123",
+    )
+    snowflake_deserializer.model_cache = model_cache
+    snowflake_deserializer.check_model_fingerprint = True
+
+    cursor = snowflake_deserializer.database_connection.cursor
+    cursor.return_value = MagicMock(SnowflakeCursor)
+    cursor.return_value.__enter__().__iter__.side_effect = [
+        iter([build_fingerprint_row(96, 456)]),
+        iter(fields_metadata),
+    ]
+
+    assert snowflake_deserializer._fields == fields
+    assert model_cache.load(
+        snowflake_deserializer.target_database,
+        snowflake_deserializer.target_schema,
+        fingerprint="96:456",
+    )
+
+    # Explicit refresh ignores the cached model, even if it is up to date.
+    snowflake_deserializer.check_model_fingerprint = False
+    snowflake_deserializer.refresh_model_cache = True
+    del snowflake_deserializer._fields
+    cursor.return_value.__enter__().__iter__.side_effect = [iter(fields_metadata)]
+    assert snowflake_deserializer._fields == fields
@@ -1,5 +1,6 @@
 """Unit tests for SnowflakeDeserializer."""
 
+import json
 from typing import Dict, List
 from unittest import mock
 from unittest.mock import MagicMock, PropertyMock
@@ -7,7 +8,10 @@ from unittest.mock import MagicMock, PropertyMock
 import pytest
 from snowflake.connector.cursor import SnowflakeCursor
 
-from diepvries.deserializers.snowflake_deserializer import SnowflakeDeserializer
+from diepvries.deserializers.snowflake_deserializer import (
+    MetadataQueryStrategy,
+    SnowflakeDeserializer,
+)
 from diepvries.driving_key_field import DrivingKeyField
 from diepvries.effectivity_satellite import EffectivitySatellite
 from diepvries.field import Field
@@ -124,6 +128,8 @@ def test_fields(
     the `SnowflakeCursor` object is mocked and its results manipulated to match the
     result returned by Snowflake `SHOW COLUMNS` command.
     """
+    snowflake_deserializer.metadata_query_strategy = MetadataQueryStrategy.SCHEMA
+
     # Mock `SnowflakeCursor` object and manipulate its results to match the model
     # metadata stored in `model_metadata.json`.
     cursor = snowflake_deserializer.database_connection.cursor
@@ -142,6 +148,153 @@ def test_fields(
         assert table_fields == fields[table_name]
 
 
+class FakeMetadataCursor:
+    """Snowflake cursor that answers metadata queries from `model_metadata.json`.
+
+    `SHOW COLUMNS IN TABLE` results are filtered by table, and INFORMATION_SCHEMA
+    results are converted from the `SHOW COLUMNS` results.
+    """
+
+    def __init__(self, fields_metadata: List[Dict[str, str]], executed: List[str]):
+        """Instantiate a FakeMetadataCursor.
+
+        Args:
+            fields_metadata: Results of the `SHOW COLUMNS IN SCHEMA` command.
+            executed: Log of executed queries.
+        """
+        self.fields_metadata = fields_metadata
+        self.executed = executed
+        self.results = []
+
+    def __enter__(self) -> "FakeMetadataCursor":
+        """Enter the cursor context.
+
+        Returns:
+            The cursor itself.
+        """
+        return self
+
+    def __exit__(self, *exc_info):
+        """Exit the cursor context.
+
+        Args:
+            exc_info: Exception raised in the context, if any.
+        """
+
+    def __iter__(self):
+        """Iterate over the results of the last query.
+
+        Returns:
+            Iterator over the results.
+        """
+        return iter(self.results)
+
+    def execute(self, sql: str):
+        """Execute a metadata query.
+
+        Args:
+            sql: Metadata query.
+        """
+        self.executed.append(sql)
+        if "SHOW COLUMNS IN TABLE" in sql:
+            table_name = sql.split(".")[-1].strip().rstrip(";").upper()
+            self.results = [
+                row for row in self.fields_metadata if row["table_name"] == table_name
+            ]
+        elif "information_schema.columns" in sql:
+            self.results = [
+                self._to_information_schema(row)
+                for row in self.fields_metadata
+                if f"'{row['table_name']}'" in sql
+            ]
+
+    @staticmethod
+    def _to_information_schema(row: Dict[str, str]) -> Dict[str, str]:
+        """Convert a `SHOW COLUMNS` result to an INFORMATION_SCHEMA.COLUMNS result.
+
+        Args:
+            row: `SHOW COLUMNS` result.
+
+        Returns:
+            INFORMATION_SCHEMA.COLUMNS result.
+        """
+        data_type = json.loads(row["data_type"])
+        return {
+            "table_name": row["table_name"],
+            "column_name": row["column_name"],
+            "data_type": {"FIXED": "NUMBER", "REAL": "FLOAT"}.get(
+                data_type["type"], data_type["type"]
+            ),
+            "is_nullable": "YES" if data_type["nullable"] else "NO",
+            "character_maximum_length": data_type.get("length"),
+            "numeric_precision": (
+                data_type.get("precision") if data_type["type"] == "FIXED" else None
+            ),
+            "numeric_scale": (
+                data_type.get("scale") if data_type["type"] == "FIXED" else None
+            ),
+            "datetime_precision": (
+                data_type.get("scale") if data_type["type"].startswith("TIME") else None
+            ),
+        }
+
+
+@pytest.mark.parametrize(
+    "strategy, expected_queries",
+    [
+        (MetadataQueryStrategy.SHOW_COLUMNS_IN_TABLE, 8),
+        (MetadataQueryStrategy.INFORMATION_SCHEMA, 1),
+        (MetadataQueryStrategy.AUTO, 8),
+    ],
+)
+def test_fields_table_scoped(
+    snowflake_deserializer: SnowflakeDeserializer,
+    fields_metadata: List[Dict[str, str]],
+    fields: Dict[str, List[Field]],
+    strategy: MetadataQueryStrategy,
+    expected_queries: int,
+):
+    """Test `SnowflakeDeserializer._fields` with table-scoped metadata queries.
+
+    The fields must be the same as the ones deserialized from `SHOW COLUMNS IN SCHEMA`.
+    """
+    executed = []
+    snowflake_deserializer.database_connection.cursor.side_effect = (
+        lambda *_: FakeMetadataCursor(fields_metadata, executed)
+    )
+    snowflake_deserializer.metadata_query_strategy = strategy
+    calculated_fields = snowflake_deserializer._fields
+
+    assert len(executed) == expected_queries
+    assert all("IN SCHEMA" not in sql for sql in executed)
+    assert calculated_fields == fields
+
+    # Column metadata (data type, precision, scale, etc.) matches `SHOW COLUMNS`.
+    assert snowflake_deserializer._fetch_model_columns(
+        fields.keys()
+    ) == SnowflakeDeserializer._parse_show_columns(fields_metadata, fields.keys())
+
+
+def test_fetch_table_columns(
+    snowflake_deserializer: SnowflakeDeserializer,
+    fields_metadata: List[Dict[str, str]],
+):
+    """Test `SnowflakeDeserializer.fetch_table_columns`, used for extraction tables."""
+    executed = []
+    snowflake_deserializer.database_connection.cursor.side_effect = (
+        lambda *_: FakeMetadataCursor(fields_metadata, executed)
+    )
+    columns = snowflake_deserializer.fetch_table_columns("HS_CUSTOMER", "dv_extract")
+
+    assert len(executed) == 1
+    assert ".dv_extract.HS_CUSTOMER" in executed[0]
+    assert (
+        columns
+        == SnowflakeDeserializer._parse_show_columns(fields_metadata)["hs_customer"]
+    )
+    assert columns[0].name == "h_customer_hashkey"
+
+
 def test_get_table_type(snowflake_deserializer: SnowflakeDeserializer):
     """Test `SnowflakeDeserializer._get_table_type` method."""
     # Check that all table types are properly calculated.
@@ -0,0 +1,124 @@
+"""Fake DB-API 2.0 driver, used to test the execution of Data Vault loads."""
+
+import threading
+import time
+from typing import List, Optional, Sequence, Tuple
+
+
+class FakeCursor:
+    """DB-API cursor that records executed statements."""
+
+    def __init__(self, connection: "FakeConnection"):
+        """Instantiate a FakeCursor.
+
+        Args:
+            connection: Connection that created the cursor.
+        """
+        self.connection = connection
+        self.rowcount = -1
+        self._rows: List[Tuple] = []
+
+    def execute(self, statement: str):
+        """Record statement, failing if it matches the connection's failure marker.
+
+        Statements that contain one of the connection's empty markers return no rows.
+
+        Args:
+            statement: SQL statement.
+
+        Raises:
+            RuntimeError: If the statement contains the failure marker.
+        """
+        with self.connection.lock:
+            self.connection.executed.append((threading.get_ident(), statement))
+        time.sleep(self.connection.delay)
+        if self.connection.fail_on and self.connection.fail_on in statement:
+            raise RuntimeError(f"Statement failed: {self.connection.fail_on}")
+        empty = any(marker in statement for marker in self.connection.empty_on)
+        self._rows = [] if empty else [(1,)]
+        # As in many drivers, the row count of queries is unknown.
+        self.rowcount = -1 if statement.startswith("SELECT") else len(self._rows)
+
+    def fetchone(self) -> Optional[Tuple]:
+        """Fetch the next row of the last statement.
+
+        Returns:
+            Row, or None if there are no rows left.
+        """
+        return self._rows.pop(0) if self._rows else None
+
+    def close(self):
+        """Close cursor."""
+
+
+class FakeConnection:
+    """DB-API connection that shares its statement log with other connections."""
+
+    def __init__(
+        self,
+        executed: List,
+        lock: threading.Lock,
+        fail_on,
+        delay,
+        empty_on: Sequence[str] = (),
+    ):  # pylint: disable=too-many-arguments
+        """Instantiate a FakeConnection.
+
+        Args:
+            executed: Shared log of (thread, statement) executions.
+            lock: Lock that protects the shared log.
+            fail_on: Statements containing this string fail.
+            delay: Seconds to wait on each execution.
+            empty_on: Statements containing one of these strings return no rows.
+        """
+        self.executed = executed
+        self.lock = lock
+        self.fail_on = fail_on
+        self.delay = delay
+        self.empty_on = empty_on
+        self.closed = False
+
+    def cursor(self) -> FakeCursor:
+        """Create a cursor.
+
+        Returns:
+            New cursor.
+        """
+        return FakeCursor(self)
+
+    def close(self):
+        """Close connection."""
+        self.closed = True
+
+
+class FakeConnectionFactory:  # pylint: disable=too-few-public-methods
+    """Callable that creates FakeConnection objects."""
+
+    def __init__(
+        self, fail_on: str = None, delay: float = 0, empty_on: Sequence[str] = ()
+    ):
+        """Instantiate a FakeConnectionFactory.
+
+        Args:
+            fail_on: Statements containing this string fail.
+            delay: Seconds to wait on each execution.
+            empty_on: Statements containing one of these strings return no rows.
+        """
+        self.executed = []
+        self.connections = []
+        self.lock = threading.Lock()
+        self.fail_on = fail_on
+        self.delay = delay
+        self.empty_on = empty_on
+
+    def __call__(self) -> FakeConnection:
+        """Create a connection.
+
+        Returns:
+            New connection.
+        """
+        connection = FakeConnection(
+            self.executed, self.lock, self.fail_on, self.delay, self.empty_on
+        )
+        self.connections.append(connection)
+        return connection
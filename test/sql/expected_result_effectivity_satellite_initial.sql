@@ -0,0 +1,30 @@
+-- Initial load: the target table is empty, so all staged versions are inserted, and
+-- end dated by the next version of the same driving key (if any).
+INSERT INTO dv.ls_order_customer_eff (l_order_customer_hashkey, s_hashdiff, r_timestamp, r_timestamp_end, r_source, dummy_descriptive_field)
+  WITH
+    staging_versions AS (
+    SELECT DISTINCT
+      staging.h_customer_hashkey,
+      staging.l_order_customer_hashkey,
+      staging.ls_order_customer_eff_hashdiff,
+      staging.r_timestamp,
+      staging.r_source
+      , staging.dummy_descriptive_field
+    FROM dv_stg.orders_20190806_000000 AS staging
+                        ),
+    -- Consecutive versions of a driving key with the same hashdiff are collapsed into
+    -- the earliest one.
+    staging_version_changes AS (
+    SELECT *
+    FROM staging_versions
+    QUALIFY LAG(ls_order_customer_eff_hashdiff) OVER (PARTITION BY h_customer_hashkey ORDER BY r_timestamp)
+              IS DISTINCT FROM ls_order_customer_eff_hashdiff
+                               )
+  SELECT
+    l_order_customer_hashkey,
+    ls_order_customer_eff_hashdiff,
+    r_timestamp,
+    LEAD(DATEADD(milliseconds, - 1, r_timestamp), 1, CAST('9999-12-31T00:00:00.000000Z' AS TIMESTAMP)) OVER (PARTITION BY h_customer_hashkey ORDER BY r_timestamp) AS r_timestamp_end,
+    r_source
+    , dummy_descriptive_field
+  FROM staging_version_changes;
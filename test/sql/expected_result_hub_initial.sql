@@ -0,0 +1,22 @@
+-- Initial load: the target table is expected to be empty, so it is neither pruned
+-- nor merged. Hashkeys inserted by a concurrent load are still skipped.
+INSERT INTO dv.h_customer (h_customer_hashkey, r_timestamp, r_source, customer_id)
+  SELECT
+    staging.h_customer_hashkey, staging.r_timestamp, staging.r_source, staging.customer_id
+  FROM (
+       SELECT
+         h_customer_hashkey,
+         -- If multiple sources for the same hashkey are received, their values
+         -- are concatenated using a comma.
+         LISTAGG(DISTINCT r_source, ',')
+                 WITHIN GROUP (ORDER BY r_source) AS r_source,
+         r_timestamp, customer_id
+       FROM dv_stg.orders_20190806_000000
+       GROUP BY h_customer_hashkey, r_timestamp, customer_id
+       ) AS staging
+  WHERE NOT EXISTS (
+                   SELECT
+                     1
+                   FROM dv.h_customer AS target
+                   WHERE target.h_customer_hashkey = staging.h_customer_hashkey
+                   );
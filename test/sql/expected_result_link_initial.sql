@@ -0,0 +1,22 @@
+-- Initial load: the target table is expected to be empty, so it is neither pruned
+-- nor merged. Hashkeys inserted by a concurrent load are still skipped.
+INSERT INTO dv.l_order_customer (l_order_customer_hashkey, h_order_hashkey, h_customer_hashkey, order_id, customer_id, ck_test_string, ck_test_timestamp, r_timestamp, r_source)
+  SELECT
+    staging.l_order_customer_hashkey, staging.h_order_hashkey, staging.h_customer_hashkey, staging.order_id, staging.customer_id, staging.ck_test_string, staging.ck_test_timestamp, staging.r_timestamp, staging.r_source
+  FROM (
+       SELECT
+         l_order_customer_hashkey,
+         -- If multiple sources for the same hashkey are received, their values
+         -- are concatenated using a comma.
+         LISTAGG(DISTINCT r_source, ',')
+                 WITHIN GROUP (ORDER BY r_source) AS r_source,
+         h_order_hashkey, h_customer_hashkey, order_id, customer_id, ck_test_string, ck_test_timestamp, r_timestamp
+       FROM dv_stg.orders_20190806_000000
+       GROUP BY l_order_customer_hashkey, h_order_hashkey, h_customer_hashkey, order_id, customer_id, ck_test_string, ck_test_timestamp, r_timestamp
+       ) AS staging
+  WHERE NOT EXISTS (
+                   SELECT
+                     1
+                   FROM dv.l_order_customer AS target
+                   WHERE target.l_order_customer_hashkey = staging.l_order_customer_hashkey
+                   );
@@ -0,0 +1,29 @@
+-- Initial load: the target table is empty, so all staged versions are inserted, and
+-- end dated by the next version of the same hashkey (if any).
+INSERT INTO dv.hs_customer (h_customer_hashkey, s_hashdiff, r_timestamp, r_timestamp_end, r_source, test_string, test_date, test_timestamp_ntz, test_integer, test_decimal, x_customer_id, grouping_key, test_geography, test_array, test_object, test_variant, test_timestamp_tz, test_timestamp_ltz, test_time, test_boolean, test_real)
+  WITH
+    staging_versions AS (
+    SELECT DISTINCT
+      staging.h_customer_hashkey,
+      staging.hs_customer_hashdiff,
+      staging.r_timestamp,
+      staging.r_source
+      , staging.test_string, staging.test_date, staging.test_timestamp_ntz, staging.test_integer, staging.test_decimal, staging.x_customer_id, staging.grouping_key, staging.test_geography, staging.test_array, staging.test_object, staging.test_variant, staging.test_timestamp_tz, staging.test_timestamp_ltz, staging.test_time, staging.test_boolean, staging.test_real
+    FROM dv_stg.orders_20190806_000000 AS staging
+                        ),
+    -- Consecutive versions with the same hashdiff are collapsed into the earliest one
+    -- (a hashkey only has multiple staged versions when backfilling).
+    staging_version_changes AS (
+    SELECT *
+    FROM staging_versions
+    QUALIFY LAG(hs_customer_hashdiff) OVER (PARTITION BY h_customer_hashkey ORDER BY r_timestamp)
+              IS DISTINCT FROM hs_customer_hashdiff
+                               )
+  SELECT
+    h_customer_hashkey,
+    hs_customer_hashdiff,
+    r_timestamp,
+    LEAD(DATEADD(milliseconds, - 1, r_timestamp), 1, CAST('9999-12-31T00:00:00.000000Z' AS TIMESTAMP)) OVER (PARTITION BY h_customer_hashkey ORDER BY r_timestamp) AS r_timestamp_end,
+    r_source
+    , test_string, test_date, test_timestamp_ntz, test_integer, test_decimal, x_customer_id, grouping_key, test_geography, test_array, test_object, test_variant, test_timestamp_tz, test_timestamp_ltz, test_time, test_boolean, test_real
+  FROM staging_version_changes;
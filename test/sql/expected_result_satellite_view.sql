@@ -0,0 +1,9 @@
+CREATE OR REPLACE VIEW dv.hs_customer_view AS
+  SELECT
+    h_customer_hashkey,
+    s_hashdiff,
+    r_timestamp,
+    LEAD(DATEADD(milliseconds, - 1, r_timestamp), 1, CAST('9999-12-31T00:00:00.000000Z' AS TIMESTAMP)) OVER (PARTITION BY h_customer_hashkey ORDER BY r_timestamp) AS r_timestamp_end,
+    r_source
+    , test_string, test_date, test_timestamp_ntz, test_integer, test_decimal, x_customer_id, grouping_key, test_geography, test_array, test_object, test_variant, test_timestamp_tz, test_timestamp_ltz, test_time, test_boolean, test_real
+  FROM dv.hs_customer;
@@ -1,13 +1,29 @@
 """Unit tests for Data Vault load."""
 
+import copy
 from pathlib import Path
+from typing import Optional
 
-from diepvries.data_vault_load import DataVaultLoad
+import pytest
+
+from diepvries import (
+    FieldDataType,
+    FieldRole,
+    HashdiffFormula,
+    InitialLoadMode,
+    SatelliteLoadMode,
+    StagingMode,
+    StagingTableType,
+)
+from diepvries.data_vault_load import DataVaultLoad, _is_cast_redundant
+from diepvries.deserializers.model_cache import ColumnMetadata
 from diepvries.effectivity_satellite import EffectivitySatellite
+from diepvries.field import Field
 from diepvries.hub import Hub
 from diepvries.link import Link
 from diepvries.role_playing_hub import RolePlayingHub
 from diepvries.satellite import Satellite
+from diepvries.table import StagingTableOptions
 
 
 def test_staging_table_sql(test_path: Path, data_vault_load: DataVaultLoad):
@@ -70,3 +86,481 @@ def test_data_vault_load_sql_by_group(
     assert groups[3][0] == hs_customer.sql_load_statement
     assert groups[3][1] == ls_order_customer_eff.sql_load_statement
     assert groups[3][2] == ls_order_customer_role_playing_eff.sql_load_statement
+
+
+def build_data_vault_load(
+    data_vault_load: DataVaultLoad, staging_mode: StagingMode, **kwargs
+) -> DataVaultLoad:
+    """Build a copy of a Data Vault load, with another staging mode.
+
+    Args:
+        data_vault_load: Data Vault load to copy.
+        staging_mode: Staging mode of the copy.
+        kwargs: Other DataVaultLoad arguments.
+
+    Returns:
+        Copy of the Data Vault load, with its own table instances.
+    """
+    return DataVaultLoad(
+        extract_schema=data_vault_load.extract_schema,
+        extract_table=data_vault_load.extract_table,
+        staging_schema=data_vault_load.staging_table.schema,
+        staging_table="orders",
+        extract_start_timestamp=data_vault_load.extract_start_timestamp,
+        target_tables=copy.deepcopy(data_vault_load.target_tables),
+        source=data_vault_load.source,
+        staging_mode=staging_mode,
+        **kwargs,
+    )
+
+
+def test_data_vault_load_sql_inline_staging(data_vault_load: DataVaultLoad):
+    """Assert that inlined staging queries replace the staging table.
+
+    Args:
+        data_vault_load: Data vault load fixture value.
+    """
+    inline_data_vault_load = build_data_vault_load(
+        data_vault_load, staging_mode=StagingMode.INLINE
+    )
+    staging_query = data_vault_load.staging_create_sql_statement
+    staging_fields = ", ".join(
+        f"CAST({field.name_in_staging} AS {field.data_type_sql}) "
+        f"AS {field.name_in_staging}"
+        for field in data_vault_load.staging_fields
+    )
+    staging_select = staging_query[staging_query.index("SELECT ") : -2].replace(
+        "\n  FROM", " FROM"
+    )
+    inline_sql = f"(SELECT {staging_fields} FROM ({staging_select}))"
+
+    groups = inline_data_vault_load.sql_load_scripts_by_group
+
+    assert inline_data_vault_load.uses_inline_staging
+    assert inline_data_vault_load.staging_table.relation == inline_sql
+    assert [len(group) for group in groups] == [3, 2, 3]
+    assert groups == [
+        [
+            statement.replace("dv_stg.orders_20190806_000000", inline_sql)
+            for statement in group
+        ]
+        for group in data_vault_load.sql_load_scripts_by_group[1:]
+    ]
+
+
+@pytest.mark.parametrize(
+    ("staging_mode", "extract_row_count", "uses_inline_staging"),
+    [
+        (StagingMode.TABLE, 1, False),
+        (StagingMode.INLINE, None, True),
+        (StagingMode.AUTO, None, False),
+        (StagingMode.AUTO, 100, True),
+        (StagingMode.AUTO, 101, False),
+    ],
+)
+def test_uses_inline_staging(
+    data_vault_load: DataVaultLoad,
+    staging_mode: StagingMode,
+    extract_row_count: Optional[int],
+    uses_inline_staging: bool,
+):
+    """Assert when the staging query is inlined.
+
+    Args:
+        data_vault_load: Data vault load fixture value.
+        staging_mode: Staging mode.
+        extract_row_count: Number of extracted rows.
+        uses_inline_staging: Expected result.
+    """
+    data_vault_load = build_data_vault_load(
+        data_vault_load,
+        staging_mode=staging_mode,
+        extract_row_count=extract_row_count,
+        inline_staging_max_rows=100,
+    )
+
+    assert data_vault_load.uses_inline_staging == uses_inline_staging
+    assert len(data_vault_load.sql_load_scripts_by_group) == (
+        3 if uses_inline_staging else 4
+    )
+
+
+def test_staging_table_options(data_vault_load: DataVaultLoad):
+    """Assert the staging DDL and drop of a short-lived staging table.
+
+    Args:
+        data_vault_load: Data vault load fixture value.
+    """
+    transient_data_vault_load = build_data_vault_load(
+        data_vault_load,
+        staging_mode=StagingMode.TABLE,
+        staging_table_options=StagingTableOptions(
+            table_type=StagingTableType.TRANSIENT,
+            data_retention_time_in_days=0,
+            order_by_hashkey=True,
+            drop_after_load=True,
+        ),
+    )
+    staging_query = data_vault_load.staging_create_sql_statement
+    drop_sql = "DROP TABLE IF EXISTS dv_stg.orders_20190806_000000;\n"
+
+    assert transient_data_vault_load.staging_create_sql_statement == (
+        staging_query.replace(
+            "CREATE OR REPLACE TABLE", "CREATE OR REPLACE TRANSIENT TABLE"
+        )
+        .replace(") AS\n", ") DATA_RETENTION_TIME_IN_DAYS = 0 AS\n", 1)
+        .replace(";\n", "\n  ORDER BY h_customer_hashkey;\n")
+    )
+    assert data_vault_load.staging_drop_sql_statement is None
+    assert transient_data_vault_load.staging_drop_sql_statement == drop_sql
+    groups = transient_data_vault_load.sql_load_scripts_by_group
+    assert groups[-1] == [drop_sql]
+    assert groups[1:-1] == data_vault_load.sql_load_scripts_by_group[1:]
+
+
+@pytest.mark.parametrize("staging_mode", [StagingMode.TABLE, StagingMode.INLINE])
+def test_staging_shared_hash_inputs(
+    data_vault_load: DataVaultLoad, staging_mode: StagingMode
+):
+    """Assert that each hash input is calculated once, in an inner projection.
+
+    Args:
+        data_vault_load: Data vault load fixture value.
+        staging_mode: Staging mode of the Data Vault load.
+    """
+    default_data_vault_load = build_data_vault_load(
+        data_vault_load, staging_mode=staging_mode
+    )
+    shared_data_vault_load = build_data_vault_load(
+        data_vault_load,
+        staging_mode=staging_mode,
+        staging_table_options=StagingTableOptions(share_hash_inputs=True),
+    )
+    if staging_mode == StagingMode.TABLE:
+        default_sql = default_data_vault_load.staging_create_sql_statement
+        shared_sql = shared_data_vault_load.staging_create_sql_statement
+    else:
+        default_sql = default_data_vault_load.staging_table.relation
+        shared_sql = shared_data_vault_load.staging_table.relation
+
+    hash_inputs = shared_data_vault_load._hash_inputs
+    hash_inputs_sql = ", ".join(
+        f"{expression} AS {column}" for expression, column in hash_inputs.items()
+    )
+    extract_relation = f"(SELECT *, {hash_inputs_sql} FROM dv_extract.extract_orders)"
+
+    # Business keys shared by the hub, link and satellites are only converted once.
+    assert len(hash_inputs) < sum(
+        len(table.hashdiff_fields)
+        for table in shared_data_vault_load.target_tables
+        if isinstance(table, Satellite)
+    )
+    assert shared_sql.count(extract_relation) == 1
+    # Replacing each column by its expression gives the original staging query.
+    shared_sql = shared_sql.replace(extract_relation, "dv_extract.extract_orders")
+    for expression, column in reversed(hash_inputs.items()):
+        assert column in shared_sql
+        shared_sql = shared_sql.replace(column, expression)
+    assert shared_sql == default_sql
+
+
+@pytest.mark.parametrize("share_hash_inputs", [False, True])
+def test_staging_hashdiff_inputs(data_vault_load: DataVaultLoad, share_hash_inputs):
+    """Assert that repeated hashdiff concatenations are calculated once per row.
+
+    Args:
+        data_vault_load: Data vault load fixture value.
+        share_hash_inputs: Whether hash inputs are shared.
+    """
+    data_vault_load = build_data_vault_load(
+        data_vault_load,
+        staging_mode=StagingMode.TABLE,
+        staging_table_options=StagingTableOptions(share_hash_inputs=share_hash_inputs),
+    )
+    satellite = data_vault_load._get_target_table("hs_customer")
+    satellite.hashdiff_formula = HashdiffFormula.STRUCTURAL_COMPATIBLE
+    staging_sql = data_vault_load.staging_create_sql_statement
+
+    concatenation = satellite.get_hashdiff_concatenation_sql(
+        data_vault_load._hash_inputs
+    )
+    assert staging_sql.count(concatenation) == 1
+    assert f"{concatenation} AS _hashdiff_input_hs_customer FROM" in staging_sql
+    assert (
+        satellite.get_hashdiff_sql(hashdiff_input="_hashdiff_input_hs_customer")
+        in staging_sql
+    )
+    # Other satellites still calculate their hashdiff from the fields.
+    assert "_hashdiff_input_ls_order_customer_eff" not in staging_sql
+
+
+def test_staging_extract_columns(data_vault_load: DataVaultLoad):
+    """Assert that casts and COALESCEs are skipped when they do not change values.
+
+    Args:
+        data_vault_load: Data vault load fixture value.
+    """
+    staged_fields = [
+        field
+        for field in data_vault_load.staging_fields
+        if field.role
+        in (FieldRole.BUSINESS_KEY, FieldRole.CHILD_KEY, FieldRole.DESCRIPTIVE)
+    ]
+    extract_columns = [
+        ColumnMetadata(
+            name=field.name.upper(),
+            data_type=field.data_type.value,
+            is_mandatory=True,
+            precision=field.precision,
+            scale=field.scale,
+            length=field.length,
+        )
+        for field in staged_fields
+    ]
+    extract_data_vault_load = build_data_vault_load(
+        data_vault_load,
+        staging_mode=StagingMode.TABLE,
+        extract_columns=extract_columns,
+    )
+
+    expected_sql = data_vault_load.staging_create_sql_statement
+    for field in staged_fields:
+        expected_sql = expected_sql.replace(
+            field.hash_concatenation_sql,
+            field.get_hash_concatenation_sql(cast=False, coalesce=False),
+        )
+        if field.role == FieldRole.BUSINESS_KEY:
+            expected_sql = expected_sql.replace(
+                f"COALESCE({field.name}, 'dv_unknown') AS {field.name}", field.name
+            )
+
+    assert "COALESCE(CAST(" not in expected_sql
+    assert extract_data_vault_load.staging_create_sql_statement == expected_sql
+
+    # Inlined staging queries do not cast extracted fields either.
+    inline_relation = build_data_vault_load(
+        data_vault_load,
+        staging_mode=StagingMode.INLINE,
+        extract_columns=extract_columns,
+    ).staging_table.relation
+    for field in staged_fields:
+        assert (
+            f"CAST({field.name} AS {field.data_type_sql}) AS {field.name}"
+            not in inline_relation
+        )
+    assert "CAST(h_customer_hashkey AS TEXT (32))" in inline_relation
+
+
+@pytest.mark.parametrize(
+    ("column", "is_cast_redundant"),
+    [
+        (ColumnMetadata("test", "NUMBER", False, 38, 2), True),
+        (ColumnMetadata("test", "NUMBER", False, 10, 2), True),
+        (ColumnMetadata("test", "NUMBER", False, 38, 0), False),
+        (ColumnMetadata("test", "REAL", False), False),
+        (ColumnMetadata("test", "TEXT", False, length=10), False),
+    ],
+)
+def test_is_cast_redundant(column: ColumnMetadata, is_cast_redundant: bool):
+    """Assert that casts are only skipped when all values are unchanged.
+
+    Args:
+        column: Extraction table column.
+        is_cast_redundant: Expected result.
+    """
+    field = Field(
+        parent_table_name="hs_customer",
+        name="test",
+        data_type=FieldDataType.NUMBER,
+        position=3,
+        is_mandatory=False,
+        precision=38,
+        scale=2,
+    )
+    assert _is_cast_redundant(field, column) == is_cast_redundant
+
+
+@pytest.mark.parametrize(
+    ("field_length", "column_length", "is_cast_redundant"),
+    [(None, 10, True), (10, 10, True), (10, 20, False), (10, None, False)],
+)
+def test_is_cast_redundant_text(
+    field_length: Optional[int], column_length: Optional[int], is_cast_redundant: bool
+):
+    """Assert that text casts are only skipped when values fit the field length.
+
+    Args:
+        field_length: Length of the field.
+        column_length: Length of the extraction table column.
+        is_cast_redundant: Expected result.
+    """
+    field = Field(
+        parent_table_name="hs_customer",
+        name="test",
+        data_type=FieldDataType.TEXT,
+        position=3,
+        is_mandatory=False,
+        length=field_length,
+    )
+    column = ColumnMetadata("test", "TEXT", False, length=column_length)
+    assert _is_cast_redundant(field, column) == is_cast_redundant
+
+
+def build_backfill_data_vault_load(
+    data_vault_load: DataVaultLoad, **kwargs
+) -> DataVaultLoad:
+    """Build a copy of a Data Vault load, without its effectivity satellites.
+
+    Args:
+        data_vault_load: Data Vault load to copy.
+        kwargs: Other DataVaultLoad arguments.
+
+    Returns:
+        Copy of the Data Vault load, with its own table instances.
+    """
+    return DataVaultLoad(
+        extract_schema=data_vault_load.extract_schema,
+        extract_table=data_vault_load.extract_table,
+        staging_schema=data_vault_load.staging_table.schema,
+        staging_table="orders",
+        extract_start_timestamp=data_vault_load.extract_start_timestamp,
+        target_tables=copy.deepcopy(
+            [
+                table
+                for table in data_vault_load.target_tables
+                if not isinstance(table, EffectivitySatellite)
+            ]
+        ),
+        source=data_vault_load.source,
+        **kwargs,
+    )
+
+
+def test_backfill_staging_and_hub_link_sql(data_vault_load: DataVaultLoad):
+    """Assert that each record is staged with its own timestamp.
+
+    Args:
+        data_vault_load: Data vault load fixture value.
+    """
+    data_vault_load = build_backfill_data_vault_load(data_vault_load)
+    backfill_data_vault_load = build_backfill_data_vault_load(
+        data_vault_load, record_timestamp_column="extracted_at"
+    )
+
+    assert not data_vault_load.staging_table.backfill
+    assert backfill_data_vault_load.staging_table.backfill
+    assert backfill_data_vault_load.staging_create_sql_statement == (
+        data_vault_load.staging_create_sql_statement.replace(
+            "CAST('2019-08-06T00:00:00.000000Z' AS TIMESTAMP) AS r_timestamp",
+            "CAST(extracted_at AS TIMESTAMP) AS r_timestamp",
+        )
+    )
+
+    # Hubs and links only insert the earliest records of each hashkey.
+    for table in backfill_data_vault_load.target_tables:
+        if not isinstance(table, (Hub, Link)):
+            continue
+        hashkey = table.sql_placeholders["source_hashkey_field"]
+        original_table = data_vault_load._get_target_table(table.name)
+        assert table.sql_load_statement == original_table.sql_load_statement.replace(
+            "dv_stg.orders_20190806_000000",
+            "(SELECT * FROM dv_stg.orders_20190806_000000 "
+            "QUALIFY r_timestamp = MIN(r_timestamp) "
+            f"OVER (PARTITION BY {hashkey}))",
+        )
+
+
+@pytest.mark.parametrize(
+    ("load_mode", "expected_result_name"),
+    [
+        (SatelliteLoadMode.MERGE, "expected_result_satellite_backfill.sql"),
+        (
+            SatelliteLoadMode.INSERT_ONLY,
+            "expected_result_satellite_insert_only_backfill.sql",
+        ),
+    ],
+)
+def test_backfill_satellite_sql(
+    test_path: Path,
+    data_vault_load: DataVaultLoad,
+    load_mode: SatelliteLoadMode,
+    expected_result_name: str,
+):
+    """Assert that satellites load collapsed version chains.
+
+    Args:
+        test_path: Test path fixture value.
+        data_vault_load: Data vault load fixture value.
+        load_mode: Satellite load mode.
+        expected_result_name: File name of the expected SQL.
+    """
+    satellite = build_backfill_data_vault_load(
+        data_vault_load, record_timestamp_column="extracted_at"
+    )._get_target_table("hs_customer")
+    satellite.load_mode = load_mode
+
+    expected_result = (test_path / "sql" / expected_result_name).read_text()
+    assert satellite.sql_load_statement == expected_result
+
+
+def test_backfill_effectivity_satellite(data_vault_load: DataVaultLoad):
+    """Assert that effectivity satellites can not be backfilled.
+
+    Args:
+        data_vault_load: Data vault load fixture value.
+    """
+    with pytest.raises(ValueError, match="can not be backfilled"):
+        build_data_vault_load(
+            data_vault_load,
+            staging_mode=StagingMode.TABLE,
+            record_timestamp_column="extracted_at",
+        )
+
+
+def test_initial_load_mode(data_vault_load: DataVaultLoad):
+    """Assert which target tables are loaded as empty tables, in each mode.
+
+    Args:
+        data_vault_load: Data vault load fixture value.
+    """
+    initial_load_table_names = [
+        "h_order",
+        "l_order_customer",
+        "l_order_customer_role_playing",
+        "hs_customer",
+        "ls_order_customer_eff",
+        "ls_order_customer_role_playing_eff",
+    ]
+    assert data_vault_load.initial_load_mode == InitialLoadMode.DISABLED
+    assert data_vault_load.initial_load_probes == {}
+    assert not any(table.initial_load for table in data_vault_load.target_tables)
+
+    enabled_load = build_data_vault_load(
+        data_vault_load,
+        staging_mode=StagingMode.TABLE,
+        initial_load_mode=InitialLoadMode.ENABLED,
+    )
+    assert enabled_load.initial_load_probes == {}
+    assert [
+        table.name for table in enabled_load.target_tables if table.initial_load
+    ] == initial_load_table_names
+    assert [table.name for table in enabled_load.initial_load_tables] == (
+        initial_load_table_names
+    )
+
+    auto_load = build_data_vault_load(
+        data_vault_load,
+        staging_mode=StagingMode.TABLE,
+        initial_load_mode=InitialLoadMode.AUTO,
+    )
+    assert not any(table.initial_load for table in auto_load.target_tables)
+    assert auto_load.initial_load_probes == {
+        table_name: f"SELECT 1 WHERE EXISTS (SELECT 1 FROM dv.{table_name})"
+        for table_name in initial_load_table_names
+    }
+
+    # Tables that do not support initial loads are ignored.
+    auto_load.set_initial_load_tables(["hs_customer", "h_customer"])
+    assert [table.name for table in auto_load.target_tables if table.initial_load] == [
+        "hs_customer"
+    ]
@@ -0,0 +1,132 @@
+"""Unit test DataVaultLoadBatch."""
+
+from pathlib import Path
+from typing import Any, List
+
+import pytest
+
+from diepvries import InsertStrategy
+from diepvries.data_vault_load import DataVaultLoad
+from diepvries.data_vault_load_batch import DataVaultLoadBatch
+from diepvries.hub import Hub
+from diepvries.pruning import LookbackPruning
+from diepvries.satellite import Satellite
+
+
+def test_sql_load_scripts_by_group_single_load(data_vault_load: DataVaultLoad):
+    """Assert that a batch of one load generates the same SQL as the load itself.
+
+    Args:
+        data_vault_load: Data Vault load fixture value.
+    """
+    batch = DataVaultLoadBatch([data_vault_load])
+
+    assert batch.sql_load_scripts_by_group == data_vault_load.sql_load_scripts_by_group
+    assert batch.sql_load_script == list(data_vault_load.sql_load_script)
+
+
+def test_sql_load_scripts_by_group(data_vault_loads: List[DataVaultLoad]):
+    """Assert that hubs and links are loaded once, and satellites once per load.
+
+    Args:
+        data_vault_loads: Data Vault loads fixture value.
+    """
+    batch = DataVaultLoadBatch(data_vault_loads)
+    staging_group, *groups = batch.sql_load_scripts_by_group
+
+    assert staging_group == [
+        data_vault_load.staging_create_sql_statement
+        for data_vault_load in data_vault_loads
+    ]
+    assert [len(group) for group in groups] == [
+        len(group) * (len(data_vault_loads) if isinstance(group[0], Satellite) else 1)
+        for group in data_vault_loads[0].target_tables_by_group
+    ]
+    for statement in groups[0] + groups[1]:
+        assert statement.count("UNION ALL") == 2 * (len(data_vault_loads) - 1)
+        for data_vault_load in data_vault_loads:
+            assert data_vault_load.staging_table.name in statement
+    assert sorted(groups[2]) == sorted(
+        table.sql_load_statement
+        for data_vault_load in data_vault_loads
+        for table in data_vault_load.target_tables
+        if isinstance(table, Satellite)
+    )
+
+
+def test_batch_hub_load_sql(test_path: Path, data_vault_loads: List[DataVaultLoad]):
+    """Assert correctness of SQL generated to load a hub from two staging tables.
+
+    Args:
+        test_path: Test path fixture value.
+        data_vault_loads: Data Vault loads fixture value.
+    """
+    expected_result = (test_path / "sql" / "expected_result_hub_batch.sql").read_text()
+    batch = DataVaultLoadBatch(data_vault_loads[:2])
+
+    assert batch.sql_load_scripts_by_group[1][0] == expected_result
+
+
+def test_batch_hub_load_sql_anti_join(data_vault_loads: List[DataVaultLoad]):
+    """Assert that combined hubs are loaded with their insert strategy.
+
+    Args:
+        data_vault_loads: Data Vault loads fixture value.
+    """
+    merge_sql = DataVaultLoadBatch(data_vault_loads[:2]).sql_load_scripts_by_group[1][0]
+    for data_vault_load in data_vault_loads[:2]:
+        data_vault_load.target_tables[0].insert_strategy = InsertStrategy.ANTI_JOIN
+    batch = DataVaultLoadBatch(data_vault_loads[:2])
+    statement = batch.sql_load_scripts_by_group[1][0]
+
+    assert statement.startswith(merge_sql[: merge_sql.index("MERGE INTO")])
+    assert "INSERT INTO dv.h_customer " in statement
+    assert "WHERE NOT EXISTS" in statement
+    # Both the pre-scan and the insert read from the union of the staging tables.
+    assert statement.count("UNION ALL") == merge_sql.count("UNION ALL") == 2
+
+
+def test_batch_different_fields(data_vault_loads: List[DataVaultLoad], h_order: Hub):
+    """Assert that a hub is not combined if its fields differ across loads.
+
+    Args:
+        data_vault_loads: Data Vault loads fixture value.
+        h_order: h_order fixture value.
+    """
+    hub = data_vault_loads[0].target_tables[0]
+    hub.fields = hub.fields[:-1] + h_order.fields[-1:]
+    batch = DataVaultLoadBatch(data_vault_loads)
+
+    with pytest.raises(ValueError):
+        batch.sql_load_scripts_by_group  # pylint: disable=pointless-statement
+
+
+@pytest.mark.parametrize(
+    "setting, value",
+    [
+        ("insert_strategy", InsertStrategy.ANTI_JOIN),
+        ("initial_load", True),
+        ("pruning_strategy", LookbackPruning(hours=24)),
+    ],
+)
+def test_batch_different_settings(
+    data_vault_loads: List[DataVaultLoad], setting: str, value: Any
+):
+    """Assert that a hub is not combined if its load settings differ across loads.
+
+    Args:
+        data_vault_loads: Data Vault loads fixture value.
+        setting: Name of the hub setting.
+        value: Value of the setting, in the first load only.
+    """
+    setattr(data_vault_loads[0].target_tables[0], setting, value)
+    batch = DataVaultLoadBatch(data_vault_loads)
+
+    with pytest.raises(ValueError, match=setting):
+        batch.sql_load_scripts_by_group  # pylint: disable=pointless-statement
+
+
+def test_batch_no_loads():
+    """Assert that a batch needs at least one load."""
+    with pytest.raises(ValueError):
+        DataVaultLoadBatch([])
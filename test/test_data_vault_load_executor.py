@@ -0,0 +1,426 @@
+"""Unit test DataVaultLoadExecutor."""
+
+import asyncio
+import threading
+from contextlib import asynccontextmanager
+from typing import Optional, Sequence, Tuple
+
+import pytest
+
+from diepvries import InitialLoadMode, StagingMode, StagingTableType, StatementStatus
+from diepvries.data_vault_load import DataVaultLoad
+from diepvries.data_vault_load_batch import DataVaultLoadBatch
+from diepvries.data_vault_load_executor import (
+    AsyncDataVaultLoadExecutor,
+    BlockingConnectionPool,
+    DataVaultLoadExecutionError,
+    DataVaultLoadExecutor,
+    split_sql_statements,
+)
+from diepvries.data_vault_load_scheduler import DataVaultLoadScheduler
+from diepvries.table import StagingTableOptions
+
+from .fake_dbapi import FakeConnectionFactory
+from .test_data_vault_load import build_data_vault_load
+from .test_staging_files import generate_records
+
+# pylint: disable=redefined-outer-name
+
+
+class FakeAsyncConnection:  # pylint: disable=too-few-public-methods
+    """Connection of an asynchronous driver that records executed statements."""
+
+    def __init__(self, pool: "FakeAsyncConnectionPool"):
+        """Instantiate a FakeAsyncConnection.
+
+        Args:
+            pool: Pool that owns the connection.
+        """
+        self.pool = pool
+
+    async def execute(self, statement: str) -> int:
+        """Record statement, yielding control to the event loop while it "runs".
+
+        Args:
+            statement: SQL statement.
+
+        Returns:
+            Number of affected rows.
+
+        Raises:
+            RuntimeError: If the statement contains the pool's failure marker.
+        """
+        self.pool.executed.append((id(self), statement))
+        self.pool.running += 1
+        self.pool.max_running = max(self.pool.max_running, self.pool.running)
+        await asyncio.sleep(0.001)
+        self.pool.running -= 1
+        if self.pool.fail_on and self.pool.fail_on in statement:
+            raise RuntimeError(f"Statement failed: {self.pool.fail_on}")
+        # As in many drivers, the row count of queries is unknown.
+        return -1 if statement.startswith("SELECT") else 1
+
+    async def fetchone(self, statement: str) -> Optional[Tuple]:
+        """Record query, returning its first row.
+
+        Args:
+            statement: SQL query.
+
+        Returns:
+            First row, or None if the query contains one of the pool's empty markers.
+        """
+        await self.execute(statement)
+        if any(marker in statement for marker in self.pool.empty_on):
+            return None
+        return (1,)
+
+
+class FakeAsyncConnectionPool:  # pylint: disable=too-few-public-methods
+    """Connection pool of an asynchronous driver."""
+
+    def __init__(self, fail_on: str = None, empty_on: Sequence[str] = ()):
+        """Instantiate a FakeAsyncConnectionPool.
+
+        Args:
+            fail_on: Statements containing this string fail.
+            empty_on: Queries containing one of these strings return no rows.
+        """
+        self.executed = []
+        self.fail_on = fail_on
+        self.empty_on = empty_on
+        self.running = 0
+        self.max_running = 0
+
+    @asynccontextmanager
+    async def acquire(self):
+        """Acquire a new connection.
+
+        Yields:
+            New connection.
+        """
+        yield FakeAsyncConnection(self)
+
+
+def test_split_sql_statements():
+    """Assert that statements are split on semicolons outside literals and comments."""
+    script = (
+        "SET a = 'x;y';\n"
+        "-- comment; with semicolon\n"
+        'SELECT ";" AS "col;1" /* block; comment */ FROM t;\n'
+        "\n"
+    )
+    assert split_sql_statements(script) == [
+        "SET a = 'x;y'",
+        '-- comment; with semicolon\nSELECT ";" AS "col;1" /* block; comment */ '
+        "FROM t",
+    ]
+
+
+def test_execute(data_vault_load: DataVaultLoad):
+    """Assert that statements are executed by group, respecting loading order."""
+    connection_factory = FakeConnectionFactory()
+    report = DataVaultLoadExecutor(
+        data_vault_load, connection_factory, max_workers=3
+    ).execute()
+
+    assert report.succeeded
+    assert len(report.results) == 1 + len(data_vault_load.target_tables)
+    assert all(result.duration is not None for result in report.results)
+    assert all(result.rowcount == 1 for result in report.results)
+    assert 0 < len(connection_factory.connections) <= 3
+    assert all(connection.closed for connection in connection_factory.connections)
+
+    executed = [statement for _, statement in connection_factory.executed]
+    assert executed[0].startswith("CREATE OR REPLACE TABLE")
+    assert len(executed) == sum(
+        len(split_sql_statements(statement))
+        for group in data_vault_load.sql_load_scripts_by_group
+        for statement in group
+    )
+
+    # Groups are executed in order: a statement only starts after all statements of
+    # the previous group finished.
+    groups = [result.group for result in sorted(report.results, key=_started_at)]
+    assert groups == sorted(groups)
+    for previous, current in zip(report.results, report.results[1:]):
+        if current.group > previous.group:
+            assert current.started_at >= max(
+                result.finished_at
+                for result in report.results
+                if result.group == previous.group
+            )
+
+
+def test_execute_same_session(data_vault_load: DataVaultLoad):
+    """Assert that all statements of a table run on the same connection, in order."""
+    connection_factory = FakeConnectionFactory(delay=0.001)
+    DataVaultLoadExecutor(data_vault_load, connection_factory, max_workers=4).execute()
+
+    for table in data_vault_load.target_tables:
+        statements = split_sql_statements(table.sql_load_statement)
+        executions = [
+            (thread, position)
+            for position, (thread, statement) in enumerate(connection_factory.executed)
+            if statement in statements
+        ]
+        assert len({thread for thread, _ in executions}) == 1
+        assert [
+            connection_factory.executed[position][1] for _, position in executions
+        ] == statements
+
+
+def test_execute_fail_fast(data_vault_load: DataVaultLoad):
+    """Assert that a failure cancels all statements of the following groups."""
+    connection_factory = FakeConnectionFactory(fail_on="MERGE INTO dv.h_customer ")
+    executor = DataVaultLoadExecutor(data_vault_load, connection_factory, max_workers=1)
+
+    with pytest.raises(DataVaultLoadExecutionError) as exc_info:
+        executor.execute()
+
+    report = exc_info.value.report
+    assert [result.table_name for result in report.failed] == ["h_customer"]
+    assert isinstance(report.failed[0].error, RuntimeError)
+    failed_group = report.failed[0].group
+    for result in report.results:
+        if result.group > failed_group:
+            assert result.status == StatementStatus.CANCELLED
+            assert result.started_at is None
+    assert all(connection.closed for connection in connection_factory.connections)
+
+
+def test_execute_without_raise(data_vault_load: DataVaultLoad):
+    """Assert that failures are only reported when raise_on_failure is False."""
+    connection_factory = FakeConnectionFactory(fail_on="CREATE OR REPLACE TABLE")
+    report = DataVaultLoadExecutor(data_vault_load, connection_factory).execute(
+        raise_on_failure=False
+    )
+
+    assert not report.succeeded
+    assert report.results[0].status == StatementStatus.FAILED
+    assert all(
+        result.status == StatementStatus.CANCELLED for result in report.results[1:]
+    )
+
+
+def test_data_vault_load_execute(data_vault_load: DataVaultLoad):
+    """Assert that DataVaultLoad.execute runs the whole load."""
+    connection_factory = FakeConnectionFactory()
+    report = data_vault_load.execute(connection_factory, max_workers=2)
+
+    assert report.succeeded
+    assert [result.statement for result in report.results] == [
+        statement
+        for group in data_vault_load.sql_load_scripts_by_group
+        for statement in group
+    ]
+
+
+def test_invalid_max_workers(data_vault_load: DataVaultLoad):
+    """Assert that max_workers must be positive."""
+    with pytest.raises(ValueError):
+        DataVaultLoadExecutor(data_vault_load, FakeConnectionFactory(), max_workers=0)
+
+
+def test_aexecute(data_vault_load: DataVaultLoad):
+    """Assert that statements are executed by group on an asynchronous driver."""
+    connection_pool = FakeAsyncConnectionPool()
+    report = asyncio.run(data_vault_load.aexecute(connection_pool, max_concurrency=3))
+
+    assert report.succeeded
+    assert [result.statement for result in report.results] == [
+        statement
+        for group in data_vault_load.sql_load_scripts_by_group
+        for statement in group
+    ]
+    assert 1 < connection_pool.max_running <= 3
+    for previous, current in zip(report.results, report.results[1:]):
+        if current.group > previous.group:
+            assert current.started_at >= max(
+                result.finished_at
+                for result in report.results
+                if result.group == previous.group
+            )
+
+    # All statements of a table run in order, on the same connection.
+    for table in data_vault_load.target_tables:
+        statements = split_sql_statements(table.sql_load_statement)
+        executions = [
+            (connection, statement)
+            for connection, statement in connection_pool.executed
+            if statement in statements
+        ]
+        assert len({connection for connection, _ in executions}) == 1
+        assert [statement for _, statement in executions] == statements
+
+
+def test_aexecute_blocking_driver(data_vault_load: DataVaultLoad):
+    """Assert that a blocking driver is offloaded to a thread pool."""
+    connection_factory = FakeConnectionFactory()
+    report = asyncio.run(data_vault_load.aexecute(connection_factory))
+
+    assert report.succeeded
+    assert all(result.rowcount == 1 for result in report.results)
+    assert {thread for thread, _ in connection_factory.executed} != {
+        threading.get_ident()
+    }
+    assert 0 < len(connection_factory.connections) <= 4
+    assert all(connection.closed for connection in connection_factory.connections)
+
+
+def test_aexecute_interleaved_loads(data_vault_load: DataVaultLoad):
+    """Assert that multiple loads are executed concurrently on one event loop."""
+
+    async def execute_loads(connection_pool):
+        return await asyncio.gather(
+            AsyncDataVaultLoadExecutor(
+                data_vault_load, connection_pool, max_concurrency=1
+            ).execute(),
+            AsyncDataVaultLoadExecutor(
+                data_vault_load, connection_pool, max_concurrency=1
+            ).execute(),
+        )
+
+    connection_pool = FakeAsyncConnectionPool()
+    reports = asyncio.run(execute_loads(connection_pool))
+
+    assert all(report.succeeded for report in reports)
+    assert connection_pool.max_running == 2
+
+    # Loads also share a pool of blocking connections.
+    connection_factory = FakeConnectionFactory()
+    blocking_pool = BlockingConnectionPool(connection_factory, max_connections=2)
+    reports = asyncio.run(execute_loads(blocking_pool))
+    blocking_pool.close()
+
+    assert all(report.succeeded for report in reports)
+    assert len(connection_factory.connections) <= 2
+
+
+def test_aexecute_fail_fast(data_vault_load: DataVaultLoad):
+    """Assert that a failure cancels all statements of the following groups."""
+    connection_pool = FakeAsyncConnectionPool(fail_on="MERGE INTO dv.h_customer ")
+    executor = AsyncDataVaultLoadExecutor(
+        data_vault_load, connection_pool, max_concurrency=1
+    )
+
+    with pytest.raises(DataVaultLoadExecutionError) as exc_info:
+        asyncio.run(executor.execute())
+
+    report = exc_info.value.report
+    assert [result.table_name for result in report.failed] == ["h_customer"]
+    failed_group = report.failed[0].group
+    for result in report.results:
+        if result.group > failed_group:
+            assert result.status == StatementStatus.CANCELLED
+            assert result.started_at is None
+
+
+def _started_at(result):
+    return result.started_at
+
+
+@pytest.mark.parametrize("driver", ["blocking", "asynchronous", "blocking_async"])
+def test_execute_initial_load_probes(data_vault_load: DataVaultLoad, driver: str):
+    """Assert that empty target tables are probed, and loaded with INSERT statements.
+
+    Probes do not rely on row counts, that are unknown (-1) for queries.
+
+    Args:
+        data_vault_load: Data vault load fixture value.
+        driver: Type of driver the load is executed on (blocking_async executes a
+            blocking driver with AsyncDataVaultLoadExecutor).
+    """
+    data_vault_load.initial_load_mode = InitialLoadMode.AUTO
+    empty_on = ["FROM dv.h_order)", "FROM dv.hs_customer)"]
+    if driver == "asynchronous":
+        connection_pool = FakeAsyncConnectionPool(empty_on=empty_on)
+        report = asyncio.run(data_vault_load.aexecute(connection_pool))
+        executed = [statement for _, statement in connection_pool.executed]
+    else:
+        connection_factory = FakeConnectionFactory(empty_on=empty_on)
+        if driver == "blocking":
+            report = data_vault_load.execute(connection_factory)
+        else:
+            report = asyncio.run(data_vault_load.aexecute(connection_factory))
+        executed = [statement for _, statement in connection_factory.executed]
+
+    assert report.succeeded
+    probes = data_vault_load.initial_load_probes
+    assert executed[: len(probes)] == list(probes.values())
+    assert [
+        table.name for table in data_vault_load.target_tables if table.initial_load
+    ] == ["h_order", "hs_customer"]
+    h_order_statement = next(
+        result.statement for result in report.results if result.table_name == "h_order"
+    )
+    assert h_order_statement.startswith("-- Initial load")
+
+
+def test_temporary_staging_table(data_vault_load: DataVaultLoad):
+    """Assert that temporary staging tables are rejected by parallel executors.
+
+    Args:
+        data_vault_load: Data vault load fixture value.
+    """
+    staging_table_options = StagingTableOptions(table_type=StagingTableType.TEMPORARY)
+    temporary_data_vault_load = build_data_vault_load(
+        data_vault_load,
+        staging_mode=StagingMode.TABLE,
+        staging_table_options=staging_table_options,
+    )
+    assert temporary_data_vault_load.uses_temporary_staging_table
+    for build_executor in (
+        lambda: DataVaultLoadExecutor(
+            temporary_data_vault_load, FakeConnectionFactory()
+        ),
+        lambda: AsyncDataVaultLoadExecutor(
+            temporary_data_vault_load, FakeConnectionFactory()
+        ),
+        lambda: DataVaultLoadScheduler(
+            [temporary_data_vault_load], FakeConnectionFactory()
+        ),
+        lambda: DataVaultLoadBatch([temporary_data_vault_load]),
+    ):
+        with pytest.raises(ValueError, match="Temporary staging tables"):
+            build_executor()
+
+    # Inlined staging queries do not create the temporary staging table.
+    inline_data_vault_load = build_data_vault_load(
+        data_vault_load,
+        staging_mode=StagingMode.INLINE,
+        staging_table_options=staging_table_options,
+    )
+    assert not inline_data_vault_load.uses_temporary_staging_table
+    assert (
+        DataVaultLoadExecutor(inline_data_vault_load, FakeConnectionFactory())
+        .execute()
+        .succeeded
+    )
+
+
+def test_execute_staging_files(tmp_path, data_vault_load: DataVaultLoad):
+    """Assert that staging files are uploaded and loaded before the target tables."""
+    files_data_vault_load = build_data_vault_load(
+        data_vault_load, staging_mode=StagingMode.FILES
+    )
+    staging_statements = files_data_vault_load.stage_records(
+        generate_records(2), directory=tmp_path, max_file_size=1
+    )
+
+    connection_factory = FakeConnectionFactory()
+    report = files_data_vault_load.execute(connection_factory, max_workers=2)
+
+    assert report.succeeded
+    assert report.results[0].table_name == files_data_vault_load.staging_table.name
+    executed = [statement for _, statement in connection_factory.executed]
+    assert executed[: len(staging_statements)] == [
+        statement.strip().rstrip(";") for statement in staging_statements
+    ]
+    assert [statement.split()[0] for statement in staging_statements] == [
+        "CREATE",
+        "PUT",
+        "PUT",
+        "COPY",
+    ]
+    # The extraction table is never read.
+    assert all(data_vault_load.extract_table not in statement for statement in executed)
@@ -0,0 +1,194 @@
+"""Unit test DataVaultLoadScheduler."""
+
+import copy
+from concurrent.futures import ThreadPoolExecutor
+from typing import List
+
+import pytest
+
+from diepvries import StagingMode, StatementStatus
+from diepvries.data_vault_load import DataVaultLoad
+from diepvries.data_vault_load_executor import (
+    DataVaultLoadExecutionError,
+    DataVaultLoadExecutor,
+    DataVaultLoadReport,
+)
+from diepvries.data_vault_load_scheduler import DataVaultLoadScheduler
+from diepvries.role_playing_hub import RolePlayingHub
+from diepvries.table import StagingTableOptions
+
+from .fake_dbapi import FakeConnectionFactory
+
+
+def test_execute(data_vault_loads: List[DataVaultLoad]):
+    """Assert that all loads are executed, respecting dependencies and table locks."""
+    connection_factory = FakeConnectionFactory(delay=0.01)
+    reports = DataVaultLoadScheduler(
+        data_vault_loads, connection_factory, max_workers=8
+    ).execute()
+
+    assert len(reports) == len(data_vault_loads)
+    for data_vault_load, report in zip(data_vault_loads, reports):
+        assert report.succeeded
+        assert [result.statement for result in report.results] == [
+            statement
+            for group in data_vault_load.sql_load_scripts_by_group
+            for statement in group
+        ]
+
+        results = {result.table_name: result for result in report.results}
+        staging_result = report.results[0]
+        for table in data_vault_load.target_tables:
+            result = results[table.name]
+            assert result.started_at >= staging_result.finished_at
+            for parent_name in getattr(table, "parent_hub_names", []):
+                assert result.started_at >= results[parent_name].finished_at
+            parent_table = getattr(table, "parent_table", None)
+            if parent_table is not None and parent_table.name in results:
+                assert result.started_at >= results[parent_table.name].finished_at
+
+    # Writes to the same physical table never overlap. Role playing hubs write to
+    # their parent hub.
+    results_by_target = {}
+    for data_vault_load, report in zip(data_vault_loads, reports):
+        for table, result in zip(data_vault_load.target_tables, report.results[1:]):
+            if isinstance(table, RolePlayingHub):
+                table = table.parent_table
+            results_by_target.setdefault(table.name, []).append(result)
+    assert len(results_by_target["h_customer"]) == 2 * len(data_vault_loads)
+    for results in results_by_target.values():
+        results = sorted(results, key=lambda x: x.started_at)
+        for previous, current in zip(results, results[1:]):
+            assert current.started_at >= previous.finished_at
+
+
+def test_execute_concurrently(data_vault_loads: List[DataVaultLoad]):
+    """Assert that loads overlap, instead of running one after the other."""
+    connection_factory = FakeConnectionFactory(delay=0.02)
+    reports = DataVaultLoadScheduler(
+        data_vault_loads, connection_factory, max_workers=8
+    ).execute()
+    results = [result for report in reports for result in report.results]
+
+    elapsed = max(result.finished_at for result in results) - min(
+        result.started_at for result in results
+    )
+    sequential = sum((result.duration for result in results), elapsed * 0)
+    assert elapsed < sequential / 2
+
+
+def test_execute_failure(data_vault_loads: List[DataVaultLoad]):
+    """Assert that a failure only cancels the pending statements of its own load."""
+    connection_factory = FakeConnectionFactory(fail_on="dv_stg.orders_1_")
+    scheduler = DataVaultLoadScheduler(data_vault_loads, connection_factory)
+
+    with pytest.raises(DataVaultLoadExecutionError) as exc_info:
+        scheduler.execute()
+
+    failed = exc_info.value.report.failed
+    assert [result.table_name for result in failed] == [
+        data_vault_loads[1].staging_table.name
+    ]
+
+    reports = scheduler.execute(raise_on_failure=False)
+    assert reports[0].succeeded
+    assert reports[2].succeeded
+    assert reports[1].results[0].status == StatementStatus.FAILED
+    assert all(
+        result.status == StatementStatus.CANCELLED and result.started_at is None
+        for result in reports[1].results[1:]
+    )
+    assert all(connection.closed for connection in connection_factory.connections)
+
+
+def test_execute_single_load(data_vault_load: DataVaultLoad):
+    """Assert that a single load executes the same statements as the executor."""
+    scheduler_factory = FakeConnectionFactory()
+    executor_factory = FakeConnectionFactory()
+    DataVaultLoadScheduler(
+        [data_vault_load], scheduler_factory, max_workers=1
+    ).execute()
+    DataVaultLoadExecutor(data_vault_load, executor_factory, max_workers=1).execute()
+
+    assert sorted(statement for _, statement in scheduler_factory.executed) == sorted(
+        statement for _, statement in executor_factory.executed
+    )
+
+
+def test_execute_inline_staging(data_vault_load: DataVaultLoad):
+    """Assert that no staging table is created when the staging query is inlined."""
+    data_vault_loads = [
+        DataVaultLoad(
+            extract_schema=data_vault_load.extract_schema,
+            extract_table=f"{data_vault_load.extract_table}_{index}",
+            staging_schema=data_vault_load.staging_table.schema,
+            staging_table=f"orders_{index}",
+            extract_start_timestamp=data_vault_load.extract_start_timestamp,
+            target_tables=copy.deepcopy(data_vault_load.target_tables),
+            source=data_vault_load.source,
+            staging_mode=staging_mode,
+        )
+        for index, staging_mode in enumerate([StagingMode.INLINE, StagingMode.TABLE])
+    ]
+    connection_factory = FakeConnectionFactory()
+    inline_report, table_report = DataVaultLoadScheduler(
+        data_vault_loads, connection_factory
+    ).execute()
+
+    assert inline_report.succeeded
+    assert [result.table_name for result in inline_report.results] == [
+        table.name for table in data_vault_loads[0].target_tables
+    ]
+    assert len(table_report.results) == 1 + len(data_vault_load.target_tables)
+    executed = [statement for _, statement in connection_factory.executed]
+    assert sum(statement.startswith("CREATE") for statement in executed) == 1
+
+
+def test_execute_drop_staging_table(data_vault_load: DataVaultLoad):
+    """Assert that the staging table is dropped after all target tables are loaded."""
+    data_vault_load = DataVaultLoad(
+        extract_schema=data_vault_load.extract_schema,
+        extract_table=data_vault_load.extract_table,
+        staging_schema=data_vault_load.staging_table.schema,
+        staging_table="orders",
+        extract_start_timestamp=data_vault_load.extract_start_timestamp,
+        target_tables=copy.deepcopy(data_vault_load.target_tables),
+        source=data_vault_load.source,
+        staging_table_options=StagingTableOptions(drop_after_load=True),
+    )
+    connection_factory = FakeConnectionFactory(delay=0.01)
+    (report,) = DataVaultLoadScheduler(
+        [data_vault_load], connection_factory, max_workers=8
+    ).execute()
+
+    assert report.succeeded
+    assert len(report.results) == 2 + len(data_vault_load.target_tables)
+    assert report.results[-1].statement == data_vault_load.staging_drop_sql_statement
+    executed = [statement for _, statement in connection_factory.executed]
+    assert executed[-1].startswith("DROP TABLE")
+
+
+def test_initial_load_same_table(data_vault_loads: List[DataVaultLoad]):
+    """Assert that a table is loaded as an empty table by a single load only."""
+    first_load, second_load, third_load = data_vault_loads
+    first_load.set_initial_load_tables(["hs_customer"])
+    third_load.set_initial_load_tables(["h_order"])
+    DataVaultLoadScheduler(data_vault_loads, FakeConnectionFactory())
+
+    second_load.set_initial_load_tables(["hs_customer"])
+    with pytest.raises(ValueError, match="hs_customer"):
+        DataVaultLoadScheduler(data_vault_loads, FakeConnectionFactory())
+
+
+def test_blocked_tasks(data_vault_load: DataVaultLoad):
+    """Assert that tasks blocked by dependencies that never finish raise an error."""
+    scheduler = DataVaultLoadScheduler([data_vault_load], FakeConnectionFactory())
+    tasks = scheduler._build_tasks(  # pylint: disable=protected-access
+        [DataVaultLoadReport.from_data_vault_load(data_vault_load)]
+    )
+    # The staging table depends on a load statement, that depends on it.
+    tasks[0].dependencies.append(tasks[1])
+
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        with pytest.raises(RuntimeError, match="never finish"):
+            scheduler._run(pool, tasks)  # pylint: disable=protected-access
@@ -1,5 +1,8 @@
 """Unit tests for Field."""
 
+import copy
+import pickle
+
 import pytest
 
 from diepvries import METADATA_FIELDS, FieldDataType, FieldRole, TableType
@@ -42,6 +45,17 @@ from diepvries.field import Field
             ),
             "NUMBER (18, 8)",
         ),
+        (
+            Field(
+                parent_table_name="some_table",
+                name="test_binary",
+                data_type=FieldDataType.BINARY,
+                position=1,
+                length=16,
+                is_mandatory=False,
+            ),
+            "BINARY (16)",
+        ),
         (
             Field(
                 parent_table_name="some_table",
@@ -197,6 +211,16 @@ def test_data_type_sql(input_field, output_string):
             ),
             "COALESCE(CAST(CAST(test_variant AS VARIANT) AS TEXT), '')",
         ),
+        (
+            Field(
+                parent_table_name="hs_customer",
+                name="test_binary",
+                data_type=FieldDataType.BINARY,
+                position=1,
+                is_mandatory=False,
+            ),
+            "COALESCE(HEX_ENCODE(CAST(test_binary AS BINARY)), '')",
+        ),
         (
             Field(
                 parent_table_name="h_customer",
@@ -214,6 +238,45 @@ def test_hash_concatenation_sql(input_field, output_string):
     assert input_field.hash_concatenation_sql == output_string
 
 
+@pytest.mark.parametrize(
+    ("data_type", "cast", "coalesce", "output_string"),
+    [
+        (
+            FieldDataType.NUMBER,
+            True,
+            True,
+            "COALESCE(CAST(CAST(test AS NUMBER (38, 2)) AS TEXT), '')",
+        ),
+        (FieldDataType.NUMBER, False, True, "COALESCE(CAST(test AS TEXT), '')"),
+        (
+            FieldDataType.NUMBER,
+            True,
+            False,
+            "CAST(CAST(test AS NUMBER (38, 2)) AS TEXT)",
+        ),
+        (FieldDataType.TEXT, False, False, "test"),
+        (FieldDataType.DATE, False, False, "TO_CHAR(test, 'yyyy-mm-dd')"),
+        (FieldDataType.GEOGRAPHY, False, True, "COALESCE(ST_ASTEXT(test), '')"),
+    ],
+)
+def test_get_hash_concatenation_sql(
+    data_type: FieldDataType, cast: bool, coalesce: bool, output_string: str
+):
+    """Test that redundant steps are skipped from ``hash_concatenation_sql``."""
+    field = Field(
+        parent_table_name="hs_customer",
+        name="test",
+        data_type=data_type,
+        position=3,
+        is_mandatory=False,
+        precision=38,
+        scale=2,
+    )
+    assert field.get_hash_concatenation_sql(cast=cast, coalesce=coalesce) == (
+        output_string
+    )
+
+
 @pytest.mark.parametrize(
     ("input_field", "suffix"),
     [
@@ -512,3 +575,59 @@ def test_ddl_in_staging(input_field, ddl_in_staging):
 def test_role(input_field, role):
     """Test ``role`` property."""
     assert input_field.role == role
+
+
+def test_field_is_immutable():
+    """Assert that fields cannot be changed after instantiation."""
+    field = Field(
+        parent_table_name="hs_customer",
+        name="some_field",
+        data_type=FieldDataType.TEXT,
+        position=2,
+        is_mandatory=False,
+    )
+
+    with pytest.raises(AttributeError):
+        field.name = "other_field"
+    with pytest.raises(AttributeError):
+        del field.name
+    with pytest.raises(AttributeError):
+        field.other_attribute = "value"
+
+
+def test_field_copy():
+    """Assert that fields can be copied and pickled."""
+    field = Field(
+        parent_table_name="hs_customer",
+        name="s_hashdiff",
+        data_type=FieldDataType.TEXT,
+        position=2,
+        is_mandatory=True,
+        length=32,
+    )
+
+    for field_copy in (copy.deepcopy(field), pickle.loads(pickle.dumps(field))):
+        assert field_copy == field
+        assert field_copy.role == field.role
+        assert field_copy.ddl_in_staging == field.ddl_in_staging
+        assert field_copy.hash_concatenation_sql == field.hash_concatenation_sql
+
+
+def test_role_not_found():
+    """Assert that a field without a valid role raises an error when used."""
+    field = Field(
+        parent_table_name="h_customer",
+        name="some_field",
+        data_type=FieldDataType.TEXT,
+        position=1,
+        is_mandatory=True,
+    )
+
+    with pytest.raises(RuntimeError):
+        field.role  # pylint: disable=pointless-statement
+    with pytest.raises(RuntimeError):
+        field.name_in_staging  # pylint: disable=pointless-statement
+    with pytest.raises(RuntimeError):
+        hash(field)
+    with pytest.raises(RuntimeError):
+        field.get_hash_concatenation_sql(cast=False)
@@ -0,0 +1,340 @@
+"""Unit tests for hashing."""
+
+import hashlib
+from datetime import date, datetime, time, timedelta, timezone
+from decimal import Decimal
+
+import pytest
+
+from diepvries import (
+    HASH_DELIMITER,
+    FieldDataType,
+    FieldRole,
+    HashdiffFormula,
+    HashFunction,
+)
+from diepvries.data_vault_load import DataVaultLoad
+from diepvries.field import Field
+from diepvries.hashing import hash_concatenation_values, hashdiffs, hashkeys
+from diepvries.satellite import Satellite
+from diepvries.template_sql.sql_formulas import (
+    HASHDIFF_SQL_TEMPLATE,
+    HASHKEY_SQL_TEMPLATE,
+)
+
+CET = timezone(timedelta(hours=1))
+
+
+class FakeArrowArray:
+    """Array that implements Arrow's `to_pylist`."""
+
+    def __init__(self, values):
+        """Instantiate a FakeArrowArray.
+
+        Args:
+            values: Array values.
+        """
+        self.values = values
+
+    def to_pylist(self):
+        """Convert the array to a list.
+
+        Returns:
+            Array values.
+        """
+        return list(self.values)
+
+
+def md5(value: str) -> str:
+    """Calculate the MD5 of a string, as Snowflake's MD5 function.
+
+    Args:
+        value: String to hash.
+
+    Returns:
+        Hexadecimal MD5 digest.
+    """
+    return hashlib.md5(value.encode("utf-8")).hexdigest()
+
+
+def build_field(data_type: FieldDataType, **kwargs) -> Field:
+    """Build a descriptive field of a satellite.
+
+    Args:
+        data_type: Field data type.
+        kwargs: Other Field arguments.
+
+    Returns:
+        Descriptive field.
+    """
+    return Field(
+        parent_table_name="hs_customer",
+        name=f"test_{data_type.value.lower()}",
+        data_type=data_type,
+        position=1,
+        is_mandatory=False,
+        **kwargs,
+    )
+
+
+@pytest.mark.parametrize(
+    ("field", "value", "expected_result"),
+    [
+        (build_field(FieldDataType.TEXT, length=10), "ABC dé", "ABC dé"),
+        (build_field(FieldDataType.TEXT), 123, "123"),
+        (build_field(FieldDataType.NUMBER, precision=38, scale=0), 12, "12"),
+        (build_field(FieldDataType.NUMBER, precision=38, scale=0), 2.5, "3"),
+        (build_field(FieldDataType.NUMBER, precision=38, scale=0), -2.5, "-3"),
+        (build_field(FieldDataType.NUMBER, precision=18, scale=2), "1.005", "1.01"),
+        (build_field(FieldDataType.NUMBER, precision=18, scale=2), 1, "1.00"),
+        (build_field(FieldDataType.NUMBER, precision=18, scale=2), -0.001, "0.00"),
+        (
+            build_field(FieldDataType.NUMBER, precision=18, scale=8),
+            Decimal("3.14159265359"),
+            "3.14159265",
+        ),
+        (build_field(FieldDataType.REAL), 1.0, "1"),
+        (build_field(FieldDataType.REAL), 0.1, "0.1"),
+        (build_field(FieldDataType.REAL), 1 / 3, "0.333333333333333"),
+        (build_field(FieldDataType.REAL), 1e20, "1e+20"),
+        (build_field(FieldDataType.REAL), float("nan"), "NaN"),
+        (build_field(FieldDataType.BOOLEAN), True, "true"),
+        (build_field(FieldDataType.BOOLEAN), 0, "false"),
+        (build_field(FieldDataType.BOOLEAN), "Yes", "true"),
+        (build_field(FieldDataType.DATE), date(2021, 3, 1), "2021-03-01"),
+        (build_field(FieldDataType.DATE), "2021-03-01T10:00:00", "2021-03-01"),
+        (
+            build_field(FieldDataType.TIME),
+            time(9, 5, 1, 250),
+            "09:05:01.000250000",
+        ),
+        (build_field(FieldDataType.TIME), 3_600_000_000_001, "01:00:00.000000000"),
+        (
+            build_field(FieldDataType.TIMESTAMP_NTZ),
+            datetime(2021, 3, 1, 10, 0, 0, 123456),
+            "2021-03-01 10:00:00.123456000",
+        ),
+        (
+            build_field(FieldDataType.TIMESTAMP_NTZ),
+            datetime(2021, 3, 1, 10, tzinfo=CET),
+            "2021-03-01 10:00:00.000000000",
+        ),
+        (
+            build_field(FieldDataType.TIMESTAMP_NTZ),
+            1_614_592_800_000_000_000,
+            "2021-03-01 10:00:00.000000000",
+        ),
+        (
+            build_field(FieldDataType.TIMESTAMP_TZ),
+            datetime(2021, 3, 1, 10, tzinfo=CET),
+            "2021-03-01 10:00:00.000000000 +0100",
+        ),
+        (
+            build_field(FieldDataType.TIMESTAMP_TZ),
+            "2021-03-01 10:00:00",
+            "2021-03-01 10:00:00.000000000 +0000",
+        ),
+        (
+            build_field(FieldDataType.TIMESTAMP_LTZ),
+            datetime(2021, 3, 1, 10, tzinfo=CET),
+            "2021-03-01 09:00:00.000000000 +0000",
+        ),
+        (
+            build_field(FieldDataType.GEOGRAPHY),
+            "POINT(-122.35 37.55)",
+            "POINT(-122.35 37.55)",
+        ),
+        (build_field(FieldDataType.ARRAY), [1, "a", None], '[1,"a",null]'),
+        (build_field(FieldDataType.OBJECT), {"b": 1, "a": [2]}, '{"a":[2],"b":1}'),
+        (build_field(FieldDataType.OBJECT), '{"b": 1, "a": 2}', '{"a":2,"b":1}'),
+        (build_field(FieldDataType.VARIANT), "text", "text"),
+        (build_field(FieldDataType.VARIANT), {"a": 1}, '{"a":1}'),
+        (build_field(FieldDataType.BINARY), b"\x01\xab", "01AB"),
+        (build_field(FieldDataType.BINARY), "01ab", "01AB"),
+    ],
+)
+def test_hash_concatenation_values(field, value, expected_result):
+    """Assert that values are converted as in `Field.hash_concatenation_sql`."""
+    assert hash_concatenation_values(field, [value, None]) == [expected_result, ""]
+
+
+def test_hash_concatenation_values_session_timezone():
+    """Assert that naive and local timestamps use the session time zone."""
+    values = [datetime(2021, 3, 1, 10)]
+
+    assert hash_concatenation_values(
+        build_field(FieldDataType.TIMESTAMP_TZ), values, session_timezone=CET
+    ) == ["2021-03-01 10:00:00.000000000 +0100"]
+    assert hash_concatenation_values(
+        build_field(FieldDataType.TIMESTAMP_LTZ),
+        [datetime(2021, 3, 1, 10, tzinfo=timezone.utc)],
+        session_timezone=CET,
+    ) == ["2021-03-01 11:00:00.000000000 +0100"]
+
+
+def test_hash_concatenation_values_invalid_value():
+    """Assert that values that cannot be cast raise a ValueError."""
+    field = build_field(FieldDataType.NUMBER, precision=38, scale=0)
+
+    with pytest.raises(ValueError, match="hs_customer.test_number"):
+        hash_concatenation_values(field, ["not a number"])
+
+
+def test_hash_fields_match_sql(data_vault_load: DataVaultLoad):
+    """Assert that hashes concatenate the same fields as the SQL formulas."""
+    for table in data_vault_load.target_tables:
+        if isinstance(table, Satellite):
+            hashdiff = next(iter(table.fields_by_role[FieldRole.HASHDIFF]))
+            assert table.hashdiff_sql == HASHDIFF_SQL_TEMPLATE.format(
+                hashdiff_expression=f"||'{HASH_DELIMITER}'||".join(
+                    field.hash_concatenation_sql for field in table.hashdiff_fields
+                ),
+                hash_function="MD5",
+                hashdiff=hashdiff.name_in_staging,
+            )
+        else:
+            hashkey = next(iter(table.fields_by_role[FieldRole.HASHKEY]))
+            assert table.hashkey_sql == HASHKEY_SQL_TEMPLATE.format(
+                hashkey_expression=f"||'{HASH_DELIMITER}'||".join(
+                    field.hash_concatenation_sql for field in table.hashkey_fields
+                ),
+                hash_function="MD5",
+                hashkey=hashkey.name,
+            )
+
+
+def test_hashkeys(data_vault_load: DataVaultLoad):
+    """Assert hashkeys of a link, with NULL business keys and child keys."""
+    l_order_customer = next(
+        table
+        for table in data_vault_load.target_tables
+        if table.name == "l_order_customer"
+    )
+    batch = {
+        "order_id": ["1", None],
+        "customer_id": FakeArrowArray(["a", "b"]),
+        "ck_test_string": ["x", None],
+        "ck_test_timestamp": [datetime(2021, 3, 1, 10), None],
+    }
+
+    assert hashkeys(l_order_customer, batch) == [
+        md5("1|~~|a|~~|x|~~|2021-03-01 10:00:00.000000000"),
+        md5("dv_unknown|~~|b|~~||~~|"),
+    ]
+
+
+def test_hashdiffs(data_vault_load: DataVaultLoad):
+    """Assert hashdiffs of an effectivity satellite, without trailing delimiters."""
+    ls_order_customer_eff = next(
+        table
+        for table in data_vault_load.target_tables
+        if table.name == "ls_order_customer_eff"
+    )
+    batch = {
+        "order_id": ["1", "1"],
+        "customer_id": ["a", "a"],
+        "ck_test_string": ["x", None],
+        "ck_test_timestamp": [datetime(2021, 3, 1, 10), None],
+        "dummy_descriptive_field": ["d", None],
+    }
+
+    assert hashdiffs(ls_order_customer_eff, batch) == [
+        md5("1|~~|a|~~|x|~~|2021-03-01 10:00:00.000000000|~~|d"),
+        md5("1|~~|a"),
+    ]
+
+
+def test_hashes_invalid_batch(data_vault_load: DataVaultLoad):
+    """Assert that incomplete batches raise an error."""
+    h_customer = next(
+        table for table in data_vault_load.target_tables if table.name == "h_customer"
+    )
+    l_order = next(
+        table
+        for table in data_vault_load.target_tables
+        if table.name == "l_order_customer"
+    )
+
+    with pytest.raises(KeyError, match="customer_id"):
+        hashkeys(h_customer, {})
+    with pytest.raises(ValueError, match="same length"):
+        hashkeys(
+            l_order,
+            {
+                "order_id": ["1"],
+                "customer_id": ["a", "b"],
+                "ck_test_string": ["x"],
+                "ck_test_timestamp": [None],
+            },
+        )
+
+
+@pytest.mark.parametrize(
+    ("hash_function", "expected_result"),
+    [
+        (HashFunction.MD5, hashlib.md5(b"a").hexdigest()),
+        (HashFunction.MD5_BINARY, hashlib.md5(b"a").digest()),
+        (HashFunction.SHA1, hashlib.sha1(b"a").hexdigest()),
+        (HashFunction.SHA1_BINARY, hashlib.sha1(b"a").digest()),
+        (HashFunction.SHA2, hashlib.sha256(b"a").hexdigest()),
+        (HashFunction.SHA2_BINARY, hashlib.sha256(b"a").digest()),
+    ],
+)
+def test_hash_functions(
+    data_vault_load: DataVaultLoad, hash_function: HashFunction, expected_result
+):
+    """Assert that hashes are calculated by the hash function of the table."""
+    tables = {table.name: table for table in data_vault_load.target_tables}
+    tables["h_customer"].hash_function = hash_function
+    tables["hs_customer"].hash_function = hash_function
+    # Trailing NULL descriptive fields are not part of the hashdiff.
+    batch = {field.name: [None] for field in tables["hs_customer"].hashdiff_fields}
+    batch["customer_id"] = ["a"]
+
+    assert hashkeys(tables["h_customer"], batch) == [expected_result]
+    assert hashdiffs(tables["hs_customer"], batch) == [expected_result]
+
+
+def test_hash_function_not_supported(data_vault_load: DataVaultLoad):
+    """Assert that Snowflake's HASH function cannot be calculated in Python."""
+    hs_customer = next(
+        table for table in data_vault_load.target_tables if table.name == "hs_customer"
+    )
+    hs_customer.hash_function = HashFunction.HASH
+
+    with pytest.raises(ValueError, match="HASH"):
+        hashdiffs(hs_customer, {"customer_id": []})
+
+
+@pytest.mark.parametrize(
+    ("hashdiff_formula", "last_row_delimiters"),
+    [
+        (HashdiffFormula.REGEX, ""),
+        (HashdiffFormula.STRUCTURAL, "|~~|"),
+        (HashdiffFormula.STRUCTURAL_COMPATIBLE, ""),
+    ],
+)
+def test_hashdiffs_formula(
+    data_vault_load: DataVaultLoad, hashdiff_formula, last_row_delimiters
+):
+    """Assert that trailing empty fields are removed by each hashdiff formula."""
+    ls_order_customer_eff = next(
+        table
+        for table in data_vault_load.target_tables
+        if table.name == "ls_order_customer_eff"
+    )
+    ls_order_customer_eff.hashdiff_formula = hashdiff_formula
+    batch = {
+        "order_id": ["1", "1", "1"],
+        "customer_id": ["a", "a", "a"],
+        "ck_test_string": ["x", None, None],
+        "ck_test_timestamp": [None, None, None],
+        "dummy_descriptive_field": [None, "d", "d|~~|"],
+    }
+
+    # Trailing delimiters of the last non empty field are only kept by STRUCTURAL.
+    assert hashdiffs(ls_order_customer_eff, batch) == [
+        md5("1|~~|a|~~|x"),
+        md5("1|~~|a|~~||~~||~~|d"),
+        md5(f"1|~~|a|~~||~~||~~|d{last_row_delimiters}"),
+    ]
@@ -2,7 +2,9 @@
 
 from pathlib import Path
 
-from diepvries import FieldRole
+import pytest
+
+from diepvries import FieldRole, HashFunction, InsertStrategy
 from diepvries.hub import Hub
 from diepvries.role_playing_hub import RolePlayingHub
 
@@ -39,6 +41,22 @@ def test_hashkey_sql(h_order: Hub):
     assert h_order.hashkey_sql == expected_result
 
 
+def test_hashkey_sql_hash_function(h_order: Hub):
+    """Assert that the hashkey is calculated by the hash function of the hub.
+
+    Args:
+        h_order: h_order fixture value.
+    """
+    h_order.hash_function = HashFunction.MD5_BINARY
+
+    assert h_order.hashkey_sql == (
+        "MD5_BINARY(COALESCE(CAST(order_id AS TEXT), 'dv_unknown')) "
+        "AS h_order_hashkey"
+    )
+    with pytest.raises(ValueError, match="only be used for hashdiffs"):
+        h_order.hash_function = HashFunction.HASH
+
+
 def test_hub_load_sql(test_path: Path, h_customer: Hub):
     """Assert correctness of SQL generated in Hub class.
 
@@ -63,3 +81,55 @@ def test_role_playing_hub_load_sql(
         test_path / "sql" / "expected_result_role_playing_hub.sql"
     ).read_text()
     assert h_customer_role_playing.sql_load_statement == expected_result
+
+
+def test_hub_load_sql_anti_join(
+    test_path: Path, h_customer: Hub, h_customer_role_playing: RolePlayingHub
+):
+    """Assert correctness of SQL generated with the anti-join insert strategy.
+
+    Args:
+        test_path: Test path fixture value.
+        h_customer: h_customer fixture value.
+        h_customer_role_playing: Role playing hub fixture value.
+    """
+    for hub, expected_result_file in (
+        (h_customer, "expected_result_hub_anti_join.sql"),
+        (h_customer_role_playing, "expected_result_role_playing_hub_anti_join.sql"),
+    ):
+        merge_sql = hub.sql_load_statement
+        hub.insert_strategy = InsertStrategy.ANTI_JOIN
+
+        expected_result = (test_path / "sql" / expected_result_file).read_text()
+        assert hub.sql_load_statement == expected_result
+
+        hub.insert_strategy = InsertStrategy.MERGE
+        assert hub.sql_load_statement == merge_sql
+
+
+def test_hub_load_sql_initial(
+    test_path: Path, h_customer: Hub, h_customer_role_playing: RolePlayingHub
+):
+    """Assert correctness of SQL generated for initial loads.
+
+    Args:
+        test_path: Test path fixture value.
+        h_customer: h_customer fixture value.
+        h_customer_role_playing: Role playing hub fixture value.
+    """
+    merge_sql = h_customer.sql_load_statement
+    h_customer.initial_load = True
+
+    expected_result = (
+        test_path / "sql" / "expected_result_hub_initial.sql"
+    ).read_text()
+    assert h_customer.sql_load_statement == expected_result
+    assert "min_timestamp" not in h_customer.sql_load_statement
+
+    h_customer.initial_load = False
+    assert h_customer.sql_load_statement == merge_sql
+
+    # Role playing hubs share their target table with the parent hub.
+    with pytest.raises(ValueError, match="not supported"):
+        h_customer_role_playing.initial_load = True
+    assert not h_customer_role_playing.initial_load
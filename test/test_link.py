@@ -2,7 +2,7 @@
 
 from pathlib import Path
 
-from diepvries import FieldRole
+from diepvries import FieldRole, InsertStrategy
 from diepvries.link import Link
 
 
@@ -63,3 +63,31 @@ def test_link_load_sql(test_path: Path, l_order_customer: Link):
     """
     expected_result = (test_path / "sql" / "expected_result_link.sql").read_text()
     assert l_order_customer.sql_load_statement == expected_result
+
+
+def test_link_load_sql_anti_join(test_path: Path, l_order_customer: Link):
+    """Assert correctness of SQL generated with the anti-join insert strategy.
+
+    Args:
+        test_path: Test path fixture value.
+        l_order_customer: l_order_customer fixture value.
+    """
+    l_order_customer.insert_strategy = InsertStrategy.ANTI_JOIN
+    expected_result = (
+        test_path / "sql" / "expected_result_link_anti_join.sql"
+    ).read_text()
+    assert l_order_customer.sql_load_statement == expected_result
+
+
+def test_link_load_sql_initial(test_path: Path, l_order_customer: Link):
+    """Assert correctness of SQL generated for initial loads.
+
+    Args:
+        test_path: Test path fixture value.
+        l_order_customer: l_order_customer fixture value.
+    """
+    l_order_customer.initial_load = True
+    expected_result = (
+        test_path / "sql" / "expected_result_link_initial.sql"
+    ).read_text()
+    assert l_order_customer.sql_load_statement == expected_result
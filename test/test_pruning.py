@@ -0,0 +1,158 @@
+"""Unit tests for pruning strategies."""
+
+import re
+from pathlib import Path
+
+import pytest
+
+from diepvries.data_vault_load import DataVaultLoad
+from diepvries.data_vault_load_executor import split_sql_statements
+from diepvries.pruning import (
+    LookbackPruning,
+    NoPruning,
+    PreScanPruning,
+    WatermarkPruning,
+)
+from diepvries.table import DataVaultTable
+from diepvries.template_sql.sql_formulas import BEGINNING_OF_TIME_SQL_TEMPLATE
+
+
+def get_target_table(data_vault_load: DataVaultLoad, name: str) -> DataVaultTable:
+    """Get a target table of a Data Vault load.
+
+    Args:
+        data_vault_load: Data Vault load.
+        name: Table name.
+
+    Returns:
+        Target table.
+    """
+    return next(table for table in data_vault_load.target_tables if table.name == name)
+
+
+@pytest.mark.parametrize(
+    ("pruning_strategy", "min_timestamp"),
+    [
+        (LookbackPruning(hours=24), "DATEADD(HOUR, -24, CURRENT_TIMESTAMP())"),
+        (
+            WatermarkPruning(schema="dv_state", table="watermarks"),
+            "(SELECT COALESCE(MAX(watermark), "
+            f"{BEGINNING_OF_TIME_SQL_TEMPLATE}) "
+            "FROM dv_state.watermarks WHERE table_name = '{table}')",
+        ),
+        (NoPruning(), BEGINNING_OF_TIME_SQL_TEMPLATE),
+    ],
+)
+@pytest.mark.parametrize(
+    "table_name",
+    ["h_customer", "h_customer_role_playing", "l_order_customer", "hs_customer"],
+)
+def test_pruning_strategy(
+    data_vault_load: DataVaultLoad, pruning_strategy, min_timestamp, table_name
+):
+    """Assert that strategies without pre-scan replace the session variable."""
+    table = get_target_table(data_vault_load, table_name)
+    pre_scan_sql = table.sql_load_statement
+
+    table.pruning_strategy = pruning_strategy
+    target_table = table.sql_placeholders["target_table"]
+
+    assert "SET min_timestamp" not in table.sql_load_statement
+    assert table.sql_load_statement == pre_scan_sql[
+        pre_scan_sql.index("MERGE INTO") :
+    ].replace("$min_timestamp", min_timestamp.format(table=target_table))
+
+
+def test_pruning_strategy_effectivity_satellite(data_vault_load: DataVaultLoad):
+    """Assert that both the link and the effectivity satellite are pruned."""
+    table = get_target_table(data_vault_load, "ls_order_customer_eff")
+    pre_scan_sql = table.sql_load_statement
+
+    table.pruning_strategy = WatermarkPruning(
+        schema="dv_state",
+        table="watermarks",
+        table_name_column="target_table",
+        watermark_column="min_timestamp",
+    )
+    watermark_sql = (
+        "(SELECT COALESCE(MAX(min_timestamp), "
+        f"{BEGINNING_OF_TIME_SQL_TEMPLATE}) "
+        "FROM dv_state.watermarks WHERE target_table = '{table}')"
+    )
+
+    assert table.sql_load_statement == (
+        pre_scan_sql[pre_scan_sql.index("MERGE INTO") :]
+        .replace("$min_timestamp_link", watermark_sql.format(table="l_order_customer"))
+        .replace(
+            "$min_timestamp_satellite",
+            watermark_sql.format(table="ls_order_customer_eff"),
+        )
+    )
+
+    table.pruning_strategy = PreScanPruning()
+    assert table.sql_load_statement == pre_scan_sql
+
+
+def test_lookback_pruning_invalid_window():
+    """Assert that empty lookback windows raise an error."""
+    with pytest.raises(ValueError, match="positive"):
+        LookbackPruning(hours=0)
+
+
+@pytest.mark.parametrize(
+    "table_name",
+    ["h_customer", "h_customer_role_playing", "l_order_customer"],
+)
+def test_pre_scan_pruning_without_session_variables(
+    data_vault_load: DataVaultLoad, table_name: str
+):
+    """Assert that each table is loaded by a single, self-contained statement."""
+    table = get_target_table(data_vault_load, table_name)
+    pre_scan_sql = table.sql_load_statement
+    pre_scan_statements = split_sql_statements(pre_scan_sql)
+
+    table.pruning_strategy = PreScanPruning(session_variables=False)
+    (statement,) = split_sql_statements(table.sql_load_statement)
+
+    assert "$" not in statement
+    # Replacing each subquery by its session variable gives the original statement.
+    *set_statements, merge_statement = pre_scan_statements
+    for set_statement in set_statements:
+        variable, query = set_statement[set_statement.index("SET ") :].split(" = ", 1)
+        statement = statement.replace(query, variable.replace("SET ", "$"))
+    assert statement == merge_statement
+
+
+@pytest.mark.parametrize(
+    ("table_name", "expected_result_file"),
+    [
+        ("hs_customer", "expected_result_satellite_without_session_variables.sql"),
+        (
+            "ls_order_customer_eff",
+            "expected_result_effectivity_satellite_without_session_variables.sql",
+        ),
+    ],
+)
+def test_pre_scan_pruning_without_session_variables_once(
+    test_path: Path,
+    data_vault_load: DataVaultLoad,
+    table_name: str,
+    expected_result_file: str,
+):
+    """Assert that minimum timestamps used more than once are looked up once."""
+    table = get_target_table(data_vault_load, table_name)
+    *set_statements, _ = split_sql_statements(table.sql_load_statement)
+
+    table.pruning_strategy = PreScanPruning(session_variables=False)
+    statement = table.sql_load_statement
+
+    assert statement == (test_path / "sql" / expected_result_file).read_text()
+    assert "$" not in statement
+    # Each pre-scan runs once, in its CTE, that the statement reads by name.
+    assert statement.count("DATEADD(HOUR, -4") == len(set_statements)
+    for set_statement in set_statements:
+        variable, query = set_statement[set_statement.index("SET ") :].split(" = ", 1)
+        variable = variable.replace("SET ", "")
+        query = re.sub(r"\$(\w+)", r"(SELECT \1 FROM \1_bound)", query)
+        assert statement.count(query) == 1
+        assert f"{variable}_bound AS (SELECT {query} AS {variable})" in statement
@@ -2,8 +2,11 @@
 
 from pathlib import Path
 
-from diepvries import FieldRole
+import pytest
+
+from diepvries import FieldRole, HashdiffFormula, HashFunction, SatelliteLoadMode
 from diepvries.data_vault_load import DataVaultLoad
+from diepvries.pruning import LookbackPruning, PreScanPruning
 from diepvries.satellite import Satellite
 
 
@@ -42,6 +45,124 @@ def test_satellite_load_sql(test_path: Path, hs_customer: Satellite):
     assert hs_customer.sql_load_statement == expected_result
 
 
+def test_satellite_insert_only_load_sql(test_path: Path, hs_customer: Satellite):
+    """Assert correctness of SQL generated for insert-only satellites (and views).
+
+    Args:
+        test_path: Test path fixture value.
+        hs_customer: Satellite fixture value.
+    """
+    merge_sql = hs_customer.sql_load_statement
+    hs_customer.load_mode = SatelliteLoadMode.INSERT_ONLY
+
+    expected_result = (
+        test_path / "sql" / "expected_result_satellite_insert_only.sql"
+    ).read_text()
+    expected_view = (
+        test_path / "sql" / "expected_result_satellite_view.sql"
+    ).read_text()
+    assert hs_customer.sql_load_statement == expected_result
+    assert "UPDATE" not in hs_customer.sql_load_statement
+    assert hs_customer.view_sql_statement == expected_view
+
+    hs_customer.load_mode = SatelliteLoadMode.MERGE
+    assert hs_customer.sql_load_statement == merge_sql
+
+
+def test_effectivity_satellite_insert_only(data_vault_load: DataVaultLoad):
+    """Assert that effectivity satellites can only be loaded with MERGE statements.
+
+    Args:
+        data_vault_load: Data vault load fixture value.
+    """
+    effectivity_satellite = next(
+        filter(
+            lambda x: x.name == "ls_order_customer_eff", data_vault_load.target_tables
+        )
+    )
+    with pytest.raises(ValueError, match="not supported"):
+        effectivity_satellite.load_mode = SatelliteLoadMode.INSERT_ONLY
+    assert effectivity_satellite.load_mode == SatelliteLoadMode.MERGE
+
+
+def test_effectivity_satellite_single_pass_sql(
+    test_path: Path, data_vault_load: DataVaultLoad
+):
+    """Assert that single pass effectivity satellites join the target tables once.
+
+    Args:
+        test_path: Test path fixture value.
+        data_vault_load: Data vault load fixture value.
+    """
+    effectivity_satellite = next(
+        filter(
+            lambda x: x.name == "ls_order_customer_eff", data_vault_load.target_tables
+        )
+    )
+    effectivity_satellite.load_mode = SatelliteLoadMode.SINGLE_PASS
+
+    expected_result = (
+        test_path / "sql" / "expected_result_effectivity_satellite_single_pass.sql"
+    ).read_text()
+    assert effectivity_satellite.sql_load_statement == expected_result
+    assert effectivity_satellite.sql_load_statement.count("INNER JOIN") == 3
+
+    effectivity_satellite.pruning_strategy = PreScanPruning(session_variables=False)
+    assert effectivity_satellite.sql_load_statement == expected_result
+
+
+def test_effectivity_satellite_single_pass_bounds(data_vault_load: DataVaultLoad):
+    """Assert that the MERGE target of single pass effectivity satellites is bounded.
+
+    Args:
+        data_vault_load: Data vault load fixture value.
+    """
+    effectivity_satellite = next(
+        filter(
+            lambda x: x.name == "ls_order_customer_eff", data_vault_load.target_tables
+        )
+    )
+    effectivity_satellite.load_mode = SatelliteLoadMode.SINGLE_PASS
+
+    for pruning_strategy in (PreScanPruning(), LookbackPruning(hours=24)):
+        effectivity_satellite.pruning_strategy = pruning_strategy
+        sql_load_statement = effectivity_satellite.sql_load_statement
+        merge_condition = sql_load_statement[
+            sql_load_statement.index("\n  ON (") : sql_load_statement.index(
+                "WHEN MATCHED THEN"
+            )
+        ]
+
+        # The bound is derived from the open versions joined in the statement.
+        assert (
+            "COALESCE(MIN(satellite.r_timestamp), CURRENT_TIMESTAMP()))\n"
+            "          FROM filtered_effectivity_satellite AS satellite\n"
+            "          ) AS min_timestamp_satellite"
+        ) in sql_load_statement
+        assert (
+            "satellite.r_timestamp >= staging.min_timestamp_satellite"
+            in merge_condition
+        )
+        assert "SET min_timestamp" not in sql_load_statement
+
+    # Other strategies still bound the join of the link and the satellite.
+    assert (
+        "AND l.r_timestamp >= DATEADD(HOUR, -24, CURRENT_TIMESTAMP())"
+        in sql_load_statement
+    )
+
+
+def test_satellite_single_pass(hs_customer: Satellite):
+    """Assert that only effectivity satellites can be loaded in a single pass.
+
+    Args:
+        hs_customer: Satellite fixture value.
+    """
+    with pytest.raises(ValueError, match="not supported"):
+        hs_customer.load_mode = SatelliteLoadMode.SINGLE_PASS
+    assert hs_customer.load_mode == SatelliteLoadMode.MERGE
+
+
 def test_set_field_roles(hs_customer: Satellite):
     """Assert correctness of field_roles attributed to hs_customer fields.
 
@@ -106,3 +227,90 @@ def test_hashdiff_sql(test_path: Path, data_vault_load: DataVaultLoad):
 
     expected_result = (test_path / "sql" / "expected_result_hashdiff.sql").read_text()
     assert satellite.hashdiff_sql == expected_result.rstrip("\n")
+
+    # 64-bit hashes can be used for hashdiffs.
+    satellite.hash_function = HashFunction.HASH
+    assert satellite.hashdiff_sql == expected_result.rstrip("\n").replace(
+        "MD5(", "HASH(", 1
+    )
+
+
+def test_hashdiff_sql_structural(data_vault_load: DataVaultLoad):
+    """Assert the hashdiff SQL of the regex-free formulas.
+
+    Args:
+        data_vault_load: Data vault load fixture value.
+    """
+    satellite = next(
+        filter(
+            lambda x: x.name == "ls_order_customer_eff", data_vault_load.target_tables
+        )
+    )
+    fields = [
+        *satellite.parent_table.fields_by_role[FieldRole.BUSINESS_KEY],
+        *satellite.parent_table.fields_by_role[FieldRole.CHILD_KEY],
+        *satellite.fields_by_role[FieldRole.DESCRIPTIVE],
+    ]
+    expression = f"NULLIF({fields[-1].hash_concatenation_sql}, '')"
+    for field in reversed(fields[:-1]):
+        expression = (
+            f"NULLIF({field.hash_concatenation_sql} || "
+            f"COALESCE('|~~|' || {expression}, ''), '')"
+        )
+
+    satellite.hashdiff_formula = HashdiffFormula.STRUCTURAL
+    assert satellite.hashdiff_sql == (
+        f"MD5(COALESCE({expression}, '')) AS ls_order_customer_eff_hashdiff"
+    )
+
+    satellite.hashdiff_formula = HashdiffFormula.STRUCTURAL_COMPATIBLE
+    assert satellite.hashdiff_sql == (
+        f"MD5(IFF(ENDSWITH(COALESCE({expression}, ''), '|~~|'), "
+        f"REGEXP_REPLACE({expression}, '(\\\\|~~\\\\|)+$', ''), "
+        f"COALESCE({expression}, ''))) AS ls_order_customer_eff_hashdiff"
+    )
+
+
+def test_satellite_load_sql_initial(test_path: Path, hs_customer: Satellite):
+    """Assert correctness of SQL generated for initial loads.
+
+    Args:
+        test_path: Test path fixture value.
+        hs_customer: Satellite fixture value.
+    """
+    hs_customer.initial_load = True
+    expected_result = (
+        test_path / "sql" / "expected_result_satellite_initial.sql"
+    ).read_text()
+    assert hs_customer.sql_load_statement == expected_result
+
+    # Insert-only satellites keep all versions open.
+    hs_customer.load_mode = SatelliteLoadMode.INSERT_ONLY
+    insert_only_sql = hs_customer.sql_load_statement
+    assert "LEAD(" not in insert_only_sql
+    assert (
+        "CAST('9999-12-31T00:00:00.000000Z' AS TIMESTAMP) AS r_timestamp_end"
+        in insert_only_sql
+    )
+
+
+def test_effectivity_satellite_sql_initial(
+    test_path: Path, data_vault_load: DataVaultLoad
+):
+    """Assert correctness of SQL generated for initial loads of effectivity satellites.
+
+    Args:
+        test_path: Test path fixture value.
+        data_vault_load: Data vault load fixture value.
+    """
+    effectivity_satellite = next(
+        filter(
+            lambda x: x.name == "ls_order_customer_eff", data_vault_load.target_tables
+        )
+    )
+    effectivity_satellite.initial_load = True
+
+    expected_result = (
+        test_path / "sql" / "expected_result_effectivity_satellite_initial.sql"
+    ).read_text()
+    assert effectivity_satellite.sql_load_statement == expected_result
@@ -0,0 +1,274 @@
+"""Unit tests for StagingFileWriter."""
+
+import copy
+import csv
+import gzip
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterator
+
+import pytest
+
+from diepvries import UNKNOWN, StagingMode
+from diepvries.data_vault_load import DataVaultLoad
+from diepvries.effectivity_satellite import EffectivitySatellite
+from diepvries.hashing import hashdiffs, hashkeys
+from diepvries.staging_files import StagingFileWriter
+
+from .test_data_vault_load import build_data_vault_load
+
+
+def generate_records(count: int) -> Iterator[Dict[str, Any]]:
+    """Generate extracted records for the `data_vault_load` fixture.
+
+    Args:
+        count: Number of records.
+
+    Yields:
+        Extracted records.
+    """
+    for index in range(count):
+        yield {
+            "customer_id": None if index == 0 else f"customer_{index}",
+            "customer_role_playing_id": f"customer_{index + 1}",
+            "order_id": f"order_{index}",
+            "ck_test_string": "child",
+            "ck_test_timestamp": datetime(2021, 3, 1, 10),
+            "test_string": 'with "quotes", and commas',
+            "test_date": date(2021, 3, 1),
+            "test_timestamp_ntz": datetime(2021, 3, 1, 10),
+            "test_integer": index,
+            "test_decimal": 1.5,
+            "x_customer_id": "",
+            "grouping_key": None,
+            "test_geography": "POINT(1 2)",
+            "test_array": [1, 2],
+            "test_object": {"a": 1},
+            "test_variant": "variant",
+            "test_timestamp_tz": datetime(2021, 3, 1, 10, tzinfo=timezone.utc),
+            "test_timestamp_ltz": datetime(2021, 3, 1, 10, tzinfo=timezone.utc),
+            "test_time": None,
+            "test_boolean": True,
+            "test_real": 0.5,
+            "dummy_descriptive_field": "dummy",
+        }
+
+
+def read_rows(paths) -> list:
+    """Read the rows of staging files.
+
+    Args:
+        paths: Staging files.
+
+    Returns:
+        Rows of all files, as strings (NULL values are empty strings).
+    """
+    rows = []
+    for path in paths:
+        with gzip.open(path, "rt", encoding="utf-8", newline="") as csv_file:
+            rows.extend(csv.reader(csv_file))
+    return rows
+
+
+def test_write(tmp_path: Path, data_vault_load: DataVaultLoad):
+    """Assert that staging files hold one column per staging field, in order."""
+    writer = StagingFileWriter(data_vault_load, directory=tmp_path, batch_size=3)
+    paths = writer.write(generate_records(10))
+
+    assert paths == [tmp_path / "orders_20190806_000000_00000.csv.gz"]
+    rows = read_rows(paths)
+    staging_fields = [field.name_in_staging for field in data_vault_load.staging_fields]
+    assert len(rows) == 10
+    assert all(len(row) == len(staging_fields) for row in rows)
+
+    first_row = dict(zip(staging_fields, rows[0]))
+    assert first_row["customer_id"] == UNKNOWN
+    assert first_row["r_timestamp"] == "2019-08-06 00:00:00"
+    assert first_row["r_source"] == "test"
+    assert first_row["test_string"] == 'with "quotes", and commas'
+    assert first_row["test_array"] == "[1,2]"
+    assert first_row["test_boolean"] == "true"
+    assert first_row["test_timestamp_tz"] == "2021-03-01 10:00:00+00:00"
+
+    # Hashes are calculated in Python.
+    batch = {key: [value] for key, value in next(generate_records(1)).items()}
+    tables = {table.name: table for table in data_vault_load.target_tables}
+    assert first_row["h_customer_hashkey"] == hashkeys(tables["h_customer"], batch)[0]
+    assert (
+        first_row["l_order_customer_hashkey"]
+        == hashkeys(tables["l_order_customer"], batch)[0]
+    )
+    assert (
+        first_row["hs_customer_hashdiff"] == hashdiffs(tables["hs_customer"], batch)[0]
+    )
+
+
+def test_write_session_timezone(tmp_path: Path, data_vault_load: DataVaultLoad):
+    """Assert that timestamps are written and hashed in the session time zone."""
+    session_timezone = timezone(timedelta(hours=2))
+    record = {
+        **next(generate_records(1)),
+        "test_timestamp_ntz": datetime(2021, 3, 1, 10, tzinfo=timezone.utc),
+    }
+    writer = StagingFileWriter(
+        data_vault_load, directory=tmp_path, session_timezone=session_timezone
+    )
+    (row,) = read_rows(writer.write([record]))
+
+    staging_fields = [field.name_in_staging for field in data_vault_load.staging_fields]
+    row = dict(zip(staging_fields, row))
+    # The UTC offset is dropped when loaded in a TIMESTAMP_NTZ column, as in hashes.
+    assert row["test_timestamp_ntz"] == "2021-03-01 10:00:00"
+    assert row["test_timestamp_ltz"] == "2021-03-01 12:00:00+02:00"
+    assert row["test_timestamp_tz"] == "2021-03-01 10:00:00+00:00"
+
+    batch = {key: [value] for key, value in record.items()}
+    hs_customer = next(
+        table for table in data_vault_load.target_tables if table.name == "hs_customer"
+    )
+    assert row["hs_customer_hashdiff"] == (
+        hashdiffs(hs_customer, batch, session_timezone)[0]
+    )
+    assert row["hs_customer_hashdiff"] != hashdiffs(hs_customer, batch)[0]
+
+
+def test_write_nulls(tmp_path: Path, data_vault_load: DataVaultLoad):
+    """Assert that NULL values and empty strings can be told apart."""
+    writer = StagingFileWriter(data_vault_load, directory=tmp_path)
+    (path,) = writer.write(generate_records(1))
+
+    with gzip.open(path, "rt", encoding="utf-8") as csv_file:
+        line = csv_file.read()
+    assert ',"",,' in line  # x_customer_id is empty, grouping_key is NULL.
+
+
+def test_write_record_timestamps(tmp_path: Path, data_vault_load: DataVaultLoad):
+    """Assert that backfilled records are staged with their own timestamp."""
+    backfill_data_vault_load = DataVaultLoad(
+        extract_schema=data_vault_load.extract_schema,
+        extract_table=data_vault_load.extract_table,
+        staging_schema=data_vault_load.staging_table.schema,
+        staging_table="orders",
+        extract_start_timestamp=data_vault_load.extract_start_timestamp,
+        target_tables=copy.deepcopy(
+            [
+                table
+                for table in data_vault_load.target_tables
+                if not isinstance(table, EffectivitySatellite)
+            ]
+        ),
+        source=data_vault_load.source,
+        record_timestamp_column="extracted_at",
+    )
+    records = [
+        {**record, "extracted_at": datetime(2021, 3, index + 1)}
+        for index, record in enumerate(generate_records(2))
+    ]
+    writer = StagingFileWriter(backfill_data_vault_load, directory=tmp_path)
+    rows = read_rows(writer.write(records))
+
+    staging_fields = [
+        field.name_in_staging for field in backfill_data_vault_load.staging_fields
+    ]
+    assert [dict(zip(staging_fields, row))["r_timestamp"] for row in rows] == [
+        "2021-03-01 00:00:00",
+        "2021-03-02 00:00:00",
+    ]
+
+    with pytest.raises(KeyError, match="extracted_at"):
+        writer.write(generate_records(1))
+
+
+def test_write_rotates_files(tmp_path: Path, data_vault_load: DataVaultLoad):
+    """Assert that a new file is started when the maximum file size is reached."""
+    writer = StagingFileWriter(
+        data_vault_load, directory=tmp_path, max_file_size=1, batch_size=4
+    )
+    paths = writer.write(generate_records(3))
+
+    assert [path.name for path in paths] == [
+        f"orders_20190806_000000_{index:05d}.csv.gz" for index in range(3)
+    ]
+    assert len(read_rows(paths)) == 3
+
+
+def test_write_missing_column(tmp_path: Path, data_vault_load: DataVaultLoad):
+    """Assert that records without all extraction columns raise an error."""
+    writer = StagingFileWriter(data_vault_load, directory=tmp_path)
+
+    record = next(generate_records(1))
+    del record["test_real"]
+
+    with pytest.raises(KeyError, match="test_real"):
+        writer.write([record])
+
+
+def test_stage_records(tmp_path: Path, data_vault_load: DataVaultLoad):
+    """Assert the SQL statements that create the staging table from files."""
+    files_data_vault_load = build_data_vault_load(
+        data_vault_load, staging_mode=StagingMode.FILES
+    )
+    statements = files_data_vault_load.stage_records(
+        generate_records(2), directory=tmp_path, max_file_size=1
+    )
+
+    fields_ddl = ", ".join(
+        field.ddl_in_staging for field in data_vault_load.staging_fields
+    )
+    assert statements == [
+        (
+            "CREATE OR REPLACE TABLE dv_stg.orders_20190806_000000\n"
+            f"  ({fields_ddl});\n"
+        ),
+        *(
+            (
+                f"PUT 'file://{(tmp_path / name).as_posix()}' "
+                "@dv_stg.%orders_20190806_000000\n"
+                "  AUTO_COMPRESS = FALSE;\n"
+            )
+            for name in (
+                "orders_20190806_000000_00000.csv.gz",
+                "orders_20190806_000000_00001.csv.gz",
+            )
+        ),
+        (
+            "COPY INTO dv_stg.orders_20190806_000000\n"
+            "  FROM @dv_stg.%orders_20190806_000000\n"
+            "  FILE_FORMAT = (\n"
+            "    TYPE = CSV\n"
+            "    COMPRESSION = GZIP\n"
+            "    FIELD_OPTIONALLY_ENCLOSED_BY = '\"'\n"
+            "    EMPTY_FIELD_AS_NULL = TRUE\n"
+            "  )\n"
+            "  PURGE = TRUE;\n"
+        ),
+    ]
+    # The staging table has the same structure as when created from the extraction.
+    assert data_vault_load.staging_create_sql_statement.startswith(
+        statements[0].replace(");\n", ") AS\n")
+    )
+
+    # Files replace the extraction table in the first group of the load.
+    staging_create_sql_statement = "\n".join(statements)
+    assert files_data_vault_load.staging_create_sql_statement == (
+        staging_create_sql_statement
+    )
+    assert files_data_vault_load.sql_load_scripts_by_group[0] == [
+        staging_create_sql_statement
+    ]
+    assert all(
+        data_vault_load.extract_table not in statement
+        for statement in files_data_vault_load.sql_load_script
+    )
+
+
+def test_stage_records_staging_mode(tmp_path: Path, data_vault_load: DataVaultLoad):
+    """Assert that records are only staged in loads that read staging files."""
+    with pytest.raises(ValueError, match="StagingMode.FILES"):
+        data_vault_load.stage_records(generate_records(1), directory=tmp_path)
+
+    files_data_vault_load = build_data_vault_load(
+        data_vault_load, staging_mode=StagingMode.FILES
+    )
+    with pytest.raises(ValueError, match="stage_records"):
+        files_data_vault_load.staging_create_sql_statement
@@ -0,0 +1,153 @@
+"""Unit tests for DataVaultTable."""
+
+from datetime import datetime, timedelta
+
+from diepvries import FieldDataType, FieldRole
+from diepvries.data_vault_load import DataVaultLoad
+from diepvries.effectivity_satellite import EffectivitySatellite
+from diepvries.field import Field
+from diepvries.hub import Hub
+from diepvries.role_playing_hub import RolePlayingHub
+from diepvries.satellite import Satellite
+from diepvries.table import StagingTable
+
+# pylint: disable=protected-access
+
+
+def test_sql_artifacts_are_cached(data_vault_load: DataVaultLoad):
+    """Assert that SQL artifacts are calculated once for an unchanged model.
+
+    Args:
+        data_vault_load: Data vault load fixture value.
+    """
+    for table in data_vault_load.target_tables:
+        assert table.sql_load_statement is table.sql_load_statement
+
+    hs_customer = data_vault_load._get_target_table("hs_customer")
+    assert hs_customer.hashdiff_sql is hs_customer.hashdiff_sql
+
+
+def test_sql_placeholders_are_copies(h_customer: Hub):
+    """Assert that changes in returned placeholders do not affect the cache.
+
+    Args:
+        h_customer: h_customer fixture value.
+    """
+    sql_placeholders = h_customer.sql_placeholders
+    sql_placeholders["target_table"] = "other_table"
+
+    assert h_customer.sql_placeholders["target_table"] == "h_customer"
+
+
+def test_fields_reassignment(h_customer: Hub):
+    """Assert that fields indexes and SQL artifacts are reset when fields change.
+
+    Args:
+        h_customer: h_customer fixture value.
+    """
+    sql_load_statement = h_customer.sql_load_statement
+    assert "customer_id" in h_customer.fields_by_name
+
+    h_customer.fields = [
+        field for field in h_customer.fields if field.name != "customer_id"
+    ] + [
+        Field(
+            parent_table_name="h_customer",
+            name="customer_number",
+            data_type=FieldDataType.NUMBER,
+            position=4,
+            is_mandatory=True,
+            precision=38,
+            scale=0,
+        )
+    ]
+
+    assert "customer_id" not in h_customer.fields_by_name
+    assert [
+        field.name for field in h_customer.fields_by_role[FieldRole.BUSINESS_KEY]
+    ] == ["customer_number"]
+    assert h_customer.sql_load_statement != sql_load_statement
+    assert "customer_number" in h_customer.sql_load_statement
+    assert "CAST(customer_number AS NUMBER (38, 0))" in h_customer.hashkey_sql
+
+
+def test_staging_table_reassignment(h_customer: Hub, extract_start_timestamp: datetime):
+    """Assert that SQL artifacts are reset when the staging table changes.
+
+    Args:
+        h_customer: h_customer fixture value.
+        extract_start_timestamp: Extraction start timestamp fixture value.
+    """
+    assert "orders_20190806_000000" in h_customer.sql_load_statement
+
+    h_customer.staging_table = StagingTable(
+        schema="dv_stg",
+        name="orders",
+        extract_start_timestamp=extract_start_timestamp + timedelta(hours=1),
+    )
+
+    assert "orders_20190806_010000" in h_customer.sql_load_statement
+    assert "orders_20190806_000000" not in h_customer.sql_load_statement
+
+
+def test_parent_table_reassignment(data_vault_load: DataVaultLoad, h_order: Hub):
+    """Assert that satellite SQL artifacts are reset when the parent table changes.
+
+    Args:
+        data_vault_load: Data vault load fixture value.
+        h_order: h_order fixture value.
+    """
+    hs_customer: Satellite = data_vault_load._get_target_table("hs_customer")
+    h_customer: Hub = data_vault_load._get_target_table("h_customer")
+    assert "COALESCE(CAST(customer_id AS" in hs_customer.hashdiff_sql
+
+    hs_customer.parent_table = h_order
+    assert "COALESCE(CAST(customer_id AS" not in hs_customer.hashdiff_sql
+    assert "COALESCE(CAST(order_id AS" in hs_customer.hashdiff_sql
+
+    # Changes in the parent table structure also reset the satellite artifacts.
+    hs_customer.parent_table = h_customer
+    h_customer.fields = [
+        field for field in h_customer.fields if field.name != "customer_id"
+    ] + [
+        Field(
+            parent_table_name="h_customer",
+            name="customer_number",
+            data_type=FieldDataType.TEXT,
+            position=4,
+            is_mandatory=True,
+        )
+    ]
+    assert "COALESCE(CAST(customer_number AS" in hs_customer.hashdiff_sql
+
+
+def test_role_playing_hub_parent_reassignment(
+    h_customer_role_playing: RolePlayingHub, h_order: Hub
+):
+    """Assert that role playing hub SQL artifacts are reset when the parent changes.
+
+    Args:
+        h_customer_role_playing: Role playing hub fixture value.
+        h_order: h_order fixture value.
+    """
+    assert "dv.h_customer " in h_customer_role_playing.sql_load_statement
+
+    h_customer_role_playing.parent_table = h_order
+
+    assert "dv.h_order " in h_customer_role_playing.sql_load_statement
+
+
+def test_driving_keys_reassignment(data_vault_load: DataVaultLoad):
+    """Assert that effectivity satellite SQL artifacts are reset with driving keys.
+
+    Args:
+        data_vault_load: Data vault load fixture value.
+    """
+    ls_order_customer_eff: EffectivitySatellite = data_vault_load._get_target_table(
+        "ls_order_customer_eff"
+    )
+    assert "l.h_customer_hashkey" in ls_order_customer_eff.sql_load_statement
+
+    ls_order_customer_eff.driving_keys = []
+
+    assert "l.h_customer_hashkey" not in ls_order_customer_eff.sql_load_statement
@@ -0,0 +1,47 @@
+"""Unit tests for SQL templates."""
+
+import pytest
+
+from diepvries import TEMPLATES_DIR
+from diepvries.template_sql import SQLTemplate, get_template
+
+
+@pytest.mark.parametrize(
+    "template_name", sorted(path.name for path in TEMPLATES_DIR.glob("*.sql"))
+)
+def test_get_template(template_name: str):
+    """Assert that all templates are parsed once and render as `str.format`."""
+    template = get_template(template_name)
+    assert get_template(template_name) is template
+
+    placeholders = {
+        placeholder: f"<{placeholder}>" for placeholder in template.placeholders
+    }
+    assert template.render(**placeholders) == (
+        (TEMPLATES_DIR / template_name).read_text().format(**placeholders)
+    )
+
+
+def test_render():
+    """Assert rendering of literals, placeholders and escaped braces."""
+    template = SQLTemplate(name="test", text="SELECT {field} FROM {table} -- {{x}}")
+
+    assert template.placeholders == {"field", "table"}
+    assert template.render(field="a", table="b", unused="c") == "SELECT a FROM b -- {x}"
+
+
+def test_render_missing_placeholders():
+    """Assert that missing placeholders raise a KeyError, as in `str.format`."""
+    template = SQLTemplate(name="test", text="SELECT {field} FROM {schema}.{table}")
+
+    with pytest.raises(KeyError, match="schema"):
+        template.render(field="a")
+
+
+@pytest.mark.parametrize(
+    "text", ["SELECT {}", "SELECT {0}", "{a.b}", "{a!r}", "{a:>5}"]
+)
+def test_invalid_placeholders(text: str):
+    """Assert that only named placeholders are accepted when loading a template."""
+    with pytest.raises(ValueError):
+        SQLTemplate(name="test", text=text)